@@ -1,8 +1,17 @@
 #!/usr/bin/env bash
 # Start whisper-server from .whisper/bin/
+#
+# Usage: start-server.sh [--foreground]
+#   --foreground  exec the server in place of this script (used by the
+#                 VoiceType supervisor so it owns the server process)
 
 set -e
 
+FOREGROUND=false
+if [ "$1" = "--foreground" ]; then
+    FOREGROUND=true
+fi
+
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 BIN_DIR="$SCRIPT_DIR/../bin"
 MODELS_DIR="$SCRIPT_DIR/../models"
@@ -59,15 +68,22 @@ echo "Binary: $BINARY"
 echo "Model: $MODEL_FILE"
 echo "Endpoint: http://127.0.0.1:2022/v1/audio/transcriptions"
 
+SERVER_ARGS=(
+    --model "$MODEL_FILE"
+    --host 127.0.0.1
+    --port 2022
+    --inference-path "/v1/audio/transcriptions"
+    --threads 4
+    --processors 1
+    --print-progress
+)
+
+if [ "$FOREGROUND" = true ]; then
+    exec "$BINARY" "${SERVER_ARGS[@]}"
+fi
+
 # Start server in background
-"$BINARY" \
-    --model "$MODEL_FILE" \
-    --host 127.0.0.1 \
-    --port 2022 \
-    --inference-path "/v1/audio/transcriptions" \
-    --threads 4 \
-    --processors 1 \
-    --print-progress &
+"$BINARY" "${SERVER_ARGS[@]}" &
 
 # Wait for server to start
 for i in {1..10}; do
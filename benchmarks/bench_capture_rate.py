@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Capture Rate Benchmark
+Compares asking the input device for 16 kHz (the sound server or ALSA
+resamples in its real-time path) with native-rate capture ([audio]
+native_rate: the device's own rate, resampled to 16 kHz in-process).
+
+Reports, per mode:
+- stream-open cost: start() latency of a per-press (cold) stream, or the
+  error if the device refuses the rate
+- CPU while recording: this process (callback, and resampling in native
+  mode) and, with --server-pid, the sound server (e.g. pipewire)
+- resampler throughput at the device rate (ms per second of audio)
+
+Uses the real microphone by default. --fake-rate plays a fixture through
+the harness' fake device at that rate instead, so the resampling cost can
+be measured anywhere (sound-server load is then not part of the picture).
+
+Usage:
+    python -m benchmarks.bench_capture_rate [--presses 10] [--hold 2] [--server-pid PID]
+    python -m benchmarks.bench_capture_rate --fake-rate 48000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import (SAMPLE_RATE, FakeSoundDevice, install_fake_sounddevice,  # noqa: E402
+                                synthesize_speech, write_results)
+
+
+def process_cpu_seconds(pid):
+    """utime + stime of another process (Linux /proc)"""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def measure_mode(native_rate, presses, hold, server_pid):
+    from src.voice_holdtospeak import StreamingRecorder
+    recorder = StreamingRecorder(min_duration=0, native_rate=native_rate)
+    starts, own_cpu, server_cpu, frames = [], [], [], []
+    for _ in range(presses):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        server = process_cpu_seconds(server_pid) if server_pid else None
+        try:
+            recorder.start(timestamp=time.time())
+        except Exception as e:  # PortAudio refusing the rate is a result, not a crash
+            return {'rate': recorder.rate, 'error': f"{type(e).__name__}: {e}"}
+        starts.append((time.perf_counter() - wall) * 1000)
+        time.sleep(hold)
+        audio = recorder.stop(timestamp=time.time())
+        elapsed = time.perf_counter() - wall
+        own_cpu.append((time.process_time() - cpu) / elapsed * 100)
+        if server_pid:
+            server_cpu.append((process_cpu_seconds(server_pid) - server) / elapsed * 100)
+        frames.append(0 if audio is None else len(audio))
+        time.sleep(0.1)
+    return {
+        'rate': recorder.rate,
+        'start_ms_median': statistics.median(starts),
+        'start_ms_max': max(starts),
+        'cpu_percent': statistics.median(own_cpu),
+        'server_cpu_percent': statistics.median(server_cpu) if server_cpu else None,
+        'seconds_per_recording': statistics.median(frames) / SAMPLE_RATE,
+    }
+
+
+def resampler_ms_per_second(rate, seconds=10.0, chunk=0.05):
+    """Cost of resampling ``rate`` audio to 16 kHz in chunk-sized pieces"""
+    import numpy as np
+    from src.resample import PolyphaseResampler
+    if rate == SAMPLE_RATE:
+        return 0.0
+    audio = np.random.default_rng(0).normal(0, 3000, int(rate * seconds)).astype(np.float32)
+    resampler = PolyphaseResampler(rate, SAMPLE_RATE)
+    step = int(rate * chunk)
+    start = time.perf_counter()
+    for offset in range(0, len(audio), step):
+        resampler.process(audio[offset:offset + step])
+    resampler.flush()
+    return (time.perf_counter() - start) * 1000 / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare 16 kHz and native-rate capture')
+    parser.add_argument('--presses', type=int, default=10, help='Recordings per mode (default: 10)')
+    parser.add_argument('--hold', type=float, default=2.0, help='Seconds per recording (default: 2)')
+    parser.add_argument('--server-pid', type=int, help='Also measure this sound server process')
+    parser.add_argument('--fake-rate', type=int, help='Use the fake device at this rate instead of the microphone')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/bench_capture_rate-<time>.json)')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    if args.fake_rate:
+        install_fake_sounddevice()
+        FakeSoundDevice.default_samplerate = args.fake_rate
+        FakeSoundDevice.blocksize = args.fake_rate // 100
+        FakeSoundDevice.set_source(synthesize_speech(args.presses * (args.hold + 0.2), 0.3,
+                                                     sample_rate=args.fake_rate))
+
+    modes = {
+        '16k': measure_mode(False, args.presses, args.hold, args.server_pid),
+        'native': measure_mode(True, args.presses, args.hold, args.server_pid),
+    }
+    native_rate = modes['native']['rate']
+    results = {
+        'benchmark': 'bench_capture_rate',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'presses': args.presses, 'hold': args.hold, 'fake_rate': args.fake_rate},
+        'device_rate': native_rate,
+        'modes': modes,
+        'resample_ms_per_second': resampler_ms_per_second(native_rate),
+    }
+    path = write_results('bench_capture_rate', results, args.output)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Device rate: {native_rate} Hz (resampling costs "
+          f"{results['resample_ms_per_second']:.2f} ms per second of audio)")
+    print(f"{'mode':<7} {'rate':>6} {'start() median ms':>18} {'start() max ms':>15} "
+          f"{'CPU %':>6} {'server CPU %':>13}")
+    for mode, row in modes.items():
+        if 'error' in row:
+            print(f"{mode:<7} {row['rate']:>6} failed to open: {row['error']}")
+            continue
+        server = f"{row['server_cpu_percent']:.2f}" if row['server_cpu_percent'] is not None else '-'
+        print(f"{mode:<7} {row['rate']:>6} {row['start_ms_median']:>18.2f} {row['start_ms_max']:>15.2f} "
+              f"{row['cpu_percent']:>6.2f} {server:>13}")
+    print(f"\nResults: {path}")
+
+
+if __name__ == "__main__":
+    main()
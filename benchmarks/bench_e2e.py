@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark
+Drives the real capture → transcribe → output path against stand-ins
+(see benchmarks/harness.py): a fake microphone playing WAV fixtures, a mock
+whisper.cpp server with configurable latency and no-op clipboard/paste tools.
+
+Per fixture and iteration it records:
+- stop:       StreamingRecorder.stop() (hand-over of the recording)
+- vad:        SilenceTrimmer.trim() on the recording
+- transcribe: VoiceTranscriber.transcribe_audio() (encode + HTTP + parse)
+- e2e:        release to pasted text: stop + vad + HoldToSpeakDaemon._transcribe_and_type()
+and afterwards the throughput of concurrent transcriptions.
+
+Results are written as JSON to benchmarks/results/ so runs can be compared:
+    python -m benchmarks.bench_e2e [--iterations 3] [--latency 0.05] [--rtf 0.0]
+    python -m benchmarks.bench_e2e --compare benchmarks/results/bench_e2e-<old>.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import (  # noqa: E402
+    FIXTURE_DIR, SAMPLE_RATE, FakeSoundDevice, MockWhisperServer, NullPlatform,
+    ensure_fixtures, install_fake_sounddevice, read_wav, summarize, write_results,
+)
+
+install_fake_sounddevice()
+
+from src.config import load_config  # noqa: E402
+from src.voice_holdtospeak import HoldToSpeakDaemon, StreamingRecorder  # noqa: E402
+from src.voice_type import VoiceTranscriber  # noqa: E402
+from src.whisper_client import WhisperClient  # noqa: E402
+
+STAGES = ('stop', 'vad', 'transcribe', 'e2e')
+RELEASE_TAIL = 0.1  # Seconds of trailing silence captured after each fixture
+
+
+def build_daemon(client, paste_delay):
+    """HoldToSpeakDaemon wired to the mock server and no-op output tools"""
+    config = load_config()
+    config["output"]["clipboard_paste_delay"] = paste_delay
+    with contextlib.redirect_stdout(io.StringIO()):
+        daemon = HoldToSpeakDaemon(config)
+    daemon.platform = NullPlatform()
+    daemon.transcriber = VoiceTranscriber(client=client, check_server=False)
+    return daemon
+
+
+def record_fixture(recorder, audio):
+    """Play one fixture through the fake microphone; returns (recording, stop seconds)"""
+    FakeSoundDevice.set_source(audio)
+    recorder.start(timestamp=time.time())
+    time.sleep(len(audio) / SAMPLE_RATE + RELEASE_TAIL)
+    start = time.perf_counter()
+    recording = recorder.stop(timestamp=time.time())
+    return recording, time.perf_counter() - start
+
+
+def run_fixture(daemon, recorder, audio, iterations):
+    """Measure every stage for one fixture"""
+    samples = {stage: [] for stage in STAGES}
+    for _ in range(iterations):
+        recording, stop_seconds = record_fixture(recorder, audio)
+        if recording is None:
+            raise RuntimeError("Recorder returned no audio (fixture shorter than min_duration?)")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            trimmed = daemon.trimmer.trim(recording).audio if daemon.trimmer else recording
+            vad_seconds = time.perf_counter() - start
+            if trimmed is None:
+                raise RuntimeError("Fixture was trimmed away as silence")
+
+            start = time.perf_counter()
+            daemon.transcriber.transcribe_audio(trimmed)
+            transcribe_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            daemon._transcribe_and_type(trimmed)
+            output_seconds = time.perf_counter() - start
+
+        samples['stop'].append(stop_seconds * 1000)
+        samples['vad'].append(vad_seconds * 1000)
+        samples['transcribe'].append(transcribe_seconds * 1000)
+        samples['e2e'].append((stop_seconds + vad_seconds + output_seconds) * 1000)
+    return {f'{stage}_ms': summarize(values) for stage, values in samples.items()}
+
+
+def run_throughput(transcriber, audio, concurrency, requests_per_worker):
+    """Concurrent transcriptions through one VoiceTranscriber"""
+    total = concurrency * requests_per_worker
+
+    def worker(_):
+        for _ in range(requests_per_worker):
+            transcriber.transcribe_audio(audio)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'requests_per_s': total / elapsed,
+        'audio_seconds_per_s': total * len(audio) / SAMPLE_RATE / elapsed,
+    }
+
+
+def print_report(results):
+    print(f"{'fixture':<8} {'stage':<11} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, stages in results['fixtures'].items():
+        for stage in STAGES:
+            s = stages[f'{stage}_ms']
+            print(f"{name:<8} {stage:<11} {s['p50']:>9.2f} {s['p95']:>9.2f} {s['max']:>9.2f}")
+    t = results['throughput']
+    print(f"\nThroughput ({t['concurrency']} concurrent, {t['requests']} requests): "
+          f"{t['requests_per_s']:.1f} req/s, {t['audio_seconds_per_s']:.1f} audio-s/s")
+
+
+def print_comparison(results, baseline_path):
+    """p50 deltas against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} (p50):")
+    for name, stages in results['fixtures'].items():
+        old_stages = baseline.get('fixtures', {}).get(name)
+        if not old_stages:
+            continue
+        for stage in STAGES:
+            key = f'{stage}_ms'
+            if key not in old_stages:
+                continue
+            old, new = old_stages[key]['p50'], stages[key]['p50']
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"{name:<8} {stage:<11} {old:>9.2f} → {new:>9.2f} ms ({change:+.1f}%)")
+    old_t = baseline.get('throughput', {}).get('requests_per_s')
+    if old_t:
+        new_t = results['throughput']['requests_per_s']
+        print(f"throughput           {old_t:>9.1f} → {new_t:>9.1f} req/s ({(new_t - old_t) / old_t * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmark against a mock whisper server')
+    parser.add_argument('--iterations', type=int, default=3, help='Recordings per fixture (default: 3)')
+    parser.add_argument('--fixtures', default='short,medium,long',
+                        help='Comma-separated fixture names (default: short,medium,long)')
+    parser.add_argument('--fixture-dir', default=FIXTURE_DIR,
+                        help='WAV fixture directory; missing fixtures are generated')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Mock server fixed latency per request in seconds (default: 0.05)')
+    parser.add_argument('--rtf', type=float, default=0.0,
+                        help='Mock server seconds of latency per second of audio (default: 0)')
+    parser.add_argument('--paste-delay', type=float, default=0.0,
+                        help='Clipboard-to-paste delay to apply (default: 0, i.e. code cost only)')
+    parser.add_argument('--warm', action='store_true', help='Keep the input stream open (warm mode)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Threads for the throughput run')
+    parser.add_argument('--requests', type=int, default=10, help='Requests per thread for the throughput run')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/bench_e2e-<time>.json)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    paths = ensure_fixtures(args.fixture_dir)
+    names = [name.strip() for name in args.fixtures.split(',') if name.strip()]
+    unknown = [name for name in names if name not in paths]
+    if unknown:
+        parser.error(f"Unknown fixture(s): {', '.join(unknown)} (available: {', '.join(paths)})")
+
+    with MockWhisperServer(latency=args.latency, rtf=args.rtf) as server:
+        client = WhisperClient(server.url)
+        client.health()  # The daemon's startup check loads the HTTP stack before any recording
+        daemon = build_daemon(client, args.paste_delay)
+        recorder = StreamingRecorder(min_duration=daemon.min_recording_duration)
+        if args.warm:
+            recorder.open_warm(daemon.preroll_seconds)
+
+        fixtures = {}
+        for name in names:
+            fixtures[name] = run_fixture(daemon, recorder, read_wav(paths[name]), args.iterations)
+        throughput = run_throughput(daemon.transcriber, read_wav(paths[names[0]]),
+                                    args.concurrency, args.requests)
+        recorder.close()
+        client.close()
+
+    results = {
+        'benchmark': 'bench_e2e',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'config': {
+            'iterations': args.iterations,
+            'mock_latency': args.latency,
+            'mock_rtf': args.rtf,
+            'paste_delay': args.paste_delay,
+            'warm_stream': args.warm,
+            'vad': daemon.trimmer is not None,
+        },
+        'fixtures': fixtures,
+        'throughput': throughput,
+    }
+    path = write_results('bench_e2e', results, args.output)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+        print(f"\nResults written to {path}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Daemon Startup Budget
+Measures what `voicetype-daemon` pays before it can do anything useful and
+fails (exit code 1) when the budget is exceeded:
+- import time of src.voice_holdtospeak (median over fresh interpreters)
+- time to construct HoldToSpeakDaemon (config, platform detection, sounds)
+- modules that must stay lazy: none of DEFERRED_MODULES may be loaded by
+  the import alone (requests/urllib3 load on the first HTTP call,
+  sounddevice when a stream opens, evdev when keyboards are searched)
+
+With --top, prints the slowest imports from `python -X importtime`.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 300] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DAEMON_MODULE = 'src.voice_holdtospeak'
+DEFERRED_MODULES = ['requests', 'urllib3', 'sounddevice', 'evdev', 'scipy']
+DEFAULT_IMPORT_BUDGET_MS = 300.0
+DEFAULT_CONSTRUCT_BUDGET_MS = 200.0
+
+IMPORT_SNIPPET = f"""
+import json, sys, time
+start = time.perf_counter()
+import {DAEMON_MODULE}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_ms': elapsed * 1000, 'modules': sorted(sys.modules)}}))
+"""
+
+CONSTRUCT_SNIPPET = f"""
+import contextlib, io, json, time
+from {DAEMON_MODULE} import HoldToSpeakDaemon
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    HoldToSpeakDaemon()
+print(json.dumps({{'construct_ms': (time.perf_counter() - start) * 1000}}))
+"""
+
+
+def run_python(code, *flags):
+    """Run a snippet in a fresh interpreter from the repo root"""
+    result = subprocess.run([sys.executable, *flags, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result
+
+
+def measure(snippet, key, runs):
+    samples = [json.loads(run_python(snippet).stdout.splitlines()[-1])[key] for _ in range(runs)]
+    return statistics.median(samples), samples
+
+
+def loaded_deferred_modules():
+    modules = json.loads(run_python(IMPORT_SNIPPET).stdout.splitlines()[-1])['modules']
+    return [name for name in DEFERRED_MODULES if name in modules]
+
+
+def slowest_imports(top):
+    """(cumulative ms, self ms, module) from -X importtime, slowest first"""
+    stderr = run_python(f'import {DAEMON_MODULE}', '-X', 'importtime').stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure and enforce the daemon startup budget')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per measurement (default: 5)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help=f'Median import budget in ms (default: {DEFAULT_IMPORT_BUDGET_MS:.0f})')
+    parser.add_argument('--construct-budget-ms', type=float, default=DEFAULT_CONSTRUCT_BUDGET_MS,
+                        help=f'Median HoldToSpeakDaemon() budget in ms (default: {DEFAULT_CONSTRUCT_BUDGET_MS:.0f})')
+    parser.add_argument('--top', type=int, default=0, help='Show the N slowest imports (-X importtime)')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    import_ms, import_samples = measure(IMPORT_SNIPPET, 'import_ms', args.runs)
+    construct_ms, construct_samples = measure(CONSTRUCT_SNIPPET, 'construct_ms', args.runs)
+    eager = loaded_deferred_modules()
+
+    failures = []
+    if import_ms > args.budget_ms:
+        failures.append(f"import {import_ms:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if construct_ms > args.construct_budget_ms:
+        failures.append(f"HoldToSpeakDaemon() {construct_ms:.0f} ms > budget {args.construct_budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"loaded at import time (should be lazy): {', '.join(eager)}")
+
+    results = {
+        'import_ms': import_ms,
+        'import_samples_ms': import_samples,
+        'construct_ms': construct_ms,
+        'construct_samples_ms': construct_samples,
+        'budget_ms': args.budget_ms,
+        'construct_budget_ms': args.construct_budget_ms,
+        'eager_deferred_modules': eager,
+        'slowest_imports': [
+            {'module': name.strip(), 'cumulative_ms': cumulative, 'self_ms': own}
+            for cumulative, own, name in slowest_imports(args.top)
+        ] if args.top else [],
+        'failures': failures,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"import {DAEMON_MODULE}: {import_ms:7.1f} ms median (budget {args.budget_ms:.0f} ms)")
+        print(f"HoldToSpeakDaemon():     {construct_ms:7.1f} ms median (budget {args.construct_budget_ms:.0f} ms)")
+        print(f"Deferred modules loaded at import: {', '.join(eager) or 'none'}")
+        if results['slowest_imports']:
+            print(f"\n{'cumulative ms':>13} {'self ms':>8}  module")
+            for row in results['slowest_imports']:
+                print(f"{row['cumulative_ms']:>13.1f} {row['self_ms']:>8.1f}  {row['module']}")
+        for failure in failures:
+            print(f"✗ {failure}")
+        if not failures:
+            print("✓ Within startup budget")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
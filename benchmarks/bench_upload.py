@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Upload Encoding Benchmark
+Measures what FLAC uploads ([whisper] upload_format) cost and save compared
+to plain WAV, per recording:
+- encode time of WAV and FLAC (median over --runs)
+- bytes on the wire and the FLAC/WAV ratio
+- encode + transfer time at each --mbps link speed, and the break-even
+  link speed above which WAV is faster
+
+Uses the WAV fixtures by default (synthetic speech); pass real recordings
+with --files for representative ratios (any format audio_file.py decodes).
+
+Usage:
+    python -m benchmarks.bench_upload [--runs 5] [--mbps 10,50,100,1000] [--files a.wav b.m4a]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import FIXTURE_DIR, SAMPLE_RATE, ensure_fixtures, read_wav, write_results  # noqa: E402
+from src.audio_file import load_audio  # noqa: E402
+from src.flac import encode_flac  # noqa: E402
+from src.whisper_client import encode_wav  # noqa: E402
+
+
+def time_encode(encode, audio, runs):
+    """(median ms, payload bytes) of encode(audio, SAMPLE_RATE)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        payload = encode(audio, SAMPLE_RATE)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(payload)
+
+
+def measure(audio, runs, link_mbps):
+    wav_ms, wav_bytes = time_encode(encode_wav, audio, runs)
+    flac_ms, flac_bytes = time_encode(encode_flac, audio, runs)
+    saved = wav_bytes - flac_bytes
+    extra_s = (flac_ms - wav_ms) / 1000
+    return {
+        'audio_seconds': round(len(audio) / SAMPLE_RATE, 2),
+        'wav_encode_ms': wav_ms,
+        'flac_encode_ms': flac_ms,
+        'wav_bytes': wav_bytes,
+        'flac_bytes': flac_bytes,
+        'ratio': flac_bytes / wav_bytes,
+        # Link speed at which the saved transfer time equals the extra encode time
+        'break_even_mbps': saved * 8 / extra_s / 1e6 if saved > 0 and extra_s > 0 else None,
+        'upload_ms': {
+            str(mbps): {
+                'wav': wav_ms + wav_bytes * 8 / (mbps * 1e6) * 1000,
+                'flac': flac_ms + flac_bytes * 8 / (mbps * 1e6) * 1000,
+            }
+            for mbps in link_mbps
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WAV and FLAC upload encoding')
+    parser.add_argument('--runs', type=int, default=5, help='Encodes per format and recording (default: 5)')
+    parser.add_argument('--mbps', default='10,50,100,1000',
+                        help='Comma-separated link speeds in Mbit/s (default: 10,50,100,1000)')
+    parser.add_argument('--files', nargs='+', help='Recordings to measure instead of the fixtures')
+    parser.add_argument('--fixture-dir', default=FIXTURE_DIR,
+                        help='WAV fixture directory; missing fixtures are generated')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/bench_upload-<time>.json)')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+    link_mbps = [float(value) for value in args.mbps.split(',') if value.strip()]
+
+    if args.files:
+        recordings = {os.path.basename(path): load_audio(path, SAMPLE_RATE) for path in args.files}
+    else:
+        recordings = {name: read_wav(path) for name, path in ensure_fixtures(args.fixture_dir).items()}
+    encode_flac(recordings[next(iter(recordings))], SAMPLE_RATE)  # Build the CRC tables outside the timings
+
+    results = {
+        'benchmark': 'bench_upload',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'runs': args.runs, 'link_mbps': link_mbps},
+        'recordings': {name: measure(audio, args.runs, link_mbps) for name, audio in recordings.items()},
+    }
+    path = write_results('bench_upload', results, args.output)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'recording':<16} {'audio s':>7} {'WAV KB':>8} {'FLAC KB':>8} {'ratio':>6} "
+          f"{'WAV ms':>7} {'FLAC ms':>8} {'break-even':>11}")
+    for name, row in results['recordings'].items():
+        break_even = f"{row['break_even_mbps']:.0f} Mbit/s" if row['break_even_mbps'] else '-'
+        print(f"{name:<16} {row['audio_seconds']:>7.1f} {row['wav_bytes'] / 1024:>8.1f} "
+              f"{row['flac_bytes'] / 1024:>8.1f} {row['ratio']:>6.2f} {row['wav_encode_ms']:>7.2f} "
+              f"{row['flac_encode_ms']:>8.2f} {break_even:>11}")
+
+    print("\nEncode + transfer (ms), WAV → FLAC:")
+    for name, row in results['recordings'].items():
+        cells = '  '.join(f"{mbps}: {times['wav']:.0f} → {times['flac']:.0f}"
+                          for mbps, times in row['upload_ms'].items())
+        print(f"  {name:<14} {cells}")
+    print(f"\nResults: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Warm Input Stream Benchmark
+Measures what keeping the microphone open costs and what it saves:
+- idle CPU load of a warm StreamingRecorder (stream open, pre-roll ring only)
+- start() latency for the cold path (new sd.InputStream per press)
+  versus the warm path (pre-roll hand-over)
+
+Needs a real input device.
+
+Usage:
+    python -m benchmarks.bench_warm_stream [--idle 10] [--presses 10] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.voice_holdtospeak import StreamingRecorder  # noqa: E402
+
+
+def measure_idle_cpu(recorder, seconds):
+    """Process CPU time per wall-clock second while the stream idles"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return cpu / wall * 100
+
+
+def measure_start_latency(recorder, presses):
+    """Time from start() call to return, over several short recordings"""
+    latencies = []
+    for _ in range(presses):
+        start = time.perf_counter()
+        recorder.start(timestamp=time.time())
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.4)
+        recorder.stop(timestamp=time.time())
+        time.sleep(0.1)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark warm vs. per-press input streams')
+    parser.add_argument('--idle', type=float, default=10, help='Idle measurement window in seconds')
+    parser.add_argument('--presses', type=int, default=10, help='Simulated key presses per mode')
+    parser.add_argument('--preroll', type=float, default=0.5, help='Pre-roll ring length in seconds')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    cold = StreamingRecorder()
+    cold_idle = measure_idle_cpu(cold, args.idle)
+    cold_start = measure_start_latency(cold, args.presses)
+
+    warm = StreamingRecorder()
+    warm.open_warm(args.preroll)
+    time.sleep(0.5)  # Let the stream settle
+    warm_idle = measure_idle_cpu(warm, args.idle)
+    warm_start = measure_start_latency(warm, args.presses)
+    warm.close()
+
+    results = {
+        "cold": {"idle_cpu_percent": cold_idle,
+                 "start_ms_median": statistics.median(cold_start),
+                 "start_ms_max": max(cold_start)},
+        "warm": {"idle_cpu_percent": warm_idle,
+                 "start_ms_median": statistics.median(warm_start),
+                 "start_ms_max": max(warm_start)},
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<6} {'idle CPU %':>10} {'start() median ms':>18} {'start() max ms':>15}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['idle_cpu_percent']:>10.2f} {r['start_ms_median']:>18.2f} {r['start_ms_max']:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
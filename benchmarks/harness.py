@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness
+Stand-ins for the pieces of the capture → transcribe → output path that
+need hardware or a model, so benchmarks run anywhere:
+- MockWhisperServer: local HTTP server speaking whisper.cpp's
+  /v1/audio/transcriptions and /health with configurable latency
+- FakeSoundDevice: drop-in for the sounddevice module whose InputStream
+  plays a WAV fixture through the callback in real time
+- NullPlatform: clipboard/paste tools that only record what they were given
+- WAV fixtures: synthetic speech-like clips, generated on demand
+
+Import order matters: call install_fake_sounddevice() before importing
+anything from src that imports sounddevice.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import types
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+SAMPLE_RATE = 16000
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# name -> (speech seconds, leading/trailing silence seconds)
+FIXTURES = {
+    'short': (1.0, 0.3),
+    'medium': (4.0, 0.5),
+    'long': (12.0, 0.5),
+}
+
+
+# --- WAV fixtures -------------------------------------------------------------
+
+def synthesize_speech(seconds: float, silence: float, sample_rate: int = SAMPLE_RATE,
+                      seed: int = 0) -> np.ndarray:
+    """Speech-like int16 clip: voiced "syllables" with pauses, silent edges.
+
+    Harmonic stacks with a wandering pitch, amplitude-modulated at syllable
+    rate, plus a low noise floor, so VAD and pause detection behave as they
+    would on a real recording.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.7 * t) + rng.normal(0, 2, n).cumsum() / sample_rate
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5  # ~4 syllables/s
+    # A pause of 0.5 s every 2.5 s (phrase boundaries for segmenting)
+    envelope[(t % 2.5) > 2.0] = 0
+    speech = voiced * envelope * 6000
+
+    pad = np.zeros(int(silence * sample_rate))
+    audio = np.concatenate([pad, speech, pad])
+    audio += rng.normal(0, 20, len(audio))  # Room noise floor
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.ascontiguousarray(audio, dtype='<i2').tobytes())
+
+
+def read_wav(path: str) -> np.ndarray:
+    """Read a mono 16-bit WAV file as an int16 array"""
+    with wave.open(path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2').astype(np.int16)
+
+
+def ensure_fixtures(directory: str = FIXTURE_DIR) -> Dict[str, str]:
+    """Generate missing fixture WAVs; returns name -> path"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for seed, (name, (seconds, silence)) in enumerate(FIXTURES.items()):
+        path = os.path.join(directory, f'{name}.wav')
+        if not os.path.exists(path):
+            write_wav(path, synthesize_speech(seconds, silence, seed=seed))
+        paths[name] = path
+    return paths
+
+
+# --- Mock whisper.cpp server --------------------------------------------------
+
+class MockWhisperServer:
+    """Threaded HTTP server mimicking whisper.cpp's transcription endpoints
+
+    Each transcription sleeps ``latency + rtf * audio_seconds`` before
+    answering, so both fixed overhead and length-dependent inference time
+    can be modelled.
+    """
+
+    def __init__(self, latency: float = 0.05, rtf: float = 0.0, text: str = 'benchmark transcription',
+                 host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.rtf = rtf
+        self.text = text
+        self.requests = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._connections = set()  # Open keep-alive sockets (closed by stop())
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'MockWhisperServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop accepting and drop open connections, like a server process exiting"""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like whisper-server
+            # Headers and body go out as separate writes; with Nagle on, the body
+            # waits for the client's delayed ACK (~40 ms) on reused connections
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with mock._lock:
+                    mock._connections.add(self.connection)
+
+            def finish(self):
+                with mock._lock:
+                    mock._connections.discard(self.connection)
+                super().finish()
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self._reply(200, {'status': 'ok'})
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                if self.path != '/v1/audio/transcriptions':
+                    self._reply(404, {'error': 'not found'})
+                    return
+                with mock._lock:
+                    mock.requests += 1
+                    mock.bytes_received += len(body)
+                audio_seconds = max(0, len(body) - 44) / (2 * SAMPLE_RATE)  # ~PCM payload
+                time.sleep(mock.latency + mock.rtf * audio_seconds)
+                self._reply(200, {'text': f' {mock.text} '})
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# --- Fake sounddevice ---------------------------------------------------------
+
+class _TimeInfo:
+    def __init__(self, now: float):
+        self.currentTime = now
+        self.inputBufferAdcTime = now
+
+
+class FakeInputStream:
+    """sd.InputStream replacement that plays FakeSoundDevice.source in real time"""
+
+    def __init__(self, samplerate=SAMPLE_RATE, channels=1, dtype='int16', callback=None,
+                 blocksize=0, **kwargs):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.blocksize = blocksize or FakeSoundDevice.blocksize
+        self.callback_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+
+    def _run(self):
+        source, generation = None, -1
+        block = np.zeros((self.blocksize, self.channels), dtype=np.int16)
+        period = self.blocksize / self.samplerate
+        position = 0
+        next_time = time.monotonic() + period
+        while not self._stop.is_set():
+            # Pace like a sound card: one block per period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_time += period
+
+            if FakeSoundDevice.generation != generation:
+                # New fixture queued: play it from the start
+                source, generation = FakeSoundDevice.source, FakeSoundDevice.generation
+                position = 0
+            if source is not None and len(source):
+                # Play the fixture once, then silence (like a speaker going quiet)
+                chunk = source[position:position + self.blocksize]
+                block[:len(chunk), 0] = chunk
+                block[len(chunk):] = 0
+                position += len(chunk)
+            self.callback(block, self.blocksize, _TimeInfo(time.monotonic()), None)
+            self.callback_count += 1
+
+
+class FakeOutputStream:
+    """Silent sd.OutputStream replacement (beeps)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSoundDevice(types.ModuleType):
+    """Module object installed as ``sounddevice``"""
+
+    source: Optional[np.ndarray] = None  # int16 samples the streams play (see set_source)
+    generation = 0  # Bumped by set_source so open streams restart playback
+    blocksize = 512
+    default_samplerate = SAMPLE_RATE  # Reported by query_devices() (native-rate capture)
+
+    def __init__(self):
+        super().__init__('sounddevice')
+        self.InputStream = FakeInputStream
+        self.OutputStream = FakeOutputStream
+        self.PortAudioError = OSError
+
+    @classmethod
+    def set_source(cls, audio: Optional[np.ndarray]) -> None:
+        """Play ``audio`` (int16) once from now on, followed by silence"""
+        cls.source = audio
+        cls.generation += 1
+
+    @staticmethod
+    def play(*args, **kwargs):
+        pass
+
+    @classmethod
+    def query_devices(cls, device=None, kind=None):
+        return {'name': 'fake', 'default_samplerate': float(cls.default_samplerate)}
+
+    @staticmethod
+    def wait():
+        pass
+
+    @staticmethod
+    def stop():
+        pass
+
+
+def install_fake_sounddevice() -> FakeSoundDevice:
+    """Register the fake as ``sounddevice`` (before src modules are imported)"""
+    module = sys.modules.get('sounddevice')
+    if not isinstance(module, FakeSoundDevice):
+        module = FakeSoundDevice()
+        sys.modules['sounddevice'] = module
+    return module
+
+
+# --- Output stand-ins ---------------------------------------------------------
+
+class NullPlatform:
+    """PlatformInfo stand-in: clipboard and paste succeed instantly"""
+
+    display_server = 'benchmark'
+    desktop_env = 'none'
+
+    def __init__(self):
+        self.pasted: List[str] = []
+
+    def copy_to_clipboard(self, text: str) -> bool:
+        self.pasted.append(text)
+        return True
+
+    def simulate_paste_shortcut(self, use_shift: bool = False) -> bool:
+        return True
+
+    def type_text(self, text: str) -> bool:
+        self.pasted.append(text)
+        return True
+
+    def get_clipboard_tool(self):
+        return 'null'
+
+    def get_keyboard_tool(self):
+        return 'null'
+
+    def get_install_instructions(self) -> str:
+        return ''
+
+    def enable_virtual_keyboard(self) -> bool:
+        return False
+
+    def disable_virtual_keyboard(self) -> None:
+        pass
+
+
+# --- Results ------------------------------------------------------------------
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/max/mean of a list of millisecond samples"""
+    if not samples_ms:
+        return {'n': 0}
+    values = np.asarray(samples_ms)
+    return {
+        'n': len(values),
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'max': float(values.max()),
+    }
+
+
+def write_results(name: str, results: dict, path: Optional[str] = None) -> str:
+    """Write results JSON (default: benchmarks/results/<name>-<timestamp>.json)"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
@@ -410,7 +410,7 @@ fi
 source "$INSTALL_DIR/venv/bin/activate"
 
 # Check if packages are already installed (unless --force)
-if [ "$FORCE_INSTALL" = false ] && pip show requests sounddevice scipy numpy evdev &>/dev/null; then
+if [ "$FORCE_INSTALL" = false ] && pip show requests sounddevice numpy evdev jeepney &>/dev/null; then
     echo_success "Python dependencies already installed ✓"
 else
     echo_info "Installing Python packages (this may take a minute)..."
@@ -475,6 +475,20 @@ EOF
     echo_success "Created: $BIN_DIR/voicetype-interactive"
 fi
 
+# Create voicetype-batch launcher (transcribe audio files)
+if [ "$FORCE_INSTALL" = false ] && [ -f "$BIN_DIR/voicetype-batch" ]; then
+    echo_success "Launcher script voicetype-batch already exists ✓"
+else
+    cat > "$BIN_DIR/voicetype-batch" <<EOF
+#!/bin/bash
+cd "$INSTALL_DIR"
+source "$INSTALL_DIR/venv/bin/activate"
+exec python -m src.batch "\$@"
+EOF
+    chmod +x "$BIN_DIR/voicetype-batch"
+    echo_success "Created: $BIN_DIR/voicetype-batch"
+fi
+
 # Create voicetype-stop-server launcher (manual shutdown)
 if [ "$FORCE_INSTALL" = false ] && [ -f "$BIN_DIR/voicetype-stop-server" ]; then
     echo_success "Launcher script voicetype-stop-server already exists ✓"
@@ -674,6 +688,7 @@ echo "Available commands:"
 echo "  voicetype-daemon       - Start hold-to-speak daemon (default: F12)"
 echo "  voicetype-input        - One-shot voice input"
 echo "  voicetype-interactive  - Interactive terminal mode"
+echo "  voicetype-batch        - Transcribe audio files/directories to JSONL"
 echo "  voicetype-stop-server  - Stop whisper.cpp server (save resources)"
 echo "  voicetype-uninstall    - Remove VoiceType from system"
 echo
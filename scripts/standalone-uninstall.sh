@@ -230,7 +230,7 @@ BIN_DIR="$HOME/.local/bin"
 SCRIPTS_REMOVED=0
 
 # Note: We keep voicetype-uninstall until the very end (this script!)
-for script in voicetype-daemon voicetype-input voicetype-interactive voicetype-stop-server claude-voice-input voice-input; do
+for script in voicetype-daemon voicetype-input voicetype-interactive voicetype-batch voicetype-stop-server claude-voice-input voice-input; do
     if [ -f "$BIN_DIR/$script" ]; then
         echo_info "Removing $script..."
         rm -f "$BIN_DIR/$script"
@@ -199,7 +199,7 @@ echo ""
 BIN_DIR="$HOME/.local/bin"
 SCRIPTS_REMOVED=0
 
-for script in voicetype-daemon voicetype-input voicetype-interactive voicetype-stop-server claude-voice-input voice-input; do
+for script in voicetype-daemon voicetype-input voicetype-interactive voicetype-batch voicetype-stop-server claude-voice-input voice-input; do
     if [ -f "$BIN_DIR/$script" ]; then
         echo_info "Removing $script..."
         rm -f "$BIN_DIR/$script"
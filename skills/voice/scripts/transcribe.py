@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
 Voice Transcription Script for Claude Code Skill
-Uses existing VoiceTranscriber class to record and transcribe audio
+Asks the running voicetype-daemon to record and transcribe over its control
+socket (answers without any start-up cost). Without a daemon it falls back
+to recording and transcribing in this process with VoiceTranscriber, using
+the backend selected by [backend] type in config.toml.
 """
 import sys
 import os
@@ -15,17 +18,26 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '../../..'))
 sys.path.insert(0, project_root)
 
-try:
-    from src.voice_type import VoiceTranscriber
-    import requests
-    import subprocess
-    import time
-except ImportError as e:
-    print(json.dumps({
-        "error": f"Failed to import required modules: {e}",
-        "help": "Make sure you're in the voice-to-claude-cli directory and venv is activated"
-    }))
-    sys.exit(1)
+from src.config import load_config
+from src.control import get_control_socket_path, send_command
+
+CONTROL_TIMEOUT_MARGIN = 35  # Seconds on top of the recording for transcription
+
+
+def transcribe_via_daemon(duration):
+    """
+    Record and transcribe through the running daemon.
+    Returns the daemon's reply, or None if no daemon is listening.
+    """
+    try:
+        return send_command('record', duration=duration,
+                            timeout=duration + CONTROL_TIMEOUT_MARGIN,
+                            path=get_control_socket_path(load_config()))
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None  # No daemon running
+    except (OSError, ValueError) as e:
+        # The daemon took the request; recording again here would be wrong
+        return {"error": f"voicetype-daemon did not answer: {e}"}
 
 
 def check_installation():
@@ -59,49 +71,23 @@ def ensure_whisper_server():
     If not, try to start it using local binary.
     Returns True if server is available, False otherwise.
     """
-    # Check if server is already running
-    try:
-        response = requests.get("http://127.0.0.1:2022/health", timeout=2)
-        if response.status_code == 200:
-            return True
-    except (requests.ConnectionError, requests.Timeout):
-        pass
+    from src.whisper_server import WhisperServerSupervisor
+    supervisor = WhisperServerSupervisor(log=lambda message: print(message, file=sys.stderr))
+    return supervisor.ensure_running()
 
-    # Server not running, try to start it
-    print("whisper server not running. Attempting to start local server...", file=sys.stderr)
 
-    # Try to use the start-server.sh script
-    start_script = os.path.join(project_root, '.whisper/scripts/start-server.sh')
-
-    if os.path.exists(start_script):
-        try:
-            # Run start script in background (don't wait for it to complete)
-            # The script starts whisper-server as a background process
-            subprocess.Popen(['bash', start_script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-
-            # Wait for server to become available (up to 15 seconds)
-            print("Waiting for server to start...", file=sys.stderr)
-            for i in range(30):  # 30 attempts * 0.5s = 15 seconds max
-                try:
-                    response = requests.get("http://127.0.0.1:2022/health", timeout=1)
-                    if response.status_code == 200:
-                        print("✓ whisper server started successfully!", file=sys.stderr)
-                        return True
-                except (requests.ConnectionError, requests.Timeout):
-                    time.sleep(0.5)
-
-            print("Warning: Server not responding after 15 seconds", file=sys.stderr)
-            return False
-
-        except Exception as e:
-            print(f"Failed to start server: {str(e)}", file=sys.stderr)
-            return False
-    else:
-        # No start script, provide instructions
-        print(f"Start script not found: {start_script}", file=sys.stderr)
-        return False
+def import_transcriber():
+    """Import the in-process transcription path (only needed without a daemon)"""
+    try:
+        from src.voice_type import VoiceTranscriber
+        from src.backends import get_backend
+    except ImportError as e:
+        print(json.dumps({
+            "error": f"Failed to import required modules: {e}",
+            "help": "Make sure you're in the voice-to-claude-cli directory and venv is activated"
+        }))
+        sys.exit(1)
+    return VoiceTranscriber, get_backend
 
 
 def main():
@@ -122,9 +108,18 @@ def main():
         }))
         sys.exit(1)
 
+    # Fast path: the daemon already has the microphone and server connection warm
+    reply = transcribe_via_daemon(args.duration)
+    if reply is not None:
+        print(json.dumps(reply))
+        sys.exit(1 if "error" in reply else 0)
+
+    # The whisper.cpp binary and server are only needed by the "http" backend
+    uses_server = load_config()["backend"]["type"] == "http"
+
     # Check if installation is complete
     is_installed, missing = check_installation()
-    if not is_installed:
+    if uses_server and not is_installed:
         print(json.dumps({
             "error": "VoiceType is not fully installed",
             "missing_components": missing,
@@ -138,7 +133,7 @@ def main():
         sys.exit(1)
 
     # Ensure whisper server is running
-    if not ensure_whisper_server():
+    if uses_server and not ensure_whisper_server():
         print(json.dumps({
             "error": "whisper.cpp server is not available",
             "help": [
@@ -149,16 +144,25 @@ def main():
         }))
         sys.exit(1)
 
+    VoiceTranscriber, get_backend = import_transcriber()
     try:
-        # Initialize transcriber (checks whisper.cpp server connection)
-        transcriber = VoiceTranscriber()
+        backend = get_backend()
+        if not uses_server and not backend.health():
+            print(json.dumps({
+                "error": f"{backend.name} is not available",
+                "help": "Check [backend] in ~/.config/voicetype/config.toml"
+            }))
+            sys.exit(1)
+
+        # Initialize transcriber (server health already verified above)
+        transcriber = VoiceTranscriber(client=backend, check_server=False)
 
         # Record audio
         print(f"Recording for {args.duration} seconds... Speak now!", file=sys.stderr)
         audio_data = transcriber.record_audio(duration=args.duration)
         print("Recording finished!", file=sys.stderr)
 
-        # Transcribe audio (makes HTTP POST to whisper.cpp)
+        # Transcribe audio (HTTP POST to whisper.cpp, or in-process)
         print("Transcribing...", file=sys.stderr)
         transcribed_text = transcriber.transcribe_audio(audio_data)
 
@@ -12,11 +12,25 @@ Core components:
 - platform_detect: Cross-platform abstraction for clipboard/keyboard/notifications
 """
 
-from .voice_type import VoiceTranscriber
-from .platform_detect import get_platform_info, PlatformInfo
-
 __all__ = [
     'VoiceTranscriber',
     'get_platform_info',
     'PlatformInfo',
 ]
+
+# Exports are resolved on first access: importing a submodule (e.g. the
+# daemon) should not pay for numpy/requests via voice_type first.
+_EXPORTS = {
+    'VoiceTranscriber': '.voice_type',
+    'get_platform_info': '.platform_detect',
+    'PlatformInfo': '.platform_detect',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
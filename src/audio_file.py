@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Audio File Decoding
+Loads recordings from disk as 16 kHz mono int16, the format whisper-server
+and the rest of the pipeline expect:
+- WAV (8/16/24/32-bit PCM) is decoded with the standard library
+- anything else (mp3, ogg, opus, m4a, flac, ...) goes through ffmpeg,
+  which also does the down-mix and resampling
+"""
+import os
+import shutil
+import subprocess
+import wave
+import numpy as np
+import numpy.typing as npt
+from .resample import resample_poly, to_int16
+
+TARGET_SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.oga', '.opus', '.m4a', '.aac', '.wma', '.webm')
+
+
+class AudioDecodeError(Exception):
+    """A file could not be decoded to PCM"""
+
+
+def find_audio_files(paths):
+    """Expand files and directories (recursively) into audio file paths, sorted per directory"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def load_wav(path: str, target_rate: int = TARGET_SAMPLE_RATE) -> npt.NDArray[np.int16]:
+    """Decode a PCM WAV file to mono int16 at target_rate"""
+    try:
+        with wave.open(path, 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            width = wav_file.getsampwidth()
+            rate = wav_file.getframerate()
+            raw = wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise AudioDecodeError(f"{path}: {e}") from e
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) * 256
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32)
+    elif width == 3:
+        bytes_ = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        value = (bytes_[:, 0].astype(np.int32) | (bytes_[:, 1].astype(np.int32) << 8)
+                 | (bytes_[:, 2].astype(np.int8).astype(np.int32) << 16))
+        samples = value.astype(np.float32) / 256
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 65536
+    else:
+        raise AudioDecodeError(f"{path}: unsupported sample width {width * 8} bits")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate == target_rate:
+        return to_int16(samples)
+    return to_int16(resample_poly(samples, rate, target_rate))
+
+
+def load_with_ffmpeg(path: str, target_rate: int = TARGET_SAMPLE_RATE) -> npt.NDArray[np.int16]:
+    """Decode any ffmpeg-supported file to mono int16 at target_rate"""
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        raise AudioDecodeError(f"{path}: ffmpeg is needed to decode {os.path.splitext(path)[1] or 'this file'}")
+    result = subprocess.run(
+        [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', path,
+         '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(target_rate), '-'],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise AudioDecodeError(f"{path}: {result.stderr.decode(errors='replace').strip() or 'ffmpeg failed'}")
+    return np.frombuffer(result.stdout, dtype='<i2').astype(np.int16)
+
+
+def load_audio(path: str, target_rate: int = TARGET_SAMPLE_RATE) -> npt.NDArray[np.int16]:
+    """Decode an audio file to mono int16 at target_rate
+
+    Raises:
+        AudioDecodeError: If the file cannot be decoded
+    """
+    if not os.path.isfile(path):
+        raise AudioDecodeError(f"{path}: no such file")
+    if path.lower().endswith('.wav'):
+        try:
+            return load_wav(path, target_rate)
+        except AudioDecodeError:
+            if not shutil.which('ffmpeg'):
+                raise
+            # Compressed or float WAV: let ffmpeg handle it
+    return load_with_ffmpeg(path, target_rate)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Transcription Backends
+What turns 16 kHz int16 PCM into text, chosen with [backend] type:
+- "http": whisper.cpp server(s) over HTTP (WhisperClient/BackendPool in
+  whisper_client.py), the default
+- "local": whisper.cpp inside this process through pywhispercpp (optional
+  dependency). The model file is loaded once; utterances skip WAV encoding,
+  HTTP and the separate server process
+- "fake": deterministic text without any model, for tests and benchmarks
+
+Every backend has transcribe() (text), transcribe_timed() (text plus
+per-stage seconds), health() and close(), so the daemon, chunking, warm-up,
+batch and the skill work the same whichever is configured.
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, NamedTuple, Optional
+import numpy as np
+import numpy.typing as npt
+from .config import load_config
+from .tracing import get_tracer
+
+BACKEND_TYPES = ('http', 'local', 'fake')
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_MODEL = 'ggml-base.en.bin'  # The model start-server.sh serves
+
+
+class TranscriptionError(Exception):
+    """A non-HTTP backend could not transcribe (HTTP failures stay requests exceptions)"""
+
+
+def transcription_errors() -> tuple:
+    """Exceptions a failed transcription can raise, whichever backend is configured"""
+    import requests
+    return (TranscriptionError, requests.exceptions.RequestException)
+
+
+class Transcription(NamedTuple):
+    """Result of transcribe_timed()"""
+    text: str
+    timings: Dict[str, float]  # Stage -> seconds, including 'total'
+
+
+@contextmanager
+def timed(timings: Dict[str, float], stage: str):
+    """Add the enclosed block's duration to ``timings`` and the latency tracer
+
+    (The tracer skips it inside LatencyTracer.untraced(), e.g. for warm-ups.)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        timings[stage] = timings.get(stage, 0.0) + seconds
+        get_tracer().record(stage, seconds)
+
+
+class TranscriptionBackend(ABC):
+    """Interface shared by all backends"""
+
+    kind = ''  # [backend] type
+    needs_server = False  # Transcribes through whisper-server (which must be kept running)
+
+    @property
+    def name(self) -> str:
+        """What transcribes, for logs and the status reply"""
+        return self.kind
+
+    @property
+    def identity(self) -> str:
+        """What the text depends on besides the audio (e.g. for caching transcripts)"""
+        return f"{self.kind}:{self.name}"
+
+    @abstractmethod
+    def transcribe_timed(self, audio_data: npt.NDArray[np.int16],
+                         sample_rate: int = DEFAULT_SAMPLE_RATE,
+                         timeout: Optional[float] = None) -> Transcription:
+        """Transcribe int16 audio; text (stripped) and per-stage seconds
+
+        Raises:
+            TranscriptionError or requests.exceptions.RequestException
+        """
+
+    def transcribe(self, audio_data: npt.NDArray[np.int16],
+                   sample_rate: int = DEFAULT_SAMPLE_RATE,
+                   timeout: Optional[float] = None) -> str:
+        """Transcribe int16 audio and return the stripped text"""
+        return self.transcribe_timed(audio_data, sample_rate, timeout).text
+
+    def health(self, timeout: float = 2) -> bool:
+        """True if the backend can transcribe"""
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def _to_float(audio_data: npt.NDArray[np.int16], sample_rate: int) -> npt.NDArray[np.float32]:
+    """Mono float32 in [-1, 1) at 16 kHz, what whisper.cpp takes in-process"""
+    samples = audio_data.reshape(-1).astype(np.float32) / 32768.0
+    if sample_rate != DEFAULT_SAMPLE_RATE:
+        from .resample import resample_poly
+        samples = resample_poly(samples, sample_rate, DEFAULT_SAMPLE_RATE)
+    return samples
+
+
+def default_model_path() -> str:
+    """The model the bundled whisper-server uses (first existing candidate)"""
+    from .whisper_server import start_script_candidates
+    candidates = [os.path.join(os.path.dirname(os.path.dirname(script)), 'models', DEFAULT_MODEL)
+                  for script in start_script_candidates()]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return candidates[0]
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """whisper.cpp in this process (pywhispercpp), model loaded once"""
+
+    kind = 'local'
+
+    def __init__(self, model_path: str, threads: int = 4, language: str = ''):
+        """
+        Args:
+            model_path: ggml model file (e.g. .whisper/models/ggml-base.en.bin)
+            threads: CPU threads whisper.cpp uses per utterance
+            language: Spoken language code ('' = the model's default)
+        """
+        self.model_path = os.path.expanduser(model_path)
+        self.threads = threads
+        self.language = language
+        self._model = None
+        self._lock = threading.Lock()  # One whisper context: one utterance at a time
+
+    @property
+    def name(self) -> str:
+        return f"in-process whisper.cpp ({os.path.basename(self.model_path)})"
+
+    @property
+    def identity(self) -> str:
+        return f"{self.kind}:{os.path.abspath(self.model_path)}:{self.language}"
+
+    def _load(self):
+        if self._model is None:
+            try:
+                from pywhispercpp.model import Model
+            except ImportError as e:
+                raise TranscriptionError(
+                    "[backend] type = \"local\" needs pywhispercpp (pip install pywhispercpp)") from e
+            if not os.path.exists(self.model_path):
+                raise TranscriptionError(f"Model file not found: {self.model_path}")
+            params = {'n_threads': self.threads, 'print_progress': False, 'print_realtime': False}
+            if self.language:
+                params['language'] = self.language
+            try:
+                self._model = Model(self.model_path, redirect_whispercpp_logs_to=None, **params)
+            except Exception as e:
+                raise TranscriptionError(f"Could not load {self.model_path}: {e}") from e
+        return self._model
+
+    def health(self, timeout: float = 2) -> bool:
+        """Loads the model on first call (so the daemon fails early, not on first use)"""
+        try:
+            with self._lock:
+                self._load()
+            return True
+        except TranscriptionError as e:
+            # stderr: the skill's stdout carries JSON
+            print(f"✗ {e}", file=sys.stderr)
+            return False
+
+    def transcribe_timed(self, audio_data: npt.NDArray[np.int16],
+                         sample_rate: int = DEFAULT_SAMPLE_RATE,
+                         timeout: Optional[float] = None) -> Transcription:
+        """``timeout`` is ignored: in-process inference can't be abandoned midway"""
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        with timed(timings, 'encode'):
+            samples = _to_float(audio_data, sample_rate)
+        with self._lock:
+            model = self._load()
+            with timed(timings, 'inference'):
+                try:
+                    segments = model.transcribe(samples)
+                except Exception as e:
+                    raise TranscriptionError(f"whisper.cpp failed: {e}") from e
+        text = ' '.join(segment.text.strip() for segment in segments if segment.text.strip())
+        timings['total'] = time.perf_counter() - start
+        return Transcription(text, timings)
+
+    def close(self) -> None:
+        with self._lock:
+            self._model = None
+
+
+class FakeBackend(TranscriptionBackend):
+    """Deterministic stand-in: same audio, same text, no model or server"""
+
+    kind = 'fake'
+
+    def __init__(self, text: str = '', latency: float = 0.0, real_time_factor: float = 0.0):
+        """
+        Args:
+            text: Reply template; may use {seconds} and {digest} (of the PCM).
+                Empty = "fake transcription of <seconds>s audio <digest>"
+            latency: Simulated fixed processing time per request (seconds)
+            real_time_factor: Simulated processing seconds per audio second
+        """
+        self.text = text
+        self.latency = latency
+        self.real_time_factor = real_time_factor
+
+    def transcribe_timed(self, audio_data: npt.NDArray[np.int16],
+                         sample_rate: int = DEFAULT_SAMPLE_RATE,
+                         timeout: Optional[float] = None) -> Transcription:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        seconds = audio_data.size / sample_rate
+        with timed(timings, 'inference'):
+            delay = self.latency + self.real_time_factor * seconds
+            if delay > 0:
+                time.sleep(delay)
+            pcm = np.ascontiguousarray(audio_data.reshape(-1), dtype='<i2').tobytes()
+            digest = hashlib.sha256(pcm).hexdigest()[:8]
+        template = self.text or "fake transcription of {seconds:.2f}s audio {digest}"
+        timings['total'] = time.perf_counter() - start
+        return Transcription(template.format(seconds=seconds, digest=digest).strip(), timings)
+
+
+def create_backend(config=None) -> TranscriptionBackend:
+    """Build the backend selected by [backend] type"""
+    config = config or load_config()
+    backend = config["backend"]
+    kind = backend["type"]
+    if kind == 'http':
+        from .whisper_client import create_client
+        return create_client(config)
+    if kind == 'local':
+        return LocalWhisperBackend(backend["model"] or default_model_path(),
+                                   threads=backend["threads"], language=backend["language"])
+    if kind == 'fake':
+        return FakeBackend(backend["fake_text"], latency=backend["fake_latency"],
+                           real_time_factor=backend["fake_rtf"])
+    raise ValueError(f"Unknown [backend] type {kind!r} (expected one of: {', '.join(BACKEND_TYPES)})")
+
+
+# Global instance for easy access
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend(config=None) -> TranscriptionBackend:
+    """Get singleton backend selected in config.toml (or ``config`` on first use)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(config)
+        return _backend
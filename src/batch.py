@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Batch Transcription
+Transcribes existing recordings (meeting clips, voice memos) through the
+same whisper backend(s) as the daemon:
+- takes files and directories (searched recursively for audio files)
+- decodes and resamples everything to 16 kHz mono
+- runs several requests in parallel (match the server's --processors or
+  the number of backends); long files are also split at silences and
+  their chunks transcribed in parallel (see chunking.py)
+- streams one JSON object per file to stdout or --output as results arrive
+- caches results by a SHA-256 of the file contents and the backend that
+  produced them (kind plus server URLs or model file), so re-runs skip
+  files that were already transcribed (even if renamed or moved) while
+  switching [backend] or [whisper] urls transcribes them again
+
+Usage:
+    voicetype-batch [-j 4] [-o results.jsonl] [--no-cache] [--refresh] PATH...
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+from .audio_file import AudioDecodeError, TARGET_SAMPLE_RATE, find_audio_files, load_audio
+from .backends import create_backend, transcription_errors
+from .chunking import ChunkedTranscriber
+from .config import get_cache_dir, load_config
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Append-only JSONL cache of transcripts keyed by content hash and backend"""
+
+    def __init__(self, path: str, backend: str):
+        """
+        Args:
+            path: Cache file (shared by all backends)
+            backend: Identity of the backend in use (TranscriptionBackend.identity);
+                only its transcripts are returned
+        """
+        self.path = path
+        self.backend = backend
+        self._entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if entry.get('backend') == backend:
+                            self._entries[entry['sha256']] = entry
+                    except (ValueError, KeyError):
+                        continue  # Torn line from an interrupted run
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, sha256: str) -> Optional[dict]:
+        with self._lock:
+            return self._entries.get(sha256)
+
+    def put(self, sha256: str, text: str, audio_seconds: float) -> None:
+        entry = {'sha256': sha256, 'backend': self.backend, 'text': text, 'audio_seconds': audio_seconds}
+        with self._lock:
+            self._entries[sha256] = entry
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+
+class BatchTranscriber:
+    """Decodes and transcribes files in parallel, emitting one result per file"""
+
+    def __init__(self, client, jobs: int = 1, cache: Optional[TranscriptCache] = None,
+                 refresh: bool = False, chunker: Optional[ChunkedTranscriber] = None):
+        """
+        Args:
+            client: Transcription backend (see backends.py)
+            jobs: Files decoded and transcribed concurrently
+            cache: Transcript cache (None disables caching)
+            refresh: Ignore cached results (new results are still stored)
+            chunker: Splits long files into parallel requests (None sends each
+                file in one request)
+        """
+        self.client = client
+        self.chunker = chunker
+        self.jobs = max(1, jobs)
+        self.cache = cache
+        self.refresh = refresh
+
+    def transcribe_file(self, path: str) -> dict:
+        """Transcribe one file; errors are reported in the result, not raised"""
+        start = time.perf_counter()
+        result = {'file': path}
+        try:
+            sha256 = file_sha256(path)
+            result['sha256'] = sha256
+            cached = self.cache.get(sha256) if self.cache and not self.refresh else None
+            if cached is not None:
+                result.update(text=cached['text'], audio_seconds=cached['audio_seconds'], cached=True)
+                return result
+
+            audio = load_audio(path, TARGET_SAMPLE_RATE)
+            audio_seconds = round(len(audio) / TARGET_SAMPLE_RATE, 3)
+            if not len(audio):
+                text = ''
+            elif self.chunker is not None:
+                text = self.chunker.transcribe(audio)
+            else:
+                text = self.client.transcribe(audio, sample_rate=TARGET_SAMPLE_RATE)
+            if self.cache is not None:
+                self.cache.put(sha256, text, audio_seconds)
+            result.update(text=text, audio_seconds=audio_seconds, cached=False)
+        except (OSError, AudioDecodeError, *transcription_errors()) as e:
+            # Some decode errors have no message ("bad.wav: " alone says nothing)
+            result['error'] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        finally:
+            result['elapsed'] = round(time.perf_counter() - start, 3)
+        return result
+
+    def run(self, paths, output, progress=None) -> int:
+        """Transcribe all files, writing JSONL to ``output`` as results arrive.
+
+        Returns the number of failed files.
+        """
+        files = list(find_audio_files(paths))
+        failures = 0
+        executor = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            futures = [executor.submit(self.transcribe_file, path) for path in files]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                output.write(json.dumps(result, ensure_ascii=False) + '\n')
+                output.flush()
+                if 'error' in result:
+                    failures += 1
+                if progress:
+                    progress(done, len(files), result)
+        finally:
+            # On Ctrl+C don't wait for files that haven't started
+            executor.shutdown(wait=False, cancel_futures=True)
+        return failures
+
+
+def _print_progress(done: int, total: int, result: dict) -> None:
+    if 'error' in result:
+        status = f"✗ {result['error']}"
+    elif result.get('cached'):
+        status = "✓ cached"
+    else:
+        status = f"✓ {result['audio_seconds']:.1f}s audio in {result['elapsed']:.1f}s"
+    print(f"[{done}/{total}] {result['file']}: {status}", file=sys.stderr)
+
+
+def main():
+    """Entry point"""
+    config = load_config()
+    parser = argparse.ArgumentParser(description='Transcribe audio files and directories to JSONL')
+    parser.add_argument('paths', nargs='+', help='Audio files or directories')
+    parser.add_argument('-j', '--jobs', type=int, default=config["batch"]["jobs"],
+                        help=f'Parallel requests (default: {config["batch"]["jobs"]})')
+    parser.add_argument('-o', '--output', help='Write JSONL here instead of stdout (appends)')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the transcript cache')
+    parser.add_argument('--refresh', action='store_true', help='Re-transcribe cached files (updates the cache)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='No progress on stderr')
+    args = parser.parse_args()
+
+    client = create_backend(config)
+    cache = None
+    if not args.no_cache and config["batch"]["cache"] and client.kind != 'fake':
+        cache = TranscriptCache(os.path.join(get_cache_dir(), 'transcripts.jsonl'), client.identity)
+
+    chunker = None
+    if config["chunking"]["enabled"]:
+        chunker = ChunkedTranscriber.from_config(client, TARGET_SAMPLE_RATE, config)
+    batch = BatchTranscriber(client, jobs=args.jobs, cache=cache, refresh=args.refresh, chunker=chunker)
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    try:
+        failures = batch.run(args.paths, output, progress=None if args.quiet else _print_progress)
+    except KeyboardInterrupt:
+        print("\nInterrupted (finished files are cached)", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        client.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Capture Buffer
+Preallocated, geometrically growing audio arena written in place by the
+PortAudio callback. Replaces a queue of per-block copies plus a final
+np.concatenate: one allocation per recording and zero-copy reads.
+With native-rate capture, ResampledCapture converts the device-rate arena
+to 16 kHz chunk by chunk, off the audio callback thread.
+"""
+import threading
+import numpy as np
+import numpy.typing as npt
+from .resample import PolyphaseResampler, to_int16
+
+DEFAULT_CAPACITY_SECONDS = 60  # Covers typical holds without ever growing
+RESAMPLE_INTERVAL = 0.05  # Seconds between background resampling passes (native-rate capture)
+
+
+class CaptureBuffer:
+    """Append-only int16 audio arena
+
+    Single writer (the audio callback), any number of readers. Readers get
+    views; growth swaps in a larger array, so views taken earlier stay valid.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1,
+                 capacity_seconds: float = DEFAULT_CAPACITY_SECONDS,
+                 dtype=np.int16):
+        capacity = max(1, int(sample_rate * capacity_seconds))
+        # np.empty only reserves address space; pages are faulted in on first write
+        self._data = np.empty((capacity, channels), dtype=dtype)
+        self.length = 0  # Frames written so far
+        self.grow_count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def write(self, block: npt.NDArray) -> None:
+        """Copy one block into the arena (called from the audio callback)"""
+        frames = len(block)
+        end = self.length + frames
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self.length:end] = block
+        # Publish after the copy so readers never see unwritten frames
+        self.length = end
+
+    def view(self, start: int = 0, end: int = None) -> npt.NDArray:
+        """Zero-copy view of the frames recorded between start and end"""
+        # Read length before data: any array we then see holds at least `length` frames
+        length = self.length if end is None else min(end, self.length)
+        return self._data[start:length]
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, 2 * len(self._data))
+        data = np.empty((capacity, self._data.shape[1]), dtype=self._data.dtype)
+        data[:self.length] = self._data[:self.length]
+        self._data = data
+        self.grow_count += 1
+
+
+class PrerollRing:
+    """Fixed-size ring of the most recent audio, indexed by absolute frame
+
+    Used while the input stream is kept open between recordings so the audio
+    just before (and right after) a key press is never lost.
+    """
+
+    def __init__(self, sample_rate: int, seconds: float, channels: int = 1, dtype=np.int16):
+        self._data = np.zeros((max(1, int(sample_rate * seconds)), channels), dtype=dtype)
+        self.total = 0  # Absolute index of the next frame to be written
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest frame still held"""
+        return max(0, self.total - len(self._data))
+
+    def write(self, block: npt.NDArray) -> None:
+        """Append one block, overwriting the oldest frames (no allocation)"""
+        capacity = len(self._data)
+        if len(block) > capacity:
+            self.total += len(block) - capacity  # Frames that would be overwritten anyway
+            block = block[-capacity:]
+        frames = len(block)
+        pos = self.total % capacity
+        first = min(frames, capacity - pos)
+        self._data[pos:pos + first] = block[:first]
+        if first < frames:
+            self._data[:frames - first] = block[first:]
+        self.total += frames
+
+    def read_from(self, start: int) -> npt.NDArray:
+        """Copy of the frames from absolute index start up to now"""
+        start = max(start, self.oldest)
+        frames = max(0, self.total - start)
+        capacity = len(self._data)
+        pos = start % capacity
+        if pos + frames <= capacity:
+            return self._data[pos:pos + frames].copy()
+        return np.concatenate((self._data[pos:], self._data[:pos + frames - capacity]))
+
+
+class ResampledCapture:
+    """Native-rate capture arena converted to a target-rate one in the background
+
+    The audio callback writes device-rate audio into ``raw`` (a plain copy);
+    a worker thread resamples whatever arrived every RESAMPLE_INTERVAL into
+    ``buffer``, which is what readers (streaming segments, the meter, the
+    final recording) see.
+    """
+
+    def __init__(self, rate: int, target_rate: int, channels: int = 1):
+        self.raw = CaptureBuffer(rate, channels)
+        self.buffer = CaptureBuffer(target_rate, channels)
+        self._resampler = PolyphaseResampler(rate, target_rate)
+        self._consumed = 0  # Frames of raw already resampled
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='resample')
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def finish(self) -> CaptureBuffer:
+        """Stop the worker and resample the rest (call once the callback stopped writing)"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.update()
+        with self._lock:
+            self._write(self._resampler.flush())
+        return self.buffer
+
+    def update(self) -> None:
+        """Resample the raw audio that arrived since the last call"""
+        with self._lock:
+            end = self.raw.length
+            if end > self._consumed:
+                block = self.raw.view(self._consumed, end)
+                self._consumed = end
+                self._write(self._resampler.process(block[:, 0]))
+
+    def _run(self) -> None:
+        while not self._stop.wait(RESAMPLE_INTERVAL):
+            self.update()
+
+    def _write(self, samples: npt.NDArray[np.float32]) -> None:
+        if len(samples):
+            self.buffer.write(to_int16(samples).reshape(-1, 1))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Long Audio Chunking
+Long recordings are not sent as one request: that needs a huge timeout and
+keeps all but one server processor idle. Instead they are
+- split at the quietest point within each bounded-length window, so cuts
+  land in pauses rather than mid-word
+- given a short overlap where a cut could not avoid speech
+- transcribed concurrently (across --processors or backends)
+- stitched back in order, dropping words repeated in an overlap
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+import numpy as np
+import numpy.typing as npt
+from .vad import FRAME_MS, frame_rms
+
+DEFAULT_MAX_CHUNK = 30.0  # Seconds; whisper's native window
+DEFAULT_MIN_CHUNK = 15.0  # Don't cut earlier than this into a chunk
+DEFAULT_OVERLAP = 0.5  # Seconds repeated when a cut falls inside speech
+DEFAULT_WORKERS = 1
+SILENCE_THRESHOLD = 0.01  # RMS below which a cut point counts as a pause
+SMOOTHING_MS = 150  # Cut in the middle of a quiet stretch, not at one quiet frame
+MAX_OVERLAP_WORDS = 8  # Longest repeated word run removed when stitching
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+class Chunk(NamedTuple):
+    """One slice of a long recording"""
+    start: int  # Sample offsets into the recording
+    end: int
+    overlapped: bool  # Starts before the cut point (cut was inside speech)
+
+
+def check_chunk_lengths(max_chunk: float, min_chunk: float, overlap: float) -> None:
+    """Raise ValueError unless every chunk can end after the overlap it starts with"""
+    if max_chunk <= 0:
+        raise ValueError(f"max_chunk must be positive (got {max_chunk})")
+    if not 0 <= overlap < min(min_chunk, max_chunk):
+        raise ValueError(f"overlap ({overlap}) must be at least 0 and shorter than "
+                         f"min_chunk ({min_chunk}) and max_chunk ({max_chunk})")
+
+
+def split_at_silence(audio_data: npt.NDArray[np.int16], sample_rate: int,
+                     max_chunk: float = DEFAULT_MAX_CHUNK, min_chunk: float = DEFAULT_MIN_CHUNK,
+                     overlap: float = DEFAULT_OVERLAP) -> List[Chunk]:
+    """Split audio into chunks of at most ``max_chunk`` seconds at low-energy points
+
+    Raises:
+        ValueError: If the lengths can't make progress (see check_chunk_lengths)
+    """
+    check_chunk_lengths(max_chunk, min_chunk, overlap)
+    samples = audio_data.reshape(-1)
+    n = len(samples)
+    max_len = int(max_chunk * sample_rate)
+    if n <= max_len:
+        return [Chunk(0, n, False)]
+
+    min_len = min(int(min_chunk * sample_rate), max_len - 1)
+    overlap_len = int(overlap * sample_rate)
+    frame_length = max(1, sample_rate * FRAME_MS // 1000)
+    rms = frame_rms(samples, frame_length)
+    smooth = max(1, SMOOTHING_MS // FRAME_MS)
+    if smooth > 1 and len(rms) >= smooth:
+        rms = np.convolve(rms, np.ones(smooth, dtype=np.float32) / smooth, 'same')
+
+    chunks = []
+    start, overlapped = 0, False
+    while n - start > max_len:
+        first = (start + min_len) // frame_length
+        last = (start + max_len - overlap_len) // frame_length
+        window = rms[first:last]
+        if len(window):
+            best = first + int(np.argmin(window))
+            cut = best * frame_length + frame_length // 2
+            quiet = bool(rms[best] < SILENCE_THRESHOLD)
+        else:
+            cut, quiet = start + max_len - overlap_len, False
+
+        chunks.append(Chunk(start, cut, overlapped))
+        overlapped = not quiet and overlap_len > 0
+        # Always move forward, whatever frame rounding did to the cut
+        start = max(cut - overlap_len if overlapped else cut, start + 1)
+    chunks.append(Chunk(start, n, overlapped))
+    return chunks
+
+
+def _normalize(word: str) -> str:
+    match = _WORD_RE.findall(word.lower())
+    return ''.join(match)
+
+
+def stitch(texts: List[str], overlapped: List[bool], max_overlap_words: int = MAX_OVERLAP_WORDS) -> str:
+    """Join chunk transcripts, removing words an overlap made appear twice"""
+    words: List[str] = []
+    for text, has_overlap in zip(texts, overlapped):
+        new_words = text.split()
+        if has_overlap and words and new_words:
+            tail = [_normalize(w) for w in words[-max_overlap_words:]]
+            head = [_normalize(w) for w in new_words[:max_overlap_words]]
+            for k in range(min(len(tail), len(head)), 0, -1):
+                if tail[-k:] == head[:k] and any(head[:k]):
+                    new_words = new_words[k:]
+                    break
+        words.extend(new_words)
+    return ' '.join(words)
+
+
+class ChunkedTranscriber:
+    """Transcribes long audio as concurrent chunks through a client"""
+
+    def __init__(self, client, sample_rate: int, max_chunk: float = DEFAULT_MAX_CHUNK,
+                 min_chunk: float = DEFAULT_MIN_CHUNK, overlap: float = DEFAULT_OVERLAP,
+                 workers: int = DEFAULT_WORKERS):
+        """
+        Args:
+            client: Transcription backend (see backends.py)
+            sample_rate: Sample rate of the audio passed to transcribe()
+            max_chunk: Longest audio (seconds) sent in one request
+            min_chunk: Earliest cut point within a chunk (seconds)
+            overlap: Audio repeated across a cut that falls inside speech (seconds)
+            workers: Chunks in flight at once
+
+        Raises:
+            ValueError: If overlap isn't shorter than min_chunk and max_chunk
+        """
+        check_chunk_lengths(max_chunk, min_chunk, overlap)
+        self.client = client
+        self.sample_rate = sample_rate
+        self.max_chunk = max_chunk
+        self.min_chunk = min_chunk
+        self.overlap = overlap
+        self.workers = max(1, workers)
+
+    @classmethod
+    def from_config(cls, client, sample_rate: int, config) -> 'ChunkedTranscriber':
+        chunking = config["chunking"]
+        return cls(client, sample_rate, max_chunk=chunking["max_chunk"], min_chunk=chunking["min_chunk"],
+                   overlap=chunking["overlap"], workers=chunking["workers"])
+
+    def transcribe(self, audio_data: npt.NDArray[np.int16], timeout: Optional[float] = None) -> str:
+        """Transcribe audio of any length (``timeout`` applies per request, None = adaptive)
+
+        Raises:
+            TranscriptionError or requests.exceptions.RequestException: If any chunk fails
+        """
+        chunks = split_at_silence(audio_data, self.sample_rate, self.max_chunk,
+                                  self.min_chunk, self.overlap)
+        samples = audio_data.reshape(-1)
+        if len(chunks) == 1:
+            return self.client.transcribe(samples, sample_rate=self.sample_rate, timeout=timeout)
+
+        def transcribe_chunk(chunk):
+            return self.client.transcribe(samples[chunk.start:chunk.end],
+                                          sample_rate=self.sample_rate, timeout=timeout)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            texts = list(executor.map(transcribe_chunk, chunks))
+        return stitch(texts, [chunk.overlapped for chunk in chunks])
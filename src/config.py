@@ -37,18 +37,87 @@ DEFAULT_CONFIG = {
         "trigger_key": "F12",
         "min_duration": 0.3,
     },
+    "backend": {
+        "type": "http",  # "http" (whisper-server), "local" (in-process) or "fake"
+        "model": "",  # local: ggml model file; empty = the bundled server's model
+        "threads": 4,
+        "language": "",
+        "fake_text": "",
+        "fake_latency": 0.0,
+        "fake_rtf": 0.0,
+    },
+    "whisper": {
+        "urls": ["http://127.0.0.1:2022"],
+        "pool_size": 4,
+        "health_check_interval": 5.0,
+        "adaptive_timeout": True,
+        "timeout": 30.0,
+        "timeout_base": 5.0,
+        "timeout_percentile": 95.0,
+        "timeout_margin": 2.0,
+        "timeout_max": 900.0,
+        "upload_format": "auto",
+    },
     "audio": {
         "beep_enabled": True,
         "beep_use_wav_files": True,
         "start_frequency": 800,
         "stop_frequency": 400,
         "beep_duration": 0.1,
+        "keep_stream_open": False,
+        "preroll": 0.5,
+        "blocksize": 0,
+        "latency": "high",
+        "native_rate": False,
     },
     "output": {
         "clipboard_paste_delay": 0.15,
+        "virtual_keyboard": True,
         "notification_preview_length": 50,
         "notification_timeout": 5000,
     },
+    "pipeline": {
+        "workers": 1,
+        "max_pending": 4,
+        "overflow": "reject",
+    },
+    "streaming": {
+        "enabled": False,
+        "min_segment": 3.0,
+        "max_segment": 20.0,
+        "pause_duration": 0.4,
+        "silence_threshold": 0.01,
+    },
+    "warmup": {
+        "on_startup": True,
+        "prewarm_on_press": True,
+        "idle_threshold": 300,
+    },
+    "vad": {
+        "enabled": True,
+        "threshold": 0.005,
+        "padding": 0.2,
+        "min_speech": 0.1,
+    },
+    "chunking": {
+        "enabled": True,
+        "max_chunk": 30.0,
+        "min_chunk": 15.0,
+        "overlap": 0.5,
+        "workers": 1,
+    },
+    "batch": {
+        "jobs": 1,
+        "cache": True,
+    },
+    "control": {
+        "enabled": True,
+        "socket": "",  # Empty = $XDG_RUNTIME_DIR/voicetype/daemon.sock
+    },
+    "tracing": {
+        "enabled": True,
+        "flush_interval": 30,
+    },
     "ui": {
         "show_audio_meter": True,
         "meter_width": 20,
@@ -62,6 +131,32 @@ def get_config_path():
     return os.path.expanduser("~/.config/voicetype/config.toml")
 
 
+def get_state_dir():
+    """Get (and create) the directory for logs and runtime state."""
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    path = os.path.join(state_home, "voicetype")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_cache_dir():
+    """Get (and create) the directory for caches (transcripts, ...)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(cache_home, "voicetype")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_runtime_dir():
+    """Get (and create) the directory for sockets (XDG_RUNTIME_DIR, else the state dir)."""
+    runtime_home = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_home:
+        return get_state_dir()
+    path = os.path.join(runtime_home, "voicetype")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
 def load_config():
     """
     Load configuration from ~/.config/voicetype/config.toml
@@ -82,9 +177,22 @@ def load_config():
             print(f"⚠ Warning: Could not load config from {config_path}: {e}")
             print("  Using default configuration")
 
+    _check_chunking(config)
     return config
 
 
+def _check_chunking(config):
+    """Fall back to the default chunk lengths if splitting could not make progress"""
+    chunking = config["chunking"]
+    max_chunk, min_chunk, overlap = chunking["max_chunk"], chunking["min_chunk"], chunking["overlap"]
+    if max_chunk > 0 and 0 <= overlap < min(min_chunk, max_chunk):
+        return
+    print(f"⚠ Warning: [chunking] overlap ({overlap}) must be shorter than min_chunk ({min_chunk}) "
+          f"and max_chunk ({max_chunk}), using the defaults")
+    for key in ("max_chunk", "min_chunk", "overlap"):
+        chunking[key] = DEFAULT_CONFIG["chunking"][key]
+
+
 def get_trigger_key_code(config):
     """
     Convert the trigger key name from config to evdev key code.
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Daemon Control Socket
+A Unix-domain socket through which other processes (the Claude skill)
+drive the running hold-to-speak daemon instead of starting from scratch:
+no re-imports, no health checks, warm microphone and server connection.
+
+Protocol: the client sends one JSON object per line and the daemon answers
+with one JSON object per line, e.g.
+    {"command": "status"}
+    {"command": "record", "duration": 5}
+    {"command": "transcribe", "audio": "<base64 int16 PCM>", "sample_rate": 16000}
+Failures are reported as {"error": "..."}.
+
+This module only uses the standard library so the client side stays fast
+(the server side imports asyncio when it starts).
+"""
+import json
+import os
+import socket
+from typing import Callable, Dict, Iterable, Optional
+from .config import get_runtime_dir
+
+SOCKET_NAME = 'daemon.sock'
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # Generous bound for base64 audio in 'transcribe'
+CONTROL_WORKERS = 2  # Blocking handlers (record, transcribe) running at once
+
+
+def get_control_socket_path(config=None) -> str:
+    """Socket path from [control] socket, or $XDG_RUNTIME_DIR/voicetype/daemon.sock"""
+    path = (config or {}).get("control", {}).get("socket")
+    if path:
+        return os.path.expanduser(path)
+    return os.path.join(get_runtime_dir(), SOCKET_NAME)
+
+
+class ControlServer:
+    """Accepts control connections on the daemon's event loop and dispatches commands
+
+    Connections are served by the loop; handlers that may block (recording,
+    transcription) run on a bounded thread pool, so a burst of requests
+    queues there instead of spawning a thread per connection. Handlers
+    named in ``inline`` are cheap and answered directly on the loop, so
+    'status' stays responsive while the pool is busy.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[[dict], dict]], path: Optional[str] = None,
+                 workers: int = CONTROL_WORKERS, inline: Iterable[str] = ('status',)):
+        """
+        Args:
+            handlers: command name -> handler(request) returning the reply dict;
+                handlers run on a worker thread and may block
+            path: Socket path (default: get_control_socket_path())
+            workers: Handlers running at once; further requests wait
+            inline: Commands whose handlers never block (run on the loop)
+        """
+        self.handlers = handlers
+        self.path = path or get_control_socket_path()
+        self.workers = max(1, workers)
+        self.inline = frozenset(inline)
+        self._server = None
+        self._executor = None
+        self._connections = set()  # Tasks serving open connections
+
+    async def start(self) -> None:
+        """Bind the socket (replacing a stale one) and start accepting"""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        if self._server is not None:
+            return
+        if os.path.exists(self.path):
+            if _socket_alive(self.path):
+                raise OSError(f"Another daemon is listening on {self.path}")
+            os.unlink(self.path)
+
+        old_umask = os.umask(0o177)  # Socket is owner-only (it can record the microphone)
+        try:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path,
+                                                           limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(old_umask)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='control')
+
+    async def stop(self) -> None:
+        """Stop accepting, cancel open requests and remove the socket file"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.close()
+        for task in list(self._connections):
+            task.cancel()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        # Handlers already running can't be interrupted; they finish unobserved
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _serve(self, reader, writer) -> None:
+        import asyncio
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                command = request.get('command')
+                handler = self.handlers.get(command)
+                if handler is None:
+                    reply = {'error': f"Unknown command {command!r}",
+                             'commands': sorted(self.handlers)}
+                elif command in self.inline:
+                    reply = handler(request)
+                else:
+                    loop = asyncio.get_running_loop()
+                    reply = await loop.run_in_executor(self._executor, handler, request)
+            except (ValueError, asyncio.LimitOverrunError) as e:
+                reply = {'error': f"Invalid request: {e}"}
+            except Exception as e:
+                reply = {'error': f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(reply).encode() + b'\n')
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass  # Client went away
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+def _socket_alive(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def send_command(command: str, timeout: float = 5.0, path: Optional[str] = None, **params) -> dict:
+    """Send one command to the running daemon and return its reply
+
+    Raises:
+        OSError: If no daemon is listening (e.g. FileNotFoundError,
+            ConnectionRefusedError) or the connection timed out
+    """
+    request = dict(params, command=command)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or get_control_socket_path())
+        with sock.makefile('rwb') as stream:
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionResetError("Daemon closed the control connection without replying")
+    return json.loads(line)
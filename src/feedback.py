@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Audio Feedback Player
+Start/stop sounds are decoded or synthesized once and kept in memory, then
+played through a persistent output stream. play() only swaps a pointer, so
+the key handler never waits for a process spawn or for playback to finish.
+"""
+import subprocess
+import threading
+import wave
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_SAMPLE_RATE = 44100
+FADE_SECONDS = 0.005  # Short fade in/out so synthesized tones don't click
+
+
+class FeedbackPlayer:
+    """Non-blocking player for short cached feedback sounds"""
+
+    def __init__(self, sample_rate: int = DEFAULT_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._sounds = {}  # name -> float32 mono samples at sample_rate
+        self._stream = None
+        self._lock = threading.Lock()
+        self._playing = None  # Samples of the sound currently playing
+        self._position = 0
+
+    def load_wav(self, name: str, path: str) -> None:
+        """Decode a 16-bit PCM WAV file into the cache"""
+        with wave.open(path, 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            rate = wav_file.getframerate()
+            if wav_file.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            raw = wav_file.readframes(wav_file.getnframes())
+
+        samples = np.frombuffer(raw, dtype='<i2').reshape(-1, channels)
+        mono = samples.mean(axis=1, dtype=np.float32) / 32768.0
+        self._sounds[name] = self._resample(mono, rate)
+
+    def add_tone(self, name: str, frequency: float, duration: float) -> None:
+        """Synthesize a sine tone into the cache"""
+        samples = int(self.sample_rate * duration)
+        t = np.arange(samples, dtype=np.float32) / self.sample_rate
+        tone = np.sin(2 * np.pi * frequency * t).astype(np.float32)
+
+        fade = min(samples // 2, int(self.sample_rate * FADE_SECONDS))
+        if fade:
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+            tone[:fade] *= ramp
+            tone[-fade:] *= ramp[::-1]
+        self._sounds[name] = tone
+
+    def open(self) -> None:
+        """Open the persistent output stream (falls back to paplay on failure)"""
+        if self._stream is not None:
+            return
+        try:
+            import sounddevice as sd  # Loads PortAudio; deferred until a stream is needed
+            self._stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype='float32',
+                callback=self._callback
+            )
+            self._stream.start()
+        except Exception:
+            self._stream = None
+
+    def close(self) -> None:
+        """Close the output stream"""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def play(self, name: str) -> None:
+        """Start playing a cached sound and return immediately"""
+        samples = self._sounds.get(name)
+        if samples is None:
+            return
+
+        if self._stream is None:
+            # No output stream: play in the background via paplay
+            threading.Thread(target=self._play_subprocess, args=(samples,), daemon=True).start()
+            return
+
+        with self._lock:
+            self._playing = samples  # A new sound cuts off the previous one
+            self._position = 0
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self._lock:
+            playing = self._playing
+            position = self._position
+            if playing is None:
+                outdata.fill(0)
+                return
+            chunk = playing[position:position + frames]
+            self._position = position + frames
+            if self._position >= len(playing):
+                self._playing = None
+
+        outdata[:len(chunk), 0] = chunk
+        outdata[len(chunk):] = 0
+
+    def _play_subprocess(self, samples: npt.NDArray[np.float32]) -> None:
+        pcm = (samples * 32767).astype('<i2').tobytes()
+        try:
+            subprocess.run([
+                'paplay',
+                '--raw',
+                '--format=s16le',
+                f'--rate={self.sample_rate}',
+                '--channels=1',
+                '/dev/stdin'
+            ], input=pcm, timeout=2, check=False, stderr=subprocess.DEVNULL)
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            # Silently fail if paplay not available
+            pass
+
+    def _resample(self, samples: npt.NDArray[np.float32], rate: int) -> npt.NDArray[np.float32]:
+        if rate == self.sample_rate:
+            return samples.astype(np.float32, copy=False)
+        # Linear interpolation is plenty for short feedback sounds
+        n_out = int(round(len(samples) * self.sample_rate / rate))
+        positions = np.arange(n_out, dtype=np.float64) * (rate / self.sample_rate)
+        return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+FLAC Encoding
+Lossless compression of mono 16-bit audio for uploads to whisper servers
+on other machines, where the 32 KB/s of raw WAV dominates a long
+dictation's latency. Written with numpy alone (no libFLAC binding):
+- fixed blocks of 4096 samples
+- per block the cheapest of a CONSTANT subframe (digital silence), a FIXED
+  polynomial predictor of order 0-4, or VERBATIM samples
+- Rice-coded residuals with the partition order and parameters picked by
+  exact bit cost
+
+Speech typically shrinks to 40-60% of the WAV size. The encoder favours
+speed over the last few percent (no LPC), since it runs on the critical
+path between key release and upload.
+"""
+import hashlib
+import struct
+from typing import List, NamedTuple, Tuple
+import numpy as np
+import numpy.typing as npt
+
+BLOCK_SIZE = 4096
+MAX_FIXED_ORDER = 4
+MAX_PARTITION_ORDER = 6
+MAX_RICE_PARAMETER = 14  # 4-bit parameters; 15 is the escape code
+PLAN_BATCH = 64  # Blocks analysed together
+BITS_PER_SAMPLE = 16
+
+# Frame header sample rate codes (others are taken from STREAMINFO)
+SAMPLE_RATE_CODES = {
+    88200: 1, 176400: 2, 192000: 3, 8000: 4, 16000: 5, 22050: 6,
+    24000: 7, 32000: 8, 44100: 9, 48000: 10, 96000: 11,
+}
+
+_crc16_shift_tables: List[npt.NDArray[np.int64]] = []
+
+
+def _crc8(data: bytes) -> int:
+    """CRC-8 (polynomial 0x07) of a frame header"""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def _crc16_shift_table(level: int) -> npt.NDArray[np.int64]:
+    """Maps the CRC-16 of a message to the CRC-16 of it followed by 2**level zero words"""
+    while len(_crc16_shift_tables) <= level:
+        if _crc16_shift_tables:
+            previous = _crc16_shift_tables[-1]
+            _crc16_shift_tables.append(previous[previous])
+        else:
+            table = np.arange(65536, dtype=np.int64)
+            for _ in range(16):
+                table = np.where(table & 0x8000, (table << 1) ^ 0x8005, table << 1) & 0xFFFF
+            _crc16_shift_tables.append(table)
+    return _crc16_shift_tables[level]
+
+
+def _crc16_frames(payload: bytearray, frames: List[Tuple[int, int]]) -> List[int]:
+    """CRC-16 (polynomial 0x8005, initial value 0) of each payload[start:end]
+
+    The CRC is linear and unaffected by leading zeros, so every frame is
+    left-padded to the same power-of-two number of 16-bit words and the CRCs
+    of adjacent halves are combined pairwise (crc(A+B) = shift(crc(A)) ^
+    crc(B)) for all frames at once, instead of one table lookup per byte.
+    """
+    longest = max(end - start for start, end in frames)
+    levels = max(1, (longest + 1) // 2 - 1).bit_length()
+    width = 2 << levels  # Bytes per padded frame
+    padded = np.zeros((len(frames), width), dtype=np.uint8)
+    data = np.frombuffer(bytes(payload), dtype=np.uint8)
+    for row, (start, end) in enumerate(frames):
+        padded[row, width - (end - start):] = data[start:end]
+
+    words = padded.view('>u2').astype(np.int64)
+    crcs = _crc16_shift_table(0)[words]  # CRC of each word on its own
+    for level in range(levels):
+        crcs = _crc16_shift_table(level)[crcs[:, 0::2]] ^ crcs[:, 1::2]
+    return crcs[:, 0].tolist()
+
+
+def _utf8_number(n: int) -> bytes:
+    """Frame number in FLAC's extended UTF-8 coding"""
+    if n < 0x80:
+        return bytes([n])
+    length = 2
+    while n >= 1 << (5 * length + 1):
+        length += 1
+    out = []
+    for _ in range(length - 1):
+        out.append(0x80 | (n & 0x3F))
+        n >>= 6
+    lead = (0xFF00 >> length) & 0xFF
+    return bytes([lead | n] + out[::-1])
+
+
+class _Fields:
+    """Bit fields of the whole stream, packed in one vectorized pass"""
+
+    def __init__(self):
+        self.values: List[npt.NDArray[np.int64]] = []
+        self.widths: List[npt.NDArray[np.int64]] = []
+        self.bits = 0
+
+    def add(self, value: int, width: int) -> None:
+        self.values.append(np.array([value], dtype=np.int64))
+        self.widths.append(np.array([width], dtype=np.int64))
+        self.bits += width
+
+    def add_bytes(self, data: bytes) -> None:
+        self.values.append(np.frombuffer(data, dtype=np.uint8).astype(np.int64))
+        self.widths.append(np.full(len(data), 8, dtype=np.int64))
+        self.bits += 8 * len(data)
+
+    def add_array(self, values: npt.NDArray[np.int64], widths: npt.NDArray[np.int64], bits: int) -> None:
+        self.values.append(values)
+        self.widths.append(widths)
+        self.bits += bits
+
+    def pack(self) -> bytearray:
+        """Concatenate all fields MSB-first (the total must be whole bytes)
+
+        Every value is below 2**16 and 2**width, so once shifted to its end
+        position it covers at most three bytes. Fields never share bits,
+        which makes summing the byte contributions equal to OR-ing them.
+        """
+        values = np.concatenate(self.values)
+        last = np.cumsum(np.concatenate(self.widths)) - 1
+        shifted = values << (7 - (last & 7))
+        byte = (last >> 3) + 2  # Room for the two bytes before the first field's end
+        out = np.zeros(int(byte[-1]) + 1, dtype=np.int64)
+        for offset in range(3):
+            np.add.at(out, byte - offset, (shifted >> (8 * offset)) & 0xFF)
+        return bytearray(out[2:].astype(np.uint8).tobytes())
+
+
+class _BlockPlan(NamedTuple):
+    """How one block is coded"""
+    kind: str  # 'constant', 'fixed' or 'verbatim'
+    order: int = 0  # FIXED predictor order
+    partition_order: int = 0
+    params: Tuple[int, ...] = ()  # Rice parameter per partition
+    folded: npt.NDArray[np.int64] = None  # Zigzag-folded residual (FIXED)
+
+
+def _plan_blocks(blocks: npt.NDArray[np.int64]) -> List[_BlockPlan]:
+    """Pick the cheapest coding for each row of equally sized blocks"""
+    count, n = blocks.shape
+    constant = (blocks == blocks[:, :1]).all(axis=1) & (n > 1)
+    if n <= MAX_FIXED_ORDER:
+        return [_BlockPlan('constant' if c else 'verbatim') for c in constant]
+
+    # FIXED residuals of every order, front-padded to the block length
+    residuals = np.zeros((MAX_FIXED_ORDER + 1, count, n), dtype=np.int64)
+    residuals[0] = blocks
+    for order in range(1, MAX_FIXED_ORDER + 1):
+        residuals[order, :, order:] = np.diff(residuals[order - 1, :, order - 1:], axis=1)
+    orders = np.abs(residuals).sum(axis=2).argmin(axis=0)
+    residual = residuals[orders, np.arange(count)]
+    folded = np.where(residual >= 0, residual << 1, (-residual << 1) - 1)
+
+    # Unary bits per Rice parameter over the finest partitions; coarser
+    # partition orders are sums of these
+    finest = 0
+    while (finest < MAX_PARTITION_ORDER and n % (2 << finest) == 0
+           and n >> (finest + 1) > MAX_FIXED_ORDER):
+        finest += 1
+    params = np.arange(MAX_RICE_PARAMETER + 1, dtype=np.int64)
+    unary = np.empty((count, len(params), 1 << finest), dtype=np.int64)
+    for k in params:
+        unary[:, k] = (folded >> k).reshape(count, 1 << finest, -1).sum(axis=2)
+    sizes = np.full((count, 1 << finest), n >> finest, dtype=np.int64)
+    sizes[:, 0] -= orders  # Warm-up samples are not in the residual
+
+    best_bits = np.full(count, np.iinfo(np.int64).max)
+    best_order = np.zeros(count, dtype=np.int64)
+    best_params = [None] * count
+    for partition_order in range(finest + 1):
+        group = 1 << (finest - partition_order)
+        costs = (unary.reshape(count, len(params), 1 << partition_order, group).sum(axis=3)
+                 + sizes.reshape(count, 1 << partition_order, group).sum(axis=2)[:, None, :]
+                 * (params[None, :, None] + 1))
+        bits = costs.min(axis=1).sum(axis=1) + 4 * (1 << partition_order)
+        chosen = costs.argmin(axis=1)
+        better = bits < best_bits
+        best_bits[better] = bits[better]
+        best_order[better] = partition_order
+        for row in np.flatnonzero(better):
+            best_params[row] = tuple(chosen[row].tolist())
+
+    verbatim_bits = n * BITS_PER_SAMPLE
+    plans = []
+    for row in range(count):
+        order = int(orders[row])
+        if constant[row]:
+            plans.append(_BlockPlan('constant'))
+        elif best_bits[row] + order * BITS_PER_SAMPLE + 6 >= verbatim_bits:
+            plans.append(_BlockPlan('verbatim'))
+        else:
+            plans.append(_BlockPlan('fixed', order, int(best_order[row]), best_params[row],
+                                    folded[row, order:]))
+    return plans
+
+
+def _write_subframe(fields: _Fields, block: npt.NDArray[np.int64], plan: _BlockPlan) -> None:
+    n = len(block)
+    if plan.kind == 'constant':
+        fields.add(0b00000000, 8)
+        fields.add(int(block[0]) & 0xFFFF, BITS_PER_SAMPLE)
+        return
+    if plan.kind == 'verbatim':
+        fields.add(0b00000010, 8)
+        fields.add_array(block & 0xFFFF, np.full(n, BITS_PER_SAMPLE, dtype=np.int64), n * BITS_PER_SAMPLE)
+        return
+
+    order = plan.order
+    fields.add((0b001000 | order) << 1, 8)  # FIXED, no wasted bits
+    fields.add_array(block[:order] & 0xFFFF, np.full(order, BITS_PER_SAMPLE, dtype=np.int64),
+                     order * BITS_PER_SAMPLE)
+    fields.add(0b00, 2)  # Rice coding, 4-bit parameters
+    fields.add(plan.partition_order, 4)
+
+    # Each sample's unary quotient (zeros then a one) and k-bit remainder
+    # form one field; the partitions' 4-bit parameters go in between
+    partitions = 1 << plan.partition_order
+    partition_size = n >> plan.partition_order
+    starts = np.arange(partitions) * partition_size - order
+    starts[0] = 0
+    k = np.repeat(np.array(plan.params, dtype=np.int64), np.diff(np.append(starts, n - order)))
+    folded = plan.folded
+    values = np.insert((np.int64(1) << k) | (folded & ((np.int64(1) << k) - 1)), starts, plan.params)
+    widths = np.insert((folded >> k) + 1 + k, starts, 4)
+    fields.add_array(values, widths, int(widths.sum()))
+
+
+def encode_flac(audio_data: npt.NDArray[np.int16], sample_rate: int,
+                block_size: int = BLOCK_SIZE) -> bytearray:
+    """Encode mono int16 samples as a FLAC file in memory
+
+    Args:
+        audio_data: Mono int16 audio samples (shape (n,) or (n, 1))
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Complete FLAC file contents
+    """
+    samples = np.ascontiguousarray(audio_data, dtype='<i2').reshape(-1)
+    total = len(samples)
+    block_size = max(16, min(block_size, total)) if total else block_size
+
+    streaminfo = struct.pack('>HH', block_size, block_size) + b'\0' * 6
+    streaminfo += ((sample_rate << 44) | (0 << 41) | ((BITS_PER_SAMPLE - 1) << 36) | total).to_bytes(8, 'big')
+    streaminfo += hashlib.md5(samples.tobytes()).digest()
+    head = b'fLaC' + bytes([0x80]) + len(streaminfo).to_bytes(3, 'big') + streaminfo
+    if not total:
+        return bytearray(head)
+
+    fields = _Fields()
+    fields.add_bytes(head)
+    frames: List[Tuple[int, int]] = []  # (start, end) byte offsets, end excludes the CRC-16
+    rate_code = SAMPLE_RATE_CODES.get(sample_rate, 0)
+    wide = samples.astype(np.int64)
+    full = total // block_size * block_size
+    plans: List[_BlockPlan] = []
+    for start in range(0, full, PLAN_BATCH * block_size):  # Bounded temporary arrays
+        stop = min(full, start + PLAN_BATCH * block_size)
+        plans += _plan_blocks(wide[start:stop].reshape(-1, block_size))
+    if full < total:
+        plans += _plan_blocks(wide[None, full:])
+
+    for number, (start, plan) in enumerate(zip(range(0, total, block_size), plans)):
+        block = wide[start:start + block_size]
+        frame_start = fields.bits // 8
+        header = bytes([0xFF, 0xF8, (0b0111 << 4) | rate_code, 0b0000_100_0])
+        header += _utf8_number(number) + struct.pack('>H', len(block) - 1)
+        fields.add_bytes(header + bytes([_crc8(header)]))
+        _write_subframe(fields, block, plan)
+        if fields.bits % 8:
+            fields.add(0, 8 - fields.bits % 8)
+        frames.append((frame_start, fields.bits // 8))
+        fields.add(0, 16)  # CRC-16, filled in after packing
+
+    payload = fields.pack()
+    for (start, end), crc in zip(frames, _crc16_frames(payload, frames)):
+        payload[end:end + 2] = crc.to_bytes(2, 'big')
+    return payload
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Keyboard Discovery
+Keeps the set of open evdev devices that have the trigger key up to date
+while the daemon runs, so plugging in or re-pairing a keyboard doesn't need
+a restart (and with it a new whisper warm-up):
+- candidates are checked through sysfs capability bitmasks where possible,
+  so devices without the trigger key (mice, power buttons, webcams) are
+  never opened; otherwise they are opened, checked and closed again
+- answers are cached by capability fingerprint (name, ids, key bitmask),
+  so a keyboard that comes back is recognised without re-checking
+- /dev/input is watched with inotify for device nodes appearing, getting
+  their permissions (udev applies ACLs after creating the node) and going
+  away; without inotify it is rescanned every few seconds
+"""
+import ctypes
+import os
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+
+INPUT_DIR = '/dev/input'
+SYSFS_INPUT_DIR = '/sys/class/input'
+RESCAN_INTERVAL = 2.0  # Seconds between rescans when inotify is unavailable
+
+# inotify(7)
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+LONG_BITS = 8 * ctypes.sizeof(ctypes.c_long)  # sysfs bitmask word size
+
+
+class _InotifyWatch:
+    """Non-blocking inotify watch on one directory (via libc, no extra dependency)"""
+
+    def __init__(self, directory: str, mask: int):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"Cannot watch {directory}")
+        self.fd = fd
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read(self) -> List[Tuple[int, str]]:
+        """Pending (mask, file name) events"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _read_sysfs(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _has_bit(bitmask: str, bit: int) -> bool:
+    """Test a bit in a sysfs capability bitmask (hex longs, most significant first)"""
+    value = 0
+    for word in bitmask.split():
+        value = (value << LONG_BITS) | int(word, 16)
+    return bool(value >> bit & 1)
+
+
+class KeyboardMonitor:
+    """The open input devices that have the trigger key, following hotplug"""
+
+    def __init__(self, trigger_key: int, input_dir: str = INPUT_DIR,
+                 sysfs_dir: str = SYSFS_INPUT_DIR):
+        """
+        Args:
+            trigger_key: evdev key code the devices must have
+            input_dir: Directory of evdev nodes
+            sysfs_dir: sysfs class directory describing them
+        """
+        self.trigger_key = trigger_key
+        self.input_dir = input_dir
+        self.sysfs_dir = sysfs_dir
+        self.devices: Dict[int, object] = {}  # fd -> evdev.InputDevice
+        # Called with the device after it is opened / before it is closed
+        # (e.g. to add and remove event loop readers while the fd is valid)
+        self.on_added: Optional[Callable[[object], None]] = None
+        self.on_removed: Optional[Callable[[object], None]] = None
+        self._fingerprints: Dict[str, bool] = {}  # Capability fingerprint -> has trigger key
+        try:
+            self._watch = _InotifyWatch(input_dir, IN_CREATE | IN_ATTRIB | IN_DELETE)
+        except (OSError, AttributeError) as e:
+            print(f"⚠ Not watching {input_dir} for new keyboards ({e}), rescanning every {RESCAN_INTERVAL:.0f}s")
+            self._watch = None
+
+    @property
+    def watch_fd(self) -> Optional[int]:
+        """inotify fd to watch for readability (None = poll with rescan())"""
+        return self._watch.fileno() if self._watch else None
+
+    @property
+    def poll_interval(self) -> Optional[float]:
+        """Seconds between scan() calls the caller should make (None = not needed)"""
+        return None if self._watch else RESCAN_INTERVAL
+
+    def scan(self) -> None:
+        """Open new matching devices and drop ones whose node is gone"""
+        import evdev
+        paths = set(evdev.list_devices(self.input_dir))
+        for device in list(self.devices.values()):
+            if device.path not in paths:
+                self.remove(device)
+        for path in sorted(paths):
+            self._add(path)
+
+    def handle_watch_events(self) -> None:
+        """Apply pending /dev/input changes (call when watch_fd is readable)"""
+        for mask, name in self._watch.read():
+            if mask & IN_Q_OVERFLOW:
+                self.scan()
+            elif name.startswith('event'):
+                path = os.path.join(self.input_dir, name)
+                if mask & IN_DELETE:
+                    device = self._by_path(path)
+                    if device is not None:
+                        self.remove(device)
+                else:
+                    self._add(path)
+
+    def read(self, device) -> Optional[list]:
+        """Pending events of a device; None (and the device is dropped) if it went away"""
+        try:
+            return list(device.read())
+        except BlockingIOError:
+            return []
+        except OSError:
+            self.remove(device)
+            return None
+
+    def holding(self, key: int) -> bool:
+        """True if any open device reports ``key`` as currently held"""
+        for device in self.devices.values():
+            try:
+                if key in device.active_keys():
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def remove(self, device) -> None:
+        if self.devices.pop(device.fd, None) is None:
+            return
+        print(f"Keyboard disconnected: {device.name} ({device.path})")
+        if self.on_removed:
+            self.on_removed(device)
+        try:
+            device.close()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        for device in list(self.devices.values()):
+            try:
+                device.close()
+            except OSError:
+                pass
+        self.devices.clear()
+        if self._watch:
+            self._watch.close()
+            self._watch = None
+
+    def _by_path(self, path: str):
+        for device in self.devices.values():
+            if device.path == path:
+                return device
+        return None
+
+    def _fingerprint(self, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """(cache key, sysfs key bitmask) of a device node
+
+        The key is the device's name, ids and key capabilities from sysfs, or
+        its node identity when sysfs can't be read (bitmask None then). Both
+        are None if the node is gone.
+        """
+        base = os.path.join(self.sysfs_dir, os.path.basename(path), 'device')
+        keys = _read_sysfs(os.path.join(base, 'capabilities', 'key'))
+        if keys is not None:
+            ids = [_read_sysfs(os.path.join(base, 'id', field)) or ''
+                   for field in ('bustype', 'vendor', 'product', 'version')]
+            return '|'.join([_read_sysfs(os.path.join(base, 'name')) or '', *ids, keys]), keys
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None
+        return f"{path}|{stat.st_rdev}|{stat.st_ctime_ns}", None
+
+    def _add(self, path: str) -> None:
+        import evdev
+        from evdev import ecodes
+        if self._by_path(path) is not None:
+            return
+        fingerprint, keys = self._fingerprint(path)
+        if fingerprint is None:
+            return
+        matches = self._fingerprints.get(fingerprint)
+        if matches is None and keys is not None:
+            matches = self._fingerprints[fingerprint] = _has_bit(keys, self.trigger_key)
+        if matches is False:
+            return  # Known not to have the key: not opened (again)
+
+        try:
+            device = evdev.InputDevice(path)
+        except OSError:
+            return  # Gone already, or udev hasn't granted access yet (IN_ATTRIB follows)
+        if matches is None:
+            keys = device.capabilities(verbose=False).get(ecodes.EV_KEY, [])
+            self._fingerprints[fingerprint] = self.trigger_key in keys
+            if self.trigger_key not in keys:
+                device.close()
+                return
+        print(f"Found keyboard device: {device.name} ({device.path})")
+        self.devices[device.fd] = device
+        if self.on_added:
+            self.on_added(device)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Desktop Notification Worker
+Sends notifications from a background thread so a slow notification daemon
+never delays recording or pasting. Talks to org.freedesktop.Notifications
+over D-Bus directly (via jeepney) and falls back to notify-send.
+
+Updates are coalesced: if several notifications are queued while one is
+being sent, only the latest is delivered. All notifications reuse one
+replace-id so each utterance updates a single popup in place.
+"""
+import subprocess
+import threading
+
+# jeepney is optional - fall back to notify-send without it
+try:
+    from jeepney import DBusAddress, MessageType, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    DBusAddress = None
+
+NOTIFICATIONS_ADDRESS = {
+    'object_path': '/org/freedesktop/Notifications',
+    'bus_name': 'org.freedesktop.Notifications',
+    'interface': 'org.freedesktop.Notifications',
+}
+DBUS_CALL_TIMEOUT = 2
+
+
+class NotificationWorker:
+    """Background, coalescing desktop notification sender"""
+
+    def __init__(self, app_name: str = 'VoiceType', bus: str = 'SESSION'):
+        """
+        Args:
+            app_name: Application name reported to the notification server
+            bus: 'SESSION' or an explicit D-Bus address (e.g. a test bus)
+        """
+        self.app_name = app_name
+        self.bus = bus
+        self.replace_id = 0  # 0 = new notification; server returns the id to reuse
+        self.sent_count = 0
+
+        self._connection = None
+        self._pending = None  # Latest (title, message, icon, timeout) not yet sent
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the worker thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the worker thread (pending notifications may be dropped)"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def notify(self, title: str, message: str, icon: str = 'dialog-information',
+               timeout: int = 5000) -> None:
+        """Queue a notification; supersedes any not-yet-sent one. Never blocks."""
+        with self._condition:
+            self._pending = (title, message, icon, timeout)
+            self._condition.notify()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until the pending notification has been sent (for tests/shutdown)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None, timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                request = self._pending
+
+            try:
+                self._send(*request)
+            except Exception:
+                # Silently fail - notifications are nice-to-have
+                pass
+
+            with self._condition:
+                # Only clear if nothing newer arrived while sending
+                if self._pending is request:
+                    self._pending = None
+                    self._condition.notify_all()
+
+    def _send(self, title: str, message: str, icon: str, timeout: int) -> None:
+        if self._send_dbus(title, message, icon, timeout):
+            self.sent_count += 1
+            return
+        self._send_notify_send(title, message, icon, timeout)
+        self.sent_count += 1
+
+    def _send_dbus(self, title: str, message: str, icon: str, timeout: int) -> bool:
+        """Call org.freedesktop.Notifications.Notify; False if D-Bus is unavailable"""
+        if DBusAddress is None:
+            return False
+        try:
+            if self._connection is None:
+                self._connection = open_dbus_connection(bus=self.bus)
+            address = DBusAddress(NOTIFICATIONS_ADDRESS['object_path'],
+                                  bus_name=NOTIFICATIONS_ADDRESS['bus_name'],
+                                  interface=NOTIFICATIONS_ADDRESS['interface'])
+            call = new_method_call(address, 'Notify', 'susssasa{sv}i',
+                                   (self.app_name, self.replace_id, icon, title, message,
+                                    [], {}, timeout))
+            reply = self._connection.send_and_get_reply(call, timeout=DBUS_CALL_TIMEOUT)
+            if reply.header.message_type == MessageType.error:
+                return False  # No notification server on this bus
+            self.replace_id = reply.body[0]
+            return True
+        except Exception:
+            # Drop the connection; it is reopened on the next notification
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            return False
+
+    def _send_notify_send(self, title: str, message: str, icon: str, timeout: int) -> None:
+        cmd = ['notify-send', '-i', icon, '-t', str(timeout), title, message]
+
+        if self.replace_id:
+            # Replace existing notification
+            cmd.insert(1, '--replace-id')
+            cmd.insert(2, str(self.replace_id))
+        else:
+            # Get notification ID for future updates
+            cmd.insert(1, '--print-id')
+
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                timeout=DBUS_CALL_TIMEOUT, check=False)
+
+        # Store notification ID if this is the first notification
+        if not self.replace_id and result.stdout.strip().isdigit():
+            self.replace_id = int(result.stdout.strip())
+
+
+def get_notification_backend() -> str:
+    """Name of the notification transport that will be tried first"""
+    return 'D-Bus' if DBusAddress is not None else 'notify-send'
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Transcription Pipeline
+Bounded job queue between key releases and the output stage:
+- a fixed number of transcription workers (match whisper-server --processors)
+- results are delivered strictly in submission order, so back-to-back
+  dictations are pasted in the order they were spoken
+- a bounded backlog with an explicit overflow policy
+"""
+import threading
+from collections import deque
+
+# Overflow policies when max_pending jobs are already in the pipeline
+OVERFLOW_REJECT = 'reject'            # Refuse the new job
+OVERFLOW_DROP_OLDEST = 'drop_oldest'  # Discard the oldest job not yet started
+OVERFLOW_POLICIES = (OVERFLOW_REJECT, OVERFLOW_DROP_OLDEST)
+
+
+class TranscriptionPipeline:
+    """Ordered, bounded worker pool for transcription jobs"""
+
+    def __init__(self, transcribe, deliver, workers: int = 1, max_pending: int = 4,
+                 overflow: str = OVERFLOW_REJECT, on_drop=None):
+        """
+        Args:
+            transcribe: Called as transcribe(payload) on a worker thread; returns a result
+            deliver: Called as deliver(payload, result, error) on the output
+                thread, in submission order (error is the exception or None)
+            workers: Number of concurrent transcription workers
+            max_pending: Jobs allowed in the pipeline (queued, running or
+                awaiting delivery) before the overflow policy applies
+            overflow: 'reject' or 'drop_oldest'
+            on_drop: Optional callback(payload) for jobs discarded by 'drop_oldest'
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}' (use {', '.join(OVERFLOW_POLICIES)})")
+
+        self.transcribe = transcribe
+        self.deliver = deliver
+        self.max_pending = max(1, max_pending)
+        self.overflow = overflow
+        self.on_drop = on_drop
+        self.dropped_count = 0
+        self.rejected_count = 0
+
+        self._condition = threading.Condition()
+        self._queued = deque()  # (seq, payload) not yet picked up by a worker
+        self._results = {}  # seq -> (payload, result, error), or None if dropped
+        self._next_seq = 0  # Sequence number for the next submitted job
+        self._deliver_seq = 0  # Next sequence number to hand to the output stage
+        self._running = True
+
+        self._threads = [threading.Thread(target=self._worker, daemon=True, name=f'transcribe-{i}')
+                         for i in range(max(1, workers))]
+        self._threads.append(threading.Thread(target=self._output, daemon=True, name='output'))
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Jobs submitted but not yet delivered"""
+        with self._condition:
+            return self._next_seq - self._deliver_seq
+
+    def submit(self, payload) -> bool:
+        """Queue a job without blocking. Returns False if it was rejected."""
+        dropped = None
+        with self._condition:
+            if self._next_seq - self._deliver_seq >= self.max_pending:
+                if self.overflow == OVERFLOW_DROP_OLDEST and self._queued:
+                    seq, dropped = self._queued.popleft()
+                    self._results[seq] = None  # Output stage skips it
+                    self.dropped_count += 1
+                else:
+                    self.rejected_count += 1
+                    return False
+
+            self._queued.append((self._next_seq, payload))
+            self._next_seq += 1
+            self._condition.notify_all()
+
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+        return True
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """Stop workers; undelivered jobs are abandoned"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queued or not self._running)
+                if not self._running:
+                    return
+                seq, payload = self._queued.popleft()
+
+            result, error = None, None
+            try:
+                result = self.transcribe(payload)
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                self._results[seq] = (payload, result, error)
+                self._condition.notify_all()
+
+    def _output(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._deliver_seq in self._results or not self._running)
+                if not self._running:
+                    return
+                entry = self._results.pop(self._deliver_seq)
+
+            if entry is not None:
+                try:
+                    self.deliver(*entry)
+                except Exception as e:
+                    print(f"✗ Error delivering transcription: {e}")
+
+            with self._condition:
+                # Count as pending until delivered, so the backlog bound covers output too
+                self._deliver_seq += 1
+                self._condition.notify_all()
@@ -29,6 +29,9 @@ class PlatformInfo:
         # Detect available tools
         self.available_tools = self._detect_available_tools()
 
+        # Persistent uinput keyboard (see enable_virtual_keyboard)
+        self.virtual_keyboard = None
+
     def _detect_display_server(self) -> str:
         """Detect if running Wayland or X11"""
         # Check XDG_SESSION_TYPE first (most reliable)
@@ -118,8 +121,42 @@ class PlatformInfo:
 
         return None
 
+    def enable_virtual_keyboard(self) -> bool:
+        """Create a persistent uinput keyboard and prefer it for key injection.
+
+        Returns False (and keeps using external tools) when /dev/uinput is
+        not writable or evdev cannot create the device.
+        """
+        if self.virtual_keyboard is not None:
+            return True
+        try:
+            from .virtual_keyboard import open_virtual_keyboard
+        except ImportError:
+            return False
+        self.virtual_keyboard = open_virtual_keyboard()
+        if self.virtual_keyboard is None:
+            return False
+        if 'uinput' not in self.available_tools['keyboard']:
+            self.available_tools['keyboard'].insert(0, 'uinput')
+        return True
+
+    def disable_virtual_keyboard(self) -> None:
+        """Close the uinput keyboard and fall back to external tools"""
+        if self.virtual_keyboard is not None:
+            self.virtual_keyboard.close()
+            self.virtual_keyboard = None
+        if 'uinput' in self.available_tools['keyboard']:
+            self.available_tools['keyboard'].remove('uinput')
+
     def get_keyboard_tool(self) -> Optional[str]:
         """Get the best keyboard automation tool for current environment"""
+        # In-process virtual keyboard: no process spawn, no ydotoold
+        if self.virtual_keyboard is not None:
+            return 'uinput'
+        return self._external_keyboard_tool()
+
+    def _external_keyboard_tool(self) -> Optional[str]:
+        """Best keyboard tool that runs as a separate process"""
         # Prefer ydotool as it works everywhere
         if 'ydotool' in self.available_tools['keyboard']:
             return 'ydotool'
@@ -210,7 +247,15 @@ class PlatformInfo:
 
     def type_text(self, text: str) -> bool:
         """Type text using best available keyboard automation tool"""
-        keyboard_tool = self.get_keyboard_tool()
+        if self.virtual_keyboard is not None:
+            try:
+                if self.virtual_keyboard.type_text(text):
+                    return True
+            except OSError:
+                pass
+            # US keymap only: hand text it can't type to the external tools
+
+        keyboard_tool = self._external_keyboard_tool()
 
         if not keyboard_tool:
             return False
@@ -239,10 +284,17 @@ class PlatformInfo:
         Args:
             use_shift: If True, use Shift+Ctrl+V (for terminals), else Ctrl+V (GUI apps)
         """
-        keyboard_tool = self.get_keyboard_tool()
+        if self.virtual_keyboard is not None:
+            try:
+                self.virtual_keyboard.paste(use_shift=use_shift)
+                return True
+            except OSError:
+                pass
+
+        keyboard_tool = self._external_keyboard_tool()
 
         if keyboard_tool != 'ydotool':
-            # Only ydotool supports key simulation reliably
+            # Only uinput and ydotool support key simulation reliably
             return False
 
         try:
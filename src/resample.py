@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Polyphase Resampling
+Converts audio captured at the device's native rate (typically 44.1 or
+48 kHz) to the 16 kHz whisper expects, in-process and in chunks:
+- rational factor up/down (48000 -> 16000 is 1/3, 44100 -> 16000 is 160/441)
+- Kaiser-windowed sinc low-pass (the same design as scipy's resample_poly),
+  split into ``up`` polyphase branches so only taps that meet a real input
+  sample are evaluated
+- streaming: state carries across chunks, so feeding a recording block by
+  block gives the same samples as converting it in one go
+- the filter's delay is compensated, so output sample n lines up with
+  input time n / target_rate (recording cut points stay where they were)
+"""
+from math import gcd
+import numpy as np
+import numpy.typing as npt
+
+HALF_LENGTH = 10  # Filter half-length in input (or output) periods, like resample_poly
+KAISER_BETA = 5.0
+OUTPUT_BLOCK = 16384  # Outputs computed per vectorized step (bounds temporaries)
+PHASE_LOOP_MIN = 16  # Outputs per phase from which a per-phase product beats one gather
+
+
+def design_filter(up: int, down: int) -> npt.NDArray[np.float64]:
+    """Low-pass prototype at up * input rate, cut off at the lower Nyquist, gain ``up``"""
+    cutoff = 1.0 / max(up, down)  # Relative to the upsampled Nyquist frequency
+    half = HALF_LENGTH * max(up, down)
+    m = np.arange(-half, half + 1, dtype=np.float64)
+    taps = cutoff * np.sinc(cutoff * m) * np.kaiser(2 * half + 1, KAISER_BETA)
+    return taps * (up / taps.sum())
+
+
+class PolyphaseResampler:
+    """Streaming rational-factor resampler for mono audio"""
+
+    def __init__(self, rate: int, target_rate: int):
+        """
+        Args:
+            rate: Sample rate of the input
+            target_rate: Sample rate of the output
+        """
+        divisor = gcd(rate, target_rate)
+        self.rate = rate
+        self.target_rate = target_rate
+        self.up = target_rate // divisor
+        self.down = rate // divisor
+
+        taps = design_filter(self.up, self.down)
+        self.delay = len(taps) // 2  # Group delay in upsampled samples (compensated)
+        width = -(-len(taps) // self.up)  # Taps per branch
+        padded = np.zeros(width * self.up)
+        padded[:len(taps)] = taps
+        # bank[phase] weighs the ``width`` inputs ending at an output's newest
+        # one (oldest first), for outputs of that phase
+        self._bank = np.ascontiguousarray(padded.reshape(width, self.up).T[:, ::-1], dtype=np.float32)
+        self._width = width
+
+        # Input from absolute index _start onwards, preceded by zeros before the start
+        self._history = np.zeros(width - 1, dtype=np.float32)
+        self._start = -(width - 1)
+        self._received = 0  # Input samples so far
+        self._produced = 0  # Output samples so far
+
+    def _available(self, received: int) -> int:
+        """Outputs whose newest input sample has arrived"""
+        # Output n needs input index (n * down + delay) // up
+        return max(0, -(-(received * self.up - self.delay) // self.down))
+
+    def process(self, samples: npt.ArrayLike) -> npt.NDArray[np.float32]:
+        """Resample the next chunk; returns the outputs it completes (float32)"""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            self._received += len(samples)
+            self._produced += len(samples)
+            return samples
+        self._history = np.concatenate((self._history, samples))
+        self._received += len(samples)
+        return self._run(self._available(self._received))
+
+    def flush(self) -> npt.NDArray[np.float32]:
+        """Outputs still owed at the end of the input (zeros are assumed after it)"""
+        total = -(-self._received * self.up // self.down)
+        if self.up == self.down or total <= self._produced:
+            return np.zeros(0, dtype=np.float32)
+        needed = (total * self.down + self.delay) // self.up + 1 - (self._start + len(self._history))
+        if needed > 0:
+            self._history = np.concatenate((self._history, np.zeros(needed, dtype=np.float32)))
+        return self._run(total)
+
+    def _by_phase(self, windows, first: int, last: int) -> npt.NDArray[np.float32]:
+        """Outputs first..last, one matrix-vector product per filter phase
+
+        Outputs n and n + up share a phase and read inputs ``down`` apart,
+        so each phase multiplies a strided view of the input windows.
+        """
+        block = np.empty(last - first, dtype=np.float32)
+        for n in range(first, min(last, first + self.up)):
+            position = n * self.down + self.delay
+            row = position // self.up - (self._width - 1) - self._start
+            count = len(range(n, last, self.up))
+            rows = windows[row:row + (count - 1) * self.down + 1:self.down]
+            block[n - first::self.up] = rows @ self._bank[position % self.up]
+        return block
+
+    def _run(self, end: int) -> npt.NDArray[np.float32]:
+        if end <= self._produced:
+            # Nothing completed (a chunk shorter than the filter may not fill one window)
+            return np.zeros(0, dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(self._history, self._width)
+        outputs = []
+        for first in range(self._produced, end, OUTPUT_BLOCK):
+            last = min(end, first + OUTPUT_BLOCK)
+            if last - first >= PHASE_LOOP_MIN * self.up:
+                outputs.append(self._by_phase(windows, first, last))
+            else:
+                n = np.arange(first, last, dtype=np.int64)
+                position = n * self.down + self.delay
+                rows = position // self.up - (self._width - 1) - self._start
+                outputs.append(np.einsum('ij,ij->i', windows[rows], self._bank[position % self.up]))
+        self._produced = max(self._produced, end)
+
+        # Keep only the input later outputs can still reach
+        keep_from = (self._produced * self.down + self.delay) // self.up - (self._width - 1)
+        drop = min(max(0, keep_from - self._start), len(self._history))
+        if drop:
+            self._history = self._history[drop:]
+            self._start += drop
+        return np.concatenate(outputs) if outputs else np.zeros(0, dtype=np.float32)
+
+
+def resample_poly(audio: npt.ArrayLike, rate: int, target_rate: int) -> npt.NDArray[np.float32]:
+    """Resample a whole mono recording (float32 out, same scale as the input)"""
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if rate == target_rate or not len(audio):
+        return audio
+    resampler = PolyphaseResampler(rate, target_rate)
+    return np.concatenate((resampler.process(audio), resampler.flush()))
+
+
+def to_int16(audio: npt.NDArray[np.float32]) -> npt.NDArray[np.int16]:
+    """Round and clip resampled audio back to int16 PCM"""
+    return np.clip(np.round(audio), -32768, 32767).astype(np.int16)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Segmented Streaming Transcription
+Cuts audio at natural pauses while the trigger key is still held and sends
+each segment to whisper-server in the background. On release only the tail
+segment is left to transcribe, so post-release latency does not grow with
+the length of the hold. If any segment fails the whole recording fails:
+pasting the other segments would silently drop part of the dictation.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import numpy.typing as npt
+from .backends import TranscriptionError, transcription_errors
+from .vad import find_last_pause
+
+
+class SegmentedTranscription:
+    """Transcribes one recording as ordered, pause-delimited segments"""
+
+    def __init__(self, recorder, transcriber, sample_rate: int,
+                 min_segment: float = 3.0, max_segment: float = 20.0,
+                 pause_duration: float = 0.4, silence_threshold: float = 0.01,
+                 poll_interval: float = 0.25):
+        """
+        Args:
+            recorder: StreamingRecorder providing read_since()
+            transcriber: VoiceTranscriber used for each segment (its raising transcribe())
+            sample_rate: Sample rate of the recorded audio
+            min_segment: Shortest segment worth sending on its own (seconds)
+            max_segment: Force a cut if no pause is found within this length (seconds)
+            pause_duration: Silence needed to count as a natural pause (seconds)
+            silence_threshold: RMS level (0-1) below which a frame is silent
+            poll_interval: How often to look for new cut points (seconds)
+        """
+        self.recorder = recorder
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.min_samples = int(min_segment * sample_rate)
+        self.max_samples = int(max_segment * sample_rate)
+        self.pause_duration = pause_duration
+        self.silence_threshold = silence_threshold
+        self.poll_interval = poll_interval
+
+        self.offset = 0  # First sample not yet handed to a segment
+        self._futures = []
+        # One worker: segments are sent in order and never pile up on the server
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='segment')
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching the recording for cut points"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop_polling(self):
+        """Stop looking for new cut points (cheap; safe from the key handler)"""
+        self._stop_event.set()
+
+    def cancel(self):
+        """Discard the recording and any in-flight segments"""
+        self.stop_polling()
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def finish(self, audio_data: npt.NDArray[np.int16], trimmer=None) -> str:
+        """Transcribe the remaining tail and return the stitched text.
+
+        Args:
+            audio_data: Complete recording as returned by StreamingRecorder.stop()
+            trimmer: Optional SilenceTrimmer applied to the tail before upload
+
+        Raises:
+            TranscriptionError: A segment failed (the text would be incomplete)
+        """
+        self.stop_polling()
+        if self._thread:
+            self._thread.join()
+
+        tail = audio_data[self.offset:]
+        if trimmer is not None and len(tail):
+            result = trimmer.trim(tail)
+            print(trimmer.describe(result))
+            tail = result.audio if result.audio is not None else tail[:0]
+        if len(tail):
+            self._submit(tail)
+
+        texts = []
+        try:
+            for number, future in enumerate(self._futures, 1):
+                try:
+                    texts.append(future.result())
+                except transcription_errors() as e:
+                    raise TranscriptionError(
+                        f"Dictation incomplete: segment {number} of {len(self._futures)} failed ({e})") from e
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        return ' '.join(text for text in texts if text)
+
+    @property
+    def segments_sent(self) -> int:
+        """Number of segments handed to the transcriber so far"""
+        return len(self._futures)
+
+    def _submit(self, segment: npt.NDArray[np.int16]):
+        self._futures.append(self._executor.submit(self.transcriber.transcribe, segment))
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval):
+            pending = self.recorder.read_since(self.offset)
+            if len(pending) < self.min_samples:
+                continue
+
+            window = pending[:self.max_samples]
+            cut = find_last_pause(window, self.sample_rate,
+                                  self.silence_threshold, self.pause_duration)
+            if cut is None or cut < self.min_samples:
+                if len(pending) < self.max_samples:
+                    continue  # Keep waiting for a pause
+                cut = self.max_samples  # Speaking without pauses: force a cut
+
+            self._submit(pending[:cut])
+            self.offset += cut
+
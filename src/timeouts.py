@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Adaptive Request Timeouts
+A fixed timeout is wrong at both ends: far too long to notice a hung server
+on a one-second utterance, too short for a long dictation on a slow CPU.
+Instead each server's real-time factor (processing seconds per second of
+audio) is measured on every request, and a request's deadline is
+
+    base + margin * p95(real-time factor) * audio seconds
+
+capped at a maximum. Until enough samples exist, the fixed timeout is used
+as a floor. Samples are kept per server URL in
+~/.local/state/voicetype/rtf.json so the learned factor survives restarts.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from .config import get_state_dir
+
+MAX_SAMPLES = 200  # Recent real-time factors kept per server
+MIN_SAMPLES = 5  # Below this, the fixed timeout is still used as a floor
+MIN_SAMPLE_AUDIO = 1.0  # Seconds; shorter clips measure overhead, not inference
+SAVE_INTERVAL = 10.0  # Seconds between writes of the sample file
+
+
+class RealTimeFactorStore:
+    """Recent real-time factors per server, persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._loaded = False
+
+    @property
+    def path(self) -> str:
+        """Sample file (default: ~/.local/state/voicetype/rtf.json)"""
+        if self._path is None:
+            self._path = os.path.join(get_state_dir(), 'rtf.json')
+        return self._path
+
+    def samples(self, server: str) -> list:
+        self._load()
+        with self._lock:
+            return list(self._samples.get(server, ()))
+
+    def record(self, server: str, factor: float) -> None:
+        self._load()
+        with self._lock:
+            self._samples.setdefault(server, deque(maxlen=MAX_SAMPLES)).append(round(factor, 4))
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                for server, samples in data.get('servers', {}).items():
+                    self._samples[server] = deque(samples, maxlen=MAX_SAMPLES)
+            except (OSError, ValueError, AttributeError, TypeError):
+                pass
+
+    def save(self) -> None:
+        """Write samples to disk if anything changed (atomic replace)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': 1, 'servers': {s: list(v) for s, v in self._samples.items()}}
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠ Could not write real-time factors to {self.path}: {e}")
+
+
+class AdaptiveTimeout:
+    """Request deadlines for one server, derived from its measured real-time factor"""
+
+    def __init__(self, server: str, store: Optional['RealTimeFactorStore'] = None,
+                 fixed: float = 30.0, base: float = 5.0, percentile: float = 95.0,
+                 margin: float = 2.0, maximum: float = 900.0, enabled: bool = True):
+        """
+        Args:
+            server: Key the samples are stored under (the server URL)
+            store: Sample store (default: the shared one in the state directory)
+            fixed: Timeout when disabled, and floor until MIN_SAMPLES are known
+            base: Allowance for connection, upload and model overhead (seconds)
+            percentile: Percentile of recent real-time factors to plan for
+            margin: Multiplier on the expected processing time
+            maximum: Upper bound on any deadline (seconds)
+            enabled: False always uses ``fixed``
+        """
+        self.server = server
+        self.store = store or get_rtf_store()
+        self.fixed = fixed
+        self.base = base
+        self.percentile = percentile
+        self.margin = margin
+        self.maximum = maximum
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, server: str, config) -> 'AdaptiveTimeout':
+        whisper = config["whisper"]
+        return cls(server, fixed=whisper["timeout"], base=whisper["timeout_base"],
+                   percentile=whisper["timeout_percentile"], margin=whisper["timeout_margin"],
+                   maximum=whisper["timeout_max"], enabled=whisper["adaptive_timeout"])
+
+    def real_time_factor(self) -> Optional[float]:
+        """Planned-for real-time factor, None until MIN_SAMPLES are known"""
+        samples = sorted(self.store.samples(self.server))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(round(self.percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def deadline(self, audio_seconds: float) -> float:
+        """Seconds to wait for the transcription of ``audio_seconds`` of audio"""
+        if not self.enabled:
+            return self.fixed
+        factor = self.real_time_factor()
+        if factor is None:
+            return max(self.fixed, min(self.maximum, self.base + self.margin * audio_seconds))
+        return min(self.maximum, self.base + self.margin * factor * audio_seconds)
+
+    def retry_deadline(self, deadline: float) -> float:
+        """Deadline for the single retry after ``deadline`` passed"""
+        return min(self.maximum, 2 * deadline)
+
+    def record(self, audio_seconds: float, elapsed: float) -> None:
+        """Record a completed request"""
+        if self.enabled and audio_seconds >= MIN_SAMPLE_AUDIO:
+            self.store.record(self.server, elapsed / audio_seconds)
+
+    def record_timeout(self, audio_seconds: float, deadline: float) -> None:
+        """Record a request that passed its deadline (a lower bound on its factor)"""
+        self.record(audio_seconds, deadline)
+
+
+# Global instance for easy access
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_rtf_store() -> RealTimeFactorStore:
+    """Get singleton RealTimeFactorStore (saved again at exit)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RealTimeFactorStore()
+            atexit.register(_store.save)
+        return _store
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Latency Tracing
+Timing spans around every stage between pressing the trigger key and the
+text appearing, aggregated into rolling log-linear (HDR-style) histograms and
+written periodically to ~/.local/state/voicetype/latency.json.
+
+Print per-stage percentiles with:
+    voicetype-daemon stats
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+from .config import get_state_dir
+
+# Histogram resolution: 32 sub-buckets per power of two (~1.5% worst-case error)
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+WINDOW_SECONDS = 3600  # One histogram per hour...
+MAX_WINDOWS = 24 * 7   # ...kept for a week
+DEFAULT_FLUSH_INTERVAL = 30.0
+
+# Stages in pipeline order (for display)
+STAGES = [
+    'beep', 'stream_open', 'capture', 'stop', 'vad', 'encode', 'http', 'json_parse', 'inference',
+    'clipboard_copy', 'paste_delay', 'paste_shortcut', 'release_to_text',
+    'audio_callback',  # Per PortAudio block, compare with the block period
+]
+
+
+def _bucket_index(microseconds: int) -> int:
+    if microseconds < 2 * SUB_BUCKETS:
+        return microseconds
+    shift = microseconds.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (microseconds >> shift)
+
+
+def _bucket_value(index: int) -> float:
+    """Midpoint of a bucket in microseconds"""
+    if index < 2 * SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    sub = index - shift * SUB_BUCKETS
+    return (sub << shift) + (1 << shift) / 2
+
+
+class LatencyHistogram:
+    """Sparse log-linear histogram of durations"""
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        self.counts = counts or {}
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, seconds: float) -> None:
+        index = _bucket_index(max(0, int(seconds * 1_000_000)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+
+    def percentile(self, percent: float) -> float:
+        """Value (seconds) at the given percentile, 0 if empty"""
+        total = self.total
+        if not total:
+            return 0.0
+        threshold = percent / 100 * total
+        cumulative = 0
+        for index in sorted(self.counts):
+            cumulative += self.counts[index]
+            if cumulative >= threshold:
+                return _bucket_value(index) / 1_000_000
+        return _bucket_value(max(self.counts)) / 1_000_000
+
+
+class CallbackTimer:
+    """Durations measured on a real-time thread (the audio callback)
+
+    The real-time side only stores a float into a preallocated ring; the
+    samples are moved into the tracer's histograms when it flushes, on the
+    flusher thread. If more than ``capacity`` arrive between two flushes,
+    the oldest are lost.
+    """
+
+    def __init__(self, stage: str, capacity: int = 8192):
+        self.stage = stage
+        self._samples = [0.0] * capacity
+        self._written = 0  # Samples ever added (single writer)
+        self._drained = 0  # Samples ever moved into a tracer (single reader)
+
+    def add(self, seconds: float) -> None:
+        self._samples[self._written % len(self._samples)] = seconds
+        self._written += 1
+
+    def drain(self, tracer: 'LatencyTracer') -> None:
+        written = self._written
+        capacity = len(self._samples)
+        for index in range(max(self._drained, written - capacity), written):
+            tracer.record(self.stage, self._samples[index % capacity])
+        self._drained = written
+
+
+class LatencyTracer:
+    """Thread-safe per-stage rolling histograms with periodic persistence"""
+
+    def __init__(self, path: Optional[str] = None, enabled: bool = True):
+        self._path = path
+        self.enabled = enabled
+        self._windows = {}  # stage -> deque of (window_start, LatencyHistogram)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flusher = None
+        self._stop_event = threading.Event()
+        self._timers = []  # CallbackTimers drained on every flush
+        self._local = threading.local()  # .untraced: this thread records nothing
+
+    @property
+    def path(self) -> str:
+        """Histogram file (default: ~/.local/state/voicetype/latency.json)"""
+        if self._path is None:
+            self._path = os.path.join(get_state_dir(), 'latency.json')
+        return self._path
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the enclosed block as one sample of ``stage``"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    @contextmanager
+    def untraced(self):
+        """Record nothing this thread does in the block (synthetic requests like warm-ups)"""
+        previous = getattr(self._local, 'untraced', False)
+        self._local.untraced = True
+        try:
+            yield
+        finally:
+            self._local.untraced = previous
+
+    def record(self, stage: str, seconds: float) -> None:
+        if not self.enabled or getattr(self._local, 'untraced', False):
+            return
+        window_start = int(time.time()) // WINDOW_SECONDS * WINDOW_SECONDS
+        with self._lock:
+            windows = self._windows.setdefault(stage, deque(maxlen=MAX_WINDOWS))
+            if not windows or windows[-1][0] != window_start:
+                windows.append((window_start, LatencyHistogram()))
+            windows[-1][1].record(seconds)
+            self._dirty = True
+
+    def add_timer(self, timer: CallbackTimer) -> None:
+        """Collect a real-time thread's samples on every flush"""
+        self._timers.append(timer)
+
+    def histogram(self, stage: str, since: Optional[float] = None) -> LatencyHistogram:
+        """Merged histogram of a stage over all windows (or those after ``since``)"""
+        merged = LatencyHistogram()
+        with self._lock:
+            for window_start, histogram in self._windows.get(stage, ()):
+                if since is None or window_start + WINDOW_SECONDS > since:
+                    merged.merge(histogram)
+        return merged
+
+    def stages(self):
+        """Known stages, pipeline order first"""
+        with self._lock:
+            recorded = list(self._windows)
+        return [s for s in STAGES if s in recorded] + sorted(s for s in recorded if s not in STAGES)
+
+    def load(self) -> None:
+        """Merge histograms persisted by earlier runs"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for stage, windows in data.get('stages', {}).items():
+                merged = deque(maxlen=MAX_WINDOWS)
+                for window in windows:
+                    counts = {int(k): v for k, v in window['counts'].items()}
+                    merged.append((window['start'], LatencyHistogram(counts)))
+                for window_start, histogram in self._windows.get(stage, ()):
+                    if merged and merged[-1][0] == window_start:
+                        merged[-1][1].merge(histogram)
+                    else:
+                        merged.append((window_start, histogram))
+                self._windows[stage] = merged
+
+    def flush(self) -> None:
+        """Write histograms to disk if anything changed (atomic replace)"""
+        for timer in self._timers:
+            timer.drain(self)
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'version': 1,
+                'stages': {
+                    stage: [{'start': start, 'counts': histogram.counts} for start, histogram in windows]
+                    for stage, windows in self._windows.items()
+                },
+            }
+            self._dirty = False
+
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠ Could not write latency stats to {self.path}: {e}")
+
+    def start_flushing(self, interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """Flush periodically in the background"""
+        if not self.enabled or self._flusher is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop the background flusher and write a final snapshot"""
+        self._stop_event.set()
+        self.flush()
+
+
+def print_stats(path: Optional[str] = None, since_hours: Optional[float] = None) -> None:
+    """Print p50/p95/p99 per stage from the persisted histograms"""
+    tracer = LatencyTracer(path=path)
+    tracer.load()
+    stages = tracer.stages()
+    if not stages:
+        print(f"No latency data yet ({tracer.path})")
+        return
+
+    since = time.time() - since_hours * 3600 if since_hours else None
+    print(f"Latency per stage ({tracer.path})")
+    print(f"{'stage':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage in stages:
+        histogram = tracer.histogram(stage, since=since)
+        if not histogram.total:
+            continue
+        print(f"{stage:<16} {histogram.total:>7} "
+              f"{histogram.percentile(50) * 1000:>9.2f} "
+              f"{histogram.percentile(95) * 1000:>9.2f} "
+              f"{histogram.percentile(99) * 1000:>9.2f}")
+
+
+# Global instance for easy access
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> LatencyTracer:
+    """Get singleton LatencyTracer (disabled until configured by the daemon)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = LatencyTracer(enabled=False)
+        return _tracer
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Helpers
+Vectorized frame-energy analysis of int16 audio (no per-sample Python loops):
+pause detection for segmented streaming and silence trimming before upload
+"""
+from typing import NamedTuple, Optional
+import numpy as np
+import numpy.typing as npt
+
+FRAME_MS = 30  # Analysis frame length in milliseconds
+INT16_FULL_SCALE = 32768.0
+
+
+def frame_rms(audio_data: npt.NDArray[np.int16], frame_length: int) -> npt.NDArray[np.float32]:
+    """Compute per-frame RMS level normalized to 0-1 (full scale).
+
+    Trailing samples that do not fill a whole frame are ignored.
+    """
+    samples = audio_data.reshape(-1)
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length).astype(np.float32)
+    frames *= 1.0 / INT16_FULL_SCALE
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+
+
+def find_last_pause(audio_data: npt.NDArray[np.int16], sample_rate: int,
+                    threshold: float, pause_duration: float,
+                    frame_ms: int = FRAME_MS) -> Optional[int]:
+    """Find the last natural pause in audio.
+
+    A pause is a run of at least ``pause_duration`` seconds whose frames are
+    all below ``threshold`` RMS.
+
+    Returns:
+        Sample index in the middle of the last pause, or None if there is none
+    """
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    silent = frame_rms(audio_data, frame_length) < threshold
+    run = max(1, int(np.ceil(pause_duration * 1000 / frame_ms)))
+    if len(silent) < run:
+        return None
+
+    # window_silent[i] is True when frames i .. i+run-1 are all silent
+    window_silent = np.convolve(silent.astype(np.int32), np.ones(run, dtype=np.int32), 'valid') == run
+    candidates = np.flatnonzero(window_silent)
+    if len(candidates) == 0:
+        return None
+
+    return int(candidates[-1] + run // 2) * frame_length
+
+
+class TrimResult(NamedTuple):
+    """Outcome of trimming one recording"""
+    audio: Optional[npt.NDArray[np.int16]]  # Trimmed view, or None if no speech
+    original_samples: int
+    kept_samples: int
+
+    @property
+    def removed_samples(self) -> int:
+        return self.original_samples - self.kept_samples
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.removed_samples * 2  # int16
+
+
+class SilenceTrimmer:
+    """Trims non-speech edges from a recording before upload"""
+
+    def __init__(self, sample_rate: int, threshold: float = 0.005,
+                 padding: float = 0.2, min_speech: float = 0.1,
+                 frame_ms: int = FRAME_MS):
+        """
+        Args:
+            sample_rate: Sample rate of the audio
+            threshold: RMS level (0-1) at or above which a frame counts as speech
+            padding: Audio kept around the detected speech (seconds)
+            min_speech: Less voiced audio than this counts as silence (seconds)
+            frame_ms: Analysis frame length in milliseconds
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.padding_samples = int(padding * sample_rate)
+        self.frame_length = max(1, sample_rate * frame_ms // 1000)
+        self.min_speech_frames = max(1, int(np.ceil(min_speech * 1000 / frame_ms)))
+
+    def trim(self, audio_data: npt.NDArray[np.int16]) -> TrimResult:
+        """Trim leading and trailing silence (returns a view, no copy)"""
+        total = len(audio_data)
+        voiced = frame_rms(audio_data, self.frame_length) >= self.threshold
+        if np.count_nonzero(voiced) < self.min_speech_frames:
+            return TrimResult(None, total, 0)
+
+        first = int(np.argmax(voiced))
+        last = len(voiced) - int(np.argmax(voiced[::-1]))  # One past the last voiced frame
+        start = max(0, first * self.frame_length - self.padding_samples)
+        end = min(total, last * self.frame_length + self.padding_samples)
+        if last == len(voiced):
+            end = total  # Keep the partial frame at the very end
+
+        return TrimResult(audio_data[start:end], total, end - start)
+
+    def describe(self, result: TrimResult) -> str:
+        """Human-readable summary of what trimming saved"""
+        original = result.original_samples / self.sample_rate
+        removed = result.removed_samples / self.sample_rate
+        return (f"✂️  Trimmed {removed:.2f}s of silence from {original:.2f}s recording "
+                f"({result.bytes_saved:,} bytes saved)")
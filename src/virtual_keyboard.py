@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Virtual Keyboard
+Persistent evdev.UInput keyboard for paste shortcuts and typing, replacing
+per-paste ydotool/xdotool/wtype spawns and the ydotoold socket hop.
+
+The device is created once (compositors need a moment to pick up a new
+input device) and reused for every paste. Requires write access to
+/dev/uinput (usually via the 'input' group or a udev rule).
+"""
+import os
+import time
+from typing import List, Optional
+import evdev
+from evdev import ecodes
+
+UINPUT_PATH = '/dev/uinput'
+DEVICE_NAME = 'voicetype-virtual-keyboard'
+KEY_DELAY = 0.002  # Pause between key events so slow clients don't drop them
+
+# US layout: character -> (key code, needs shift)
+_CHAR_MAP = {' ': (ecodes.KEY_SPACE, False), '\n': (ecodes.KEY_ENTER, False),
+             '\t': (ecodes.KEY_TAB, False)}
+for _letter in 'abcdefghijklmnopqrstuvwxyz':
+    _code = getattr(ecodes, f'KEY_{_letter.upper()}')
+    _CHAR_MAP[_letter] = (_code, False)
+    _CHAR_MAP[_letter.upper()] = (_code, True)
+for _digit, _shifted in zip('1234567890', '!@#$%^&*()'):
+    _code = getattr(ecodes, f'KEY_{_digit}')
+    _CHAR_MAP[_digit] = (_code, False)
+    _CHAR_MAP[_shifted] = (_code, True)
+for _plain, _shifted, _name in (('-', '_', 'MINUS'), ('=', '+', 'EQUAL'),
+                                ('[', '{', 'LEFTBRACE'), (']', '}', 'RIGHTBRACE'),
+                                ('\\', '|', 'BACKSLASH'), (';', ':', 'SEMICOLON'),
+                                ("'", '"', 'APOSTROPHE'), ('`', '~', 'GRAVE'),
+                                (',', '<', 'COMMA'), ('.', '>', 'DOT'), ('/', '?', 'SLASH')):
+    _code = getattr(ecodes, f'KEY_{_name}')
+    _CHAR_MAP[_plain] = (_code, False)
+    _CHAR_MAP[_shifted] = (_code, True)
+
+
+def uinput_writable() -> bool:
+    """True if a virtual keyboard can be created"""
+    return os.access(UINPUT_PATH, os.W_OK)
+
+
+class VirtualKeyboard:
+    """Long-lived uinput keyboard"""
+
+    def __init__(self):
+        keys = sorted({code for code, _ in _CHAR_MAP.values()} |
+                      {ecodes.KEY_LEFTSHIFT, ecodes.KEY_LEFTCTRL, ecodes.KEY_V})
+        # Raises OSError/UInputError when /dev/uinput is not accessible
+        self.device = evdev.UInput({ecodes.EV_KEY: keys}, name=DEVICE_NAME)
+
+    def send_chord(self, keys: List[int]) -> None:
+        """Press keys in order, then release them in reverse order"""
+        for key in keys:
+            self.device.write(ecodes.EV_KEY, key, 1)
+            self.device.syn()
+            time.sleep(KEY_DELAY)
+        for key in reversed(keys):
+            self.device.write(ecodes.EV_KEY, key, 0)
+            self.device.syn()
+            time.sleep(KEY_DELAY)
+
+    def paste(self, use_shift: bool = False) -> None:
+        """Send Ctrl+V, or Shift+Ctrl+V for terminals"""
+        if use_shift:
+            self.send_chord([ecodes.KEY_LEFTSHIFT, ecodes.KEY_LEFTCTRL, ecodes.KEY_V])
+        else:
+            self.send_chord([ecodes.KEY_LEFTCTRL, ecodes.KEY_V])
+
+    def type_text(self, text: str) -> bool:
+        """Type text key by key (US layout)
+
+        Returns False without typing anything if the text contains characters
+        that have no key on the US layout, so callers can fall back.
+        """
+        keys = [_CHAR_MAP.get(char) for char in text]
+        if any(key is None for key in keys):
+            return False
+
+        for code, shift in keys:
+            self.send_chord([ecodes.KEY_LEFTSHIFT, code] if shift else [code])
+        return True
+
+    def close(self) -> None:
+        self.device.close()
+
+
+def open_virtual_keyboard() -> Optional[VirtualKeyboard]:
+    """Create the virtual keyboard, or return None if uinput is unavailable"""
+    if not uinput_writable():
+        return None
+    try:
+        return VirtualKeyboard()
+    except Exception:
+        return None
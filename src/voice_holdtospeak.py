@@ -4,35 +4,37 @@ Hold-to-Speak Voice Input Daemon
 Monitors F12 key - hold to record, release to transcribe and type
 Cross-platform support for Wayland and X11, multiple desktop environments
 """
+import argparse
+import asyncio
+import base64
+import signal
 import sys
 import os
-import subprocess
 import threading
-import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import numpy as np
-import sounddevice as sd
-import scipy.io.wavfile as wav
-import tempfile
-import requests
-from .voice_type import VoiceTranscriber, SAMPLE_RATE, WHISPER_URL
+from .voice_type import VoiceTranscriber, SAMPLE_RATE
+from .backends import get_backend
+from .whisper_server import WhisperServerSupervisor
+from .streaming import SegmentedTranscription
+from .vad import SilenceTrimmer
+from .capture import CaptureBuffer, PrerollRing, ResampledCapture
+from .feedback import FeedbackPlayer
+from .keyboards import KeyboardMonitor
+from .pipeline import TranscriptionPipeline
+from .warmup import ServerWarmer
+from .tracing import CallbackTimer, get_tracer, print_stats
+from .control import ControlServer, get_control_socket_path
+from .notifications import NotificationWorker, get_notification_backend
 from .platform_detect import get_platform_info
 from .config import load_config, get_trigger_key_code, get_trigger_key_name, get_config_path
-import evdev
-from evdev import ecodes
 
-# Load configuration from ~/.config/voicetype/config.toml
-_config = load_config()
+# sounddevice (PortAudio) and evdev are imported where first used, and the
+# config is read by HoldToSpeakDaemon, so importing this module stays cheap
+# (see benchmarks/bench_startup.py for the enforced budget).
 
-# Configuration - loaded from config file with fallback defaults
-TRIGGER_KEY = get_trigger_key_code(_config)
-TRIGGER_KEY_NAME = get_trigger_key_name(_config)
-MIN_RECORDING_DURATION = _config["daemon"]["min_duration"]
-BEEP_ENABLED = _config["audio"]["beep_enabled"]
-
-# Audio feedback options - choose one:
-# Option 1: Use WAV files (set BEEP_USE_WAV_FILES = True)
-BEEP_USE_WAV_FILES = _config["audio"]["beep_use_wav_files"]
 
 def _find_sound_file(filename):
     """Find sound file in multiple possible locations (dev and AUR package)"""
@@ -48,95 +50,260 @@ def _find_sound_file(filename):
 BEEP_START_SOUND = _find_sound_file('start.wav')
 BEEP_STOP_SOUND = None  # None = use frequency tone for stop beep
 
-# Option 2: Use frequency tones (set BEEP_USE_WAV_FILES = False)
-BEEP_START_FREQUENCY = _config["audio"]["start_frequency"]
-BEEP_STOP_FREQUENCY = _config["audio"]["stop_frequency"]
-BEEP_DURATION = _config["audio"]["beep_duration"]
+MAX_REMOTE_DURATION = 60  # Longest recording a control request may ask for (seconds)
+REPLUG_GRACE = 3.0  # Seconds a hold survives its keyboard disappearing
+LEVEL_WINDOW = SAMPLE_RATE // 20  # Most recent samples the meter level is computed over
 
-CLIPBOARD_PASTE_DELAY = _config["output"]["clipboard_paste_delay"]
-NOTIFICATION_PREVIEW_LENGTH = _config["output"]["notification_preview_length"]
-NOTIFICATION_TIMEOUT = _config["output"]["notification_timeout"]
 
-# Audio level meter configuration
-SHOW_AUDIO_METER = _config["ui"]["show_audio_meter"]
-METER_WIDTH = _config["ui"]["meter_width"]
-METER_UPDATE_RATE = _config["ui"]["meter_update_rate"]
+class StreamingRecorder:
+    """Records audio with dynamic start/stop capability
 
+    By default a new input stream is opened on every start(). In warm mode
+    (open_warm()) the stream stays open between recordings and feeds a small
+    pre-roll ring, and recording boundaries are cut at the evdev timestamps
+    of the key press and release instead of whenever the handler runs.
 
-class StreamingRecorder:
-    """Records audio with dynamic start/stop capability"""
+    With ``native_rate`` the stream runs at the input device's default rate
+    (no resampling in the sound server, no failure on devices that can't
+    open 16 kHz) and the recording is resampled to 16 kHz in the background.
+    """
 
-    def __init__(self):
-        self.audio_queue = queue.Queue()
+    def __init__(self, min_duration: float = 0.3, blocksize: int = 0, latency='high',
+                 native_rate: bool = False):
+        """
+        Args:
+            min_duration: Recordings shorter than this (seconds) are discarded
+            blocksize: Frames per callback (0 = let PortAudio choose)
+            latency: Suggested input latency, 'low', 'high' or seconds
+            native_rate: Capture at the device's rate and resample in-process
+        """
+        self.min_duration = min_duration
+        self.blocksize = blocksize
+        self.latency = latency
+        self.native_rate = native_rate
+        self.rate = SAMPLE_RATE  # Rate the stream runs at
+        self.buffer = None  # CaptureBuffer for the current recording (16 kHz)
+        self.raw = None  # CaptureBuffer the callback writes (self.buffer unless resampling)
+        self._resampling = None  # ResampledCapture of the current recording (native rate)
         self.stream = None
         self.is_recording = False
         self.start_time = None
-        self.current_level = 0.0  # Current audio level (0-1)
 
-    def start(self):
-        """Start recording audio"""
-        if self.is_recording:
+        # Written by the callback, read by anyone (single writer, no lock)
+        self.overflows = 0  # Blocks PortAudio reported input overflow for (audio lost)
+        self.underflows = 0  # ...input underflow for (gap filled in)
+        self.callback_timer = CallbackTimer('audio_callback')
+        self._xruns_at_start = (0, 0)
+
+        # Warm-stream state
+        self.warm = False
+        self.preroll = None  # PrerollRing of the most recent audio
+        self._lock = threading.Lock()  # Guards buffer hand-over vs. the callback
+        self._frames_seen = 0  # Absolute index of the next frame from PortAudio
+        self._clock_frame = 0  # Absolute frame index at _clock_wall
+        self._clock_wall = 0.0  # Wall-clock (CLOCK_REALTIME) capture time of _clock_frame
+        self._origin_frame = 0  # Absolute frame index of buffer frame 0
+
+    def _select_rate(self):
+        """Stream rate: 16 kHz, or the input device's default rate with native_rate"""
+        if not self.native_rate:
             return
+        import sounddevice as sd
+        self.rate = int(sd.query_devices(kind='input')['default_samplerate'])
 
-        # Clear any old data
-        while not self.audio_queue.empty():
-            self.audio_queue.get()
-
-        self.is_recording = True
-        self.start_time = time.time()
-
-        # Start audio input stream
+    def _open_stream(self):
+        import sounddevice as sd
         self.stream = sd.InputStream(
-            samplerate=SAMPLE_RATE,
+            samplerate=self.rate,
             channels=1,
             dtype='int16',
+            blocksize=self.blocksize,
+            latency=self.latency,
             callback=self._audio_callback
         )
         self.stream.start()
 
-    def stop(self):
-        """Stop recording and return audio data"""
-        if not self.is_recording:
-            return None
-
-        self.is_recording = False
-
-        # Stop stream
+    def open_warm(self, preroll_seconds):
+        """Keep the input stream open and buffer pre-roll between recordings"""
+        if self.warm:
+            return
+        self._select_rate()
+        self.preroll = PrerollRing(self.rate, preroll_seconds)
+        self.warm = True
+        self._open_stream()
+
+    def close(self):
+        """Close the input stream (warm mode)"""
+        self.warm = False
         if self.stream:
             self.stream.stop()
             self.stream.close()
             self.stream = None
 
+    def frame_at(self, timestamp):
+        """Map a wall-clock timestamp to an absolute frame index (warm mode)"""
+        return self._clock_frame + int(round((timestamp - self._clock_wall) * self.rate))
+
+    def start(self, timestamp=None):
+        """Start recording audio
+
+        Args:
+            timestamp: Key-press time (evdev event.timestamp()); in warm mode
+                audio from this instant onwards is kept, including pre-roll
+        """
+        if self.is_recording:
+            return
+
+        if not self.warm:
+            self._select_rate()
+
+        # Fresh arena per recording: the previous one may still be referenced
+        # by the view stop() handed to a transcription thread
+        if self.rate != SAMPLE_RATE:
+            resampling = ResampledCapture(self.rate, SAMPLE_RATE)
+            buffer, raw = resampling.buffer, resampling.raw
+            resampling.start()
+        else:
+            resampling, buffer = None, CaptureBuffer(SAMPLE_RATE)
+            raw = buffer
+        self.start_time = timestamp or time.time()
+        self._xruns_at_start = (self.overflows, self.underflows)
+
+        if not self.warm:
+            self.buffer, self.raw, self._resampling = buffer, raw, resampling
+            self.is_recording = True
+            self._open_stream()
+            return
+
+        with self._lock:
+            # Until the first callback has anchored the clock, start "now"
+            anchored = timestamp and self._clock_wall
+            start_frame = self.frame_at(timestamp) if anchored else self._frames_seen
+            start_frame = max(start_frame, self.preroll.oldest)
+            # Audio captured since the press is already in the ring
+            raw.write(self.preroll.read_from(start_frame))
+            self._origin_frame = start_frame
+            self.buffer, self.raw, self._resampling = buffer, raw, resampling
+            self.is_recording = True
+
+    def stop(self, timestamp=None):
+        """Stop recording and return audio data (a view of the capture buffer)
+
+        Args:
+            timestamp: Key-release time (evdev event.timestamp()); in warm mode
+                the recording is cut at this instant
+        """
+        if not self.is_recording:
+            return None
+
+        end_time = timestamp or time.time()
+
+        if self.warm:
+            end_frame = self.frame_at(end_time)
+            # Let PortAudio deliver the frames up to the release (bounded wait)
+            deadline = time.time() + 0.2
+            while self._frames_seen < end_frame and time.time() < deadline:
+                time.sleep(0.005)
+            with self._lock:
+                self.is_recording = False
+            end = max(0, end_frame - self._origin_frame)
+        else:
+            self.is_recording = False
+            end = None
+
+            # Stop stream
+            if self.stream:
+                self.stream.stop()
+                self.stream.close()
+                self.stream = None
+
+        resampling, self._resampling = self._resampling, None
+        if resampling:
+            resampling.finish()  # The callback no longer writes to it
+            if end is not None:
+                end = int(round(end * SAMPLE_RATE / self.rate))
+
+        overflows = self.overflows - self._xruns_at_start[0]
+        underflows = self.underflows - self._xruns_at_start[1]
+        if overflows or underflows:
+            print(f"⚠ Audio dropouts during recording: {overflows} overflow(s), {underflows} underflow(s)"
+                  " (try a larger [audio] blocksize or latency)")
+
         # Calculate duration
-        duration = time.time() - self.start_time if self.start_time else 0
+        duration = end_time - self.start_time if self.start_time else 0
 
         # Check minimum duration
-        if duration < MIN_RECORDING_DURATION:
+        if duration < self.min_duration:
             print(f"Recording too short ({duration:.2f}s), ignoring...")
             return None
 
-        # Collect all audio chunks
-        audio_chunks = []
-        while not self.audio_queue.empty():
-            audio_chunks.append(self.audio_queue.get())
-
-        if not audio_chunks:
+        audio_data = self.buffer.view(0, end) if self.buffer is not None else None
+        if audio_data is None or len(audio_data) == 0:
             return None
 
-        # Concatenate all chunks
-        audio_data = np.concatenate(audio_chunks, axis=0)
         return audio_data
 
+    def read_since(self, offset):
+        """Return audio recorded from sample ``offset`` onwards (while recording)"""
+        if self.buffer is None:
+            return np.zeros((0, 1), dtype=np.int16)
+        return self.buffer.view(offset)
+
+    def _update_clock(self, frames, time_info):
+        """Anchor the frame counter to the wall clock for timestamp cut points"""
+        now = time.time()
+        adc_time = time_info.inputBufferAdcTime
+        if adc_time > 0:
+            # Convert PortAudio stream time to wall-clock time
+            capture_wall = now - (time_info.currentTime - adc_time)
+        else:
+            capture_wall = now - frames / self.rate  # Backend reports no ADC time
+        self._clock_frame = self._frames_seen
+        self._clock_wall = capture_wall
+
     def _audio_callback(self, indata, frames, time_info, status):
-        """Callback function for audio stream"""
-        if status:
-            print(f"Audio status: {status}", file=sys.stderr)
-        if self.is_recording:
-            self.audio_queue.put(indata.copy())
-            # Calculate RMS level for audio meter
-            rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-            # Normalize to 0-1 range (int16 max is 32767)
-            self.current_level = min(1.0, rms / 8000)  # Adjusted for typical speech levels
+        """Callback function for audio stream (PortAudio's real-time thread)
+
+        Only copies the block and bumps counters: no printing, no numpy
+        temporaries. The meter level is computed by its reader instead.
+        """
+        started = time.perf_counter()
+        try:
+            if status:
+                if status.input_overflow:
+                    self.overflows += 1
+                if status.input_underflow:
+                    self.underflows += 1
+
+            if self.warm:
+                with self._lock:
+                    self._update_clock(frames, time_info)
+                    block_start = self._frames_seen
+                    self._frames_seen += frames
+                    self.preroll.write(indata)
+                    if not self.is_recording:
+                        return
+                    if block_start < self._origin_frame:
+                        # Recording starts inside (or after) this block
+                        indata = indata[self._origin_frame - block_start:]
+                    self.raw.write(indata)
+            elif self.is_recording:
+                self.raw.write(indata)
+        finally:
+            self.callback_timer.add(time.perf_counter() - started)
+
+    @property
+    def current_level(self):
+        """Current audio level (0-1): RMS of the last LEVEL_WINDOW samples recorded"""
+        buffer = self.buffer
+        if not self.is_recording or buffer is None:
+            return 0.0
+        recent = buffer.view(max(0, buffer.length - LEVEL_WINDOW)).astype(np.float32)
+        if not len(recent):
+            return 0.0
+        rms = np.sqrt(np.mean(recent ** 2))
+        # Normalize to 0-1 range (int16 max is 32767)
+        return min(1.0, float(rms) / 8000)  # Adjusted for typical speech levels
 
     def get_elapsed_time(self):
         """Get elapsed recording time in seconds"""
@@ -148,25 +315,109 @@ class StreamingRecorder:
 class HoldToSpeakDaemon:
     """Main daemon class for hold-to-speak functionality"""
 
-    def __init__(self):
+    def __init__(self, config=None):
+        """
+        Args:
+            config: Configuration dict (default: load ~/.config/voicetype/config.toml)
+        """
+        if config is None:
+            config = load_config()
+        self.config = config
+
+        self.trigger_key = get_trigger_key_code(config)
+        self.trigger_key_name = get_trigger_key_name(config)
+        self.min_recording_duration = config["daemon"]["min_duration"]
+
+        # Audio feedback: WAV file (beep_use_wav_files) or frequency tones
+        self.beep_enabled = config["audio"]["beep_enabled"]
+        self.beep_use_wav_files = config["audio"]["beep_use_wav_files"]
+        self.beep_start_frequency = config["audio"]["start_frequency"]
+        self.beep_stop_frequency = config["audio"]["stop_frequency"]
+        self.beep_duration = config["audio"]["beep_duration"]
+
+        # Keep the input stream open between recordings (no stream-open delay on press)
+        self.keep_stream_open = config["audio"]["keep_stream_open"]
+        self.preroll_seconds = config["audio"]["preroll"]
+
+        self.clipboard_paste_delay = config["output"]["clipboard_paste_delay"]
+        self.virtual_keyboard = config["output"]["virtual_keyboard"]
+        self.notification_preview_length = config["output"]["notification_preview_length"]
+        self.notification_timeout = config["output"]["notification_timeout"]
+
+        # Segmented streaming transcription (transcribe at pauses while key is held)
+        self.streaming_enabled = config["streaming"]["enabled"]
+        self.streaming_min_segment = config["streaming"]["min_segment"]
+        self.streaming_max_segment = config["streaming"]["max_segment"]
+        self.streaming_pause_duration = config["streaming"]["pause_duration"]
+        self.streaming_silence_threshold = config["streaming"]["silence_threshold"]
+
+        # Transcription pipeline: worker count should match whisper-server --processors
+        self.pipeline_workers = config["pipeline"]["workers"]
+        self.pipeline_max_pending = config["pipeline"]["max_pending"]
+        self.pipeline_overflow = config["pipeline"]["overflow"]
+
+        # Warm-up requests (first request after start/idle is slow on a cold server)
+        self.warmup_on_startup = config["warmup"]["on_startup"]
+        self.warmup_on_press = config["warmup"]["prewarm_on_press"]
+        self.warmup_idle_threshold = config["warmup"]["idle_threshold"]
+
+        # Per-stage latency histograms (~/.local/state/voicetype/latency.json)
+        self.tracing_enabled = config["tracing"]["enabled"]
+        self.tracing_flush_interval = config["tracing"]["flush_interval"]
+
+        # Audio level meter
+        self.show_audio_meter = config["ui"]["show_audio_meter"]
+        self.meter_width = config["ui"]["meter_width"]
+        self.meter_update_rate = config["ui"]["meter_update_rate"]
+
+        # Control socket for the Claude skill (record/transcribe/status)
+        self.control_enabled = config["control"]["enabled"]
+
         # Don't initialize transcriber yet - will do it after ensuring server is running
         self.transcriber = None
-        self.recorder = StreamingRecorder()
+        self.recorder = StreamingRecorder(min_duration=self.min_recording_duration,
+                                          blocksize=config["audio"]["blocksize"],
+                                          latency=config["audio"]["latency"],
+                                          native_rate=config["audio"]["native_rate"])
+        self.tracer = get_tracer()
+        self.tracer.add_timer(self.recorder.callback_timer)
         self.keyboard_devices = []
-        self.notification_id = None  # Track notification for in-place updates
+        self.keyboards = None  # KeyboardMonitor, created when keyboards are first searched
+        self.notifier = NotificationWorker()  # Background sender, updates one popup in place
         self.platform = get_platform_info()  # Detect platform and available tools
-        self._meter_thread = None  # Audio meter display thread
-        self._stop_meter = False  # Flag to stop meter thread
-
-    def _display_audio_meter(self):
-        """Display real-time audio level meter in terminal"""
-        while not self._stop_meter and self.recorder.is_recording:
+        self._loop = None  # Event loop running keyboards, control socket, meter and timers
+        self._stopping = None  # asyncio.Event set by SIGINT/SIGTERM
+        self._meter_task = None  # Audio meter display task
+        self._holder = None  # Path of the keyboard the trigger key is held on
+        self._orphan_timer = None  # Pending release after that keyboard disappeared
+        self._segmenter = None  # Active SegmentedTranscription (streaming mode)
+        # Opening/closing the input stream blocks (and warm-mode stop() waits for
+        # the release's audio), so it runs here; one worker keeps press/release order
+        self._audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio')
+        self._key_tasks = set()  # Press/release handling waiting on the audio worker
+        self.pipeline = None  # TranscriptionPipeline, created once the server is up
+        self.supervisor = WhisperServerSupervisor(config=self.config)  # Owns/watches the local whisper-server
+        self.warmer = None  # ServerWarmer, created once the server is up
+        self._press_time = None  # evdev timestamp of the current key press
+        self.control = None  # ControlServer, started once the daemon is ready
+        self._remote_recording = False  # Control recording in progress (only changed on the loop)
+        self.feedback = FeedbackPlayer()
+        if self.beep_enabled:
+            self._load_feedback_sounds()
+        # Voice-activity trimming of silent edges before upload
+        vad = config["vad"]
+        self.trimmer = SilenceTrimmer(SAMPLE_RATE, threshold=vad["threshold"], padding=vad["padding"],
+                                      min_speech=vad["min_speech"]) if vad["enabled"] else None
+
+    async def _display_audio_meter(self):
+        """Display real-time audio level meter in terminal (task on the daemon loop)"""
+        while self.recorder.is_recording:
             level = self.recorder.current_level
             elapsed = self.recorder.get_elapsed_time()
 
             # Build the meter bar
-            filled = int(level * METER_WIDTH)
-            empty = METER_WIDTH - filled
+            filled = int(level * self.meter_width)
+            empty = self.meter_width - filled
             bar = '█' * filled + '░' * empty
 
             # Format elapsed time
@@ -176,26 +427,25 @@ class HoldToSpeakDaemon:
             sys.stdout.write(f"\r🎤 Recording... {bar} [{time_str}]  ")
             sys.stdout.flush()
 
-            time.sleep(1.0 / METER_UPDATE_RATE)
+            await asyncio.sleep(1.0 / self.meter_update_rate)
+        self._clear_audio_meter()
 
-        # Clear the meter line when done
+    def _clear_audio_meter(self):
         sys.stdout.write("\r" + " " * 60 + "\r")
         sys.stdout.flush()
 
     def _start_audio_meter(self):
-        """Start the audio meter display thread"""
-        if not SHOW_AUDIO_METER:
+        """Start the audio meter display task"""
+        if not self.show_audio_meter or self._loop is None:
             return
-        self._stop_meter = False
-        self._meter_thread = threading.Thread(target=self._display_audio_meter, daemon=True)
-        self._meter_thread.start()
+        self._meter_task = self._loop.create_task(self._display_audio_meter())
 
     def _stop_audio_meter(self):
-        """Stop the audio meter display thread"""
-        self._stop_meter = True
-        if self._meter_thread:
-            self._meter_thread.join(timeout=0.5)
-            self._meter_thread = None
+        """Stop the audio meter display task (the line is cleared right away)"""
+        task, self._meter_task = self._meter_task, None
+        if task and not task.done():
+            task.cancel()
+            self._clear_audio_meter()
 
     def ensure_whisper_server(self):
         """
@@ -203,142 +453,147 @@ class HoldToSpeakDaemon:
         If not, try to start it using local binary.
         Returns True if server is available, False otherwise.
         """
-        # Check if server is already running
-        try:
-            response = requests.get(WHISPER_URL.replace('/v1/audio/transcriptions', '/health'), timeout=2)
-            if response.status_code == 200:
-                return True
-        except (requests.ConnectionError, requests.Timeout):
-            pass
-
-        # Server not running, try to start it
-        print("⚠ whisper server not running. Attempting to start local server...")
-
-        # Try to use the start-server.sh script
-        # Check multiple possible locations (dev and AUR package)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.abspath(os.path.join(script_dir, '..'))
-
-        start_script_candidates = [
-            os.path.join(project_root, '.whisper/scripts/start-server.sh'),  # Dev
-            os.path.join(script_dir, 'whisper/scripts/start-server.sh'),     # AUR: /usr/lib/voicetype/whisper/
-        ]
-
-        start_script = None
-        for candidate in start_script_candidates:
-            if os.path.exists(candidate):
-                start_script = candidate
-                break
-
-        if start_script:
-            try:
-                # Run start script in background
-                subprocess.Popen(['bash', start_script],
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE)
-
-                # Wait for server to become available (up to 20 seconds)
-                print("⏳ Waiting for whisper server to start...")
-                for i in range(40):  # 40 attempts * 0.5s = 20 seconds max
-                    try:
-                        response = requests.get(WHISPER_URL.replace('/v1/audio/transcriptions', '/health'), timeout=1)
-                        if response.status_code == 200:
-                            print("✓ whisper server started successfully!")
-                            return True
-                    except (requests.ConnectionError, requests.Timeout):
-                        time.sleep(0.5)
-
-                print("✗ Server not responding after 20 seconds")
-                return False
-
-            except Exception as e:
-                print(f"✗ Failed to start server: {e}")
-                return False
-        else:
-            print(f"✗ Start script not found in any of these locations:")
-            for candidate in start_script_candidates:
-                print(f"   - {candidate}")
-            return False
+        return self.supervisor.ensure_running()
 
     def find_keyboard_devices(self):
-        """Find all keyboard input devices with F12 key"""
-        devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
-        keyboard_devices = []
-
-        # Look for keyboard devices
-        for device in devices:
-            capabilities = device.capabilities(verbose=False)
-            # Check if device has keyboard keys (EV_KEY events)
-            if ecodes.EV_KEY in capabilities:
-                keys = capabilities[ecodes.EV_KEY]
-                # Check if it has F12 key
-                if TRIGGER_KEY in keys:
-                    print(f"Found keyboard device: {device.name} ({device.path})")
-                    keyboard_devices.append(device)
-
-        return keyboard_devices
-
-    def play_beep(self, sound_file: str = None, frequency: int = BEEP_START_FREQUENCY, duration: float = BEEP_DURATION):
-        """Play a beep sound for feedback - either WAV file or frequency tone"""
-        if not BEEP_ENABLED:
-            return
-
-        try:
-            # Option 1: Play WAV file if using WAV files and file exists
-            if BEEP_USE_WAV_FILES and sound_file and os.path.exists(sound_file):
-                subprocess.run(['paplay', sound_file],
-                              timeout=1,
-                              check=False,
-                              stderr=subprocess.DEVNULL)
-            # Option 2: Generate frequency tone (fallback or when WAV files disabled)
-            else:
-                subprocess.run([
-                    'paplay',
-                    '--raw',
-                    '--format=s16le',
-                    '--rate=16000',
-                    '--channels=1',
-                    '/dev/stdin'
-                ], input=self._generate_tone(frequency, duration, SAMPLE_RATE),
-                   timeout=1,
-                   check=False,
-                   stderr=subprocess.DEVNULL)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # Silently fail if paplay not available or file missing
-            pass
-
-    def _generate_tone(self, frequency, duration, sample_rate):
-        """Generate a simple sine wave tone (fallback for when WAV files not used)"""
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
-        tone = np.sin(2 * np.pi * frequency * t)
-        # Convert to 16-bit PCM
-        tone = (tone * 32767).astype(np.int16)
-        return tone.tobytes()
-
-    def show_notification(self, title: str, message: str, icon: str = 'dialog-information', timeout: int = NOTIFICATION_TIMEOUT):
-        """Show or update desktop notification"""
-        try:
-            cmd = ['notify-send', '-i', icon, '-t', str(timeout), title, message]
-
-            if self.notification_id:
-                # Replace existing notification
-                cmd.insert(1, '--replace-id')
-                cmd.insert(2, self.notification_id)
-            else:
-                # Get notification ID for future updates
-                cmd.insert(1, '--print-id')
+        """Open all keyboard input devices with the trigger key (kept up to date on hotplug)"""
+        if self.keyboards is None:
+            self.keyboards = KeyboardMonitor(self.trigger_key)
+        self.keyboards.scan()
+        return list(self.keyboards.devices.values())
+
+    def _watch_keyboard(self, device):
+        """KeyboardMonitor.on_added: dispatch the device's events from the loop"""
+        self._loop.add_reader(device.fd, self._on_keyboard_readable, device)
+        if self._orphan_timer and self.trigger_key in device.active_keys():
+            # Back (Bluetooth re-pairing) with the key still held: keep recording
+            self._orphan_timer.cancel()
+            self._orphan_timer = None
+            self._holder = device.path
+
+    def _unwatch_keyboard(self, device):
+        """KeyboardMonitor.on_removed: stop reading it; a hold on it may end
+
+        The hold state lives in the daemon, so keyboards coming and going
+        don't affect it. If the keyboard holding the trigger key disappears,
+        the hold continues for REPLUG_GRACE seconds in case it comes straight
+        back with the key still down; otherwise the recording ends as if the
+        key was released when it disappeared.
+        """
+        self._loop.remove_reader(device.fd)
+        if device.path == self._holder and self._press_time is not None and self._orphan_timer is None:
+            self._orphan_timer = self._loop.call_later(REPLUG_GRACE, self._release_orphaned_hold, time.time())
+
+    def _on_keyboard_readable(self, device):
+        """Loop reader callback: dispatch trigger key events of one keyboard"""
+        from evdev import ecodes
+        path = device.path
+        for event in self.keyboards.read(device) or ():
+            if event.type != ecodes.EV_KEY or event.code != self.trigger_key:
+                continue
+            if event.value in (0, 1):
+                self._holder = path if event.value == 1 else None
+                if self._orphan_timer:
+                    self._orphan_timer.cancel()
+                    self._orphan_timer = None
+            self.handle_key_event(event)
+
+    def _release_orphaned_hold(self, orphaned_at):
+        """REPLUG_GRACE passed without the holding keyboard coming back"""
+        from evdev import InputEvent, ecodes
+        self._orphan_timer = None
+        if self._press_time is None or self.keyboards.holding(self.trigger_key):
+            return  # Hold ended elsewhere, or another keyboard holds the key
+        print("⚠ Keyboard disconnected during recording, stopping")
+        seconds = int(orphaned_at)
+        self._holder = None
+        self.handle_key_event(InputEvent(seconds, int((orphaned_at - seconds) * 1e6),
+                                         ecodes.EV_KEY, self.trigger_key, 0))
+
+    async def _rescan_keyboards(self):
+        """Without inotify: look for new and removed keyboards periodically"""
+        while True:
+            await asyncio.sleep(self.keyboards.poll_interval)
+            self.keyboards.scan()
+
+    async def _serve(self):
+        """Daemon core: one event loop for keyboards, control requests, meter and timers
+
+        Everything that blocks runs elsewhere with bounded concurrency:
+        transcription and output on the pipeline's worker threads, control
+        requests on the control server's pool, notifications on their
+        sender thread, starting and stopping the input stream on the audio
+        worker and audio in PortAudio's callback.
+        """
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._stopping = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._stopping.set)
+
+        if self.control_enabled:
+            await self.start_control_socket()
+        print(f"\n🎯 Ready! Hold {self.trigger_key_name} to record, release to transcribe and type.")
+        print(f"   Config: {get_config_path()}")
+        print("Press Ctrl+C to stop daemon.\n")
 
-            result = subprocess.run(cmd, capture_output=True, text=True,
-                                   timeout=2, check=False)
+        keyboards = self.keyboards
+        for device in keyboards.devices.values():
+            self._watch_keyboard(device)
+        keyboards.on_added = self._watch_keyboard
+        keyboards.on_removed = self._unwatch_keyboard
+        if keyboards.watch_fd is not None:
+            loop.add_reader(keyboards.watch_fd, keyboards.handle_watch_events)
+            rescan = None
+        else:
+            rescan = loop.create_task(self._rescan_keyboards())
 
-            # Store notification ID if this is the first notification
-            if not self.notification_id and result.stdout:
-                self.notification_id = result.stdout.strip()
+        try:
+            await self._stopping.wait()
+        finally:
+            if rescan:
+                rescan.cancel()
+            if keyboards.watch_fd is not None:
+                loop.remove_reader(keyboards.watch_fd)
+            keyboards.on_added = keyboards.on_removed = None
+            for device in keyboards.devices.values():
+                loop.remove_reader(device.fd)
+            if self._orphan_timer:
+                self._orphan_timer.cancel()
+                self._orphan_timer = None
+            self._stop_audio_meter()
+            if self._key_tasks:
+                # Let a stream start/stop in progress finish before the stream is closed
+                await asyncio.gather(*self._key_tasks, return_exceptions=True)
+            if self.control:
+                await self.control.stop()
+            self._loop = None
+
+    def _load_feedback_sounds(self):
+        """Decode/synthesize start and stop sounds once (kept in memory)"""
+        for name, sound_file, frequency in (('start', BEEP_START_SOUND, self.beep_start_frequency),
+                                            ('stop', BEEP_STOP_SOUND, self.beep_stop_frequency)):
+            # Option 1: WAV file if using WAV files and file exists
+            if self.beep_use_wav_files and sound_file and os.path.exists(sound_file):
+                try:
+                    self.feedback.load_wav(name, sound_file)
+                    continue
+                except (OSError, ValueError, EOFError) as e:
+                    print(f"⚠ Could not load {sound_file}: {e}")
+            # Option 2: Frequency tone (fallback or when WAV files disabled)
+            self.feedback.add_tone(name, frequency, self.beep_duration)
+
+    def play_beep(self, name: str):
+        """Play a cached feedback sound ('start' or 'stop') without blocking"""
+        if not self.beep_enabled:
+            return
+        self.feedback.play(name)
 
-        except Exception:
-            # Silently fail - notifications are nice-to-have
-            pass
+    def show_notification(self, title: str, message: str, icon: str = 'dialog-information', timeout: Optional[int] = None):
+        """Show or update desktop notification (queued; never blocks the caller)"""
+        if timeout is None:
+            timeout = self.notification_timeout
+        self.notifier.notify(title, message, icon=icon, timeout=timeout)
 
     def type_text_via_clipboard(self, text):
         """Copy text to clipboard and automatically paste with keyboard shortcut"""
@@ -346,19 +601,24 @@ class HoldToSpeakDaemon:
             return False
 
         # Copy to clipboard using platform-appropriate tool
-        if not self.platform.copy_to_clipboard(text):
+        with self.tracer.span('clipboard_copy'):
+            copied = self.platform.copy_to_clipboard(text)
+        if not copied:
             print("✗ Error: No clipboard tool available")
             print("\nPlease install required tools:")
             print(self.platform.get_install_instructions())
             return False
 
         # Increased delay to ensure clipboard is ready
-        time.sleep(CLIPBOARD_PASTE_DELAY)
+        with self.tracer.span('paste_delay'):
+            time.sleep(self.clipboard_paste_delay)
 
         print(f"✓ Copied {len(text)} characters to clipboard")
 
         # Automatically paste using keyboard shortcut (Shift+Ctrl+V for terminals)
-        if self.platform.simulate_paste_shortcut(use_shift=True):
+        with self.tracer.span('paste_shortcut'):
+            pasted = self.platform.simulate_paste_shortcut(use_shift=True)
+        if pasted:
             print("✓ Auto-pasted into active window")
             return True
         else:
@@ -367,107 +627,346 @@ class HoldToSpeakDaemon:
             print("📋 Text is in clipboard - paste manually with Shift+Ctrl+V (terminals) or Ctrl+V (GUI)")
             return True  # Still successful - text is in clipboard
 
+    def _run_audio(self, func, *args):
+        """Run a blocking recorder call on the audio worker (awaitable result)"""
+        return self._loop.run_in_executor(self._audio_executor, func, *args)
+
+    def _spawn_key_task(self, coroutine):
+        task = self._loop.create_task(coroutine)
+        self._key_tasks.add(task)  # The loop only keeps weak references
+        task.add_done_callback(self._key_tasks.discard)
+
     def handle_key_event(self, event):
-        """Handle keyboard events (press/release)"""
-        if event.code != TRIGGER_KEY:
+        """Handle keyboard events (press/release) on the loop
+
+        The stream is started and stopped on the audio worker; the rest of
+        each press/release continues once that is done, so keyboard reads,
+        control requests and timers never wait on PortAudio.
+        """
+        if event.code != self.trigger_key:
             return
 
         if event.value == 1:  # Key pressed
-            if not SHOW_AUDIO_METER:
-                print(f"\n🎤 Recording... (hold {TRIGGER_KEY_NAME})")
-            self.play_beep(sound_file=BEEP_START_SOUND, frequency=BEEP_START_FREQUENCY, duration=BEEP_DURATION)
-            self.recorder.start()
-            self._start_audio_meter()  # Start the visual meter
-            # Show notification with long timeout (will be replaced when done)
-            self.show_notification('Voice Input', 'Recording...',
-                                 icon='audio-input-microphone', timeout=60000)
+            if self._remote_recording:
+                print("⚠ Recording for a control request in progress, key ignored")
+                return
+            if self._press_time is not None:
+                return  # Already held (e.g. on another keyboard)
+            if not self.show_audio_meter:
+                print(f"\n🎤 Recording... (hold {self.trigger_key_name})")
+            self._press_time = event.timestamp()
+            with self.tracer.span('beep'):
+                self.play_beep('start')
+            self._spawn_key_task(self._on_press(event.timestamp()))
 
         elif event.value == 0:  # Key released
+            if self._press_time is None:
+                return  # The press was ignored
             self._stop_audio_meter()  # Stop the visual meter
             print("⏹️  Recording stopped")
-            self.play_beep(sound_file=BEEP_STOP_SOUND, frequency=BEEP_STOP_FREQUENCY, duration=BEEP_DURATION)
-
-            # Stop recording and get audio data
-            audio_data = self.recorder.stop()
-
-            if audio_data is not None:
-                # Update notification to show transcribing status
+            released_at = time.perf_counter()
+            self.tracer.record('capture', event.timestamp() - self._press_time)
+            self._press_time = None
+            self.play_beep('stop')
+            self._spawn_key_task(self._on_release(event.timestamp(), released_at))
+
+    async def _on_press(self, pressed_at):
+        """Rest of a key press: open the stream, then start segmenting and the meter"""
+        try:
+            with self.tracer.span('stream_open'):
+                await self._run_audio(self.recorder.start, pressed_at)
+        except Exception as e:
+            print(f"✗ Could not start recording: {e}")
+            if self._press_time == pressed_at:
+                self._press_time = None
+            self.show_notification('Voice Input', 'Microphone unavailable',
+                                 icon='dialog-error', timeout=3000)
+            return
+        if self._press_time != pressed_at:
+            return  # Released while the stream opened (its stop is queued behind)
+        if self.warmup_on_press:
+            # Overlaps with the user speaking; no-op unless the server idled
+            self.warmer.maybe_prewarm()
+        if self.streaming_enabled:
+            self._segmenter = SegmentedTranscription(
+                self.recorder, self.transcriber, SAMPLE_RATE,
+                min_segment=self.streaming_min_segment,
+                max_segment=self.streaming_max_segment,
+                pause_duration=self.streaming_pause_duration,
+                silence_threshold=self.streaming_silence_threshold,
+            )
+            self._segmenter.start()
+        self._start_audio_meter()  # Start the visual meter
+        # Show notification with long timeout (will be replaced when done)
+        self.show_notification('Voice Input', 'Recording...',
+                             icon='audio-input-microphone', timeout=60000)
+
+    async def _on_release(self, released_ts, released_at):
+        """Rest of a key release: stop the stream, then trim and queue the audio"""
+        # Stop recording and get audio data
+        try:
+            with self.tracer.span('stop'):
+                audio_data = await self._run_audio(self.recorder.stop, released_ts)
+        except Exception as e:
+            print(f"✗ Could not stop recording: {e}")
+            audio_data = None
+        segmenter, self._segmenter = self._segmenter, None
+        if segmenter:
+            segmenter.stop_polling()
+        elif audio_data is not None and self.trimmer:
+            # Drop silent edges (streaming mode trims its tail segment instead)
+            with self.tracer.span('vad'):
+                result = self.trimmer.trim(audio_data)
+            if result.audio is None:
+                print("✗ No speech detected (silent recording, not sent)")
+                self.show_notification('Voice Input', 'No speech detected',
+                                     icon='dialog-warning', timeout=3000)
+                return
+            print(self.trimmer.describe(result))
+            audio_data = result.audio
+
+        if audio_data is not None:
+            # Update notification to show transcribing status
+            # Transcribe in background to avoid blocking key monitoring
+            if self.pipeline.submit((audio_data, segmenter, released_at)):
                 self.show_notification('Voice Input', 'Transcribing...',
                                      icon='view-refresh', timeout=30000)
-                # Transcribe in background to avoid blocking key monitoring
-                threading.Thread(
-                    target=self._transcribe_and_type,
-                    args=(audio_data,),
-                    daemon=True
-                ).start()
             else:
-                print("No audio data recorded")
-                self.show_notification('Voice Input', 'Recording too short',
+                if segmenter:
+                    segmenter.cancel()
+                print(f"⚠ Busy: {self.pipeline.pending} recordings still transcribing, discarded this one")
+                self.show_notification('Voice Input', 'Busy - recording discarded',
                                      icon='dialog-warning', timeout=3000)
-
-    def _transcribe_and_type(self, audio_data):
-        """Transcribe audio and type the result"""
+        else:
+            if segmenter:
+                segmenter.cancel()
+            print("No audio data recorded")
+            self.show_notification('Voice Input', 'Recording too short',
+                                 icon='dialog-warning', timeout=3000)
+
+    def _transcribe_and_type(self, audio_data, segmenter=None):
+        """Transcribe audio and type the result (both stages, synchronously)"""
+        job = (audio_data, segmenter, time.perf_counter())
         try:
-            print("🔄 Transcribing...")
-            transcribed_text = self.transcriber.transcribe_audio(audio_data)
+            text, error = self._transcribe_job(job), None
+        except Exception as e:
+            text, error = None, e
+        self._deliver_transcription(job, text, error)
+
+    def _transcribe_job(self, job):
+        """Pipeline transcription stage: audio in, text out (worker thread)
 
-            if transcribed_text:
-                print(f"📝 Transcription: {transcribed_text}")
+        With a segmenter (streaming mode) most of the recording has already
+        been transcribed while the key was held; only the tail is sent here.
+        """
+        audio_data, segmenter, _ = job
+        print("🔄 Transcribing...")
+        idle = self.warmer.idle_for if self.warmer else 0.0
+        start = time.monotonic()
+        if segmenter:
+            text = segmenter.finish(audio_data, trimmer=self.trimmer)
+        else:
+            text = self.transcriber.transcribe_audio(audio_data)
+        if self.warmer:
+            self.warmer.touch()
+            idle_text = f", server idle {idle:.0f}s before" if idle != float('inf') else ""
+            segments_text = f", {segmenter.segments_sent} segments" if segmenter else ""
+            print(f"⏱️  Transcribed in {(time.monotonic() - start) * 1000:.0f} ms{segments_text}{idle_text}")
+        return text
+
+    def _deliver_transcription(self, job, transcribed_text, error):
+        """Pipeline output stage: notify and paste (in recording order)"""
+        if error is not None:
+            print(f"✗ Error during transcription: {error}")
+            self.show_notification('Voice Input', f'Error: {str(error)[:40]}',
+                                 icon='dialog-error', timeout=self.notification_timeout)
+            return
 
-                # Show preview in notification
-                preview = transcribed_text[:NOTIFICATION_PREVIEW_LENGTH] + \
-                         ('...' if len(transcribed_text) > NOTIFICATION_PREVIEW_LENGTH else '')
-                self.show_notification('Voice Input', f'Ready: {preview}',
-                                     icon='dialog-ok-apply', timeout=3000)
+        if transcribed_text:
+            print(f"📝 Transcription: {transcribed_text}")
 
-                self.type_text_via_clipboard(transcribed_text)
-            else:
-                print("✗ No speech detected")
-                self.show_notification('Voice Input', 'No speech detected',
-                                     icon='dialog-warning', timeout=3000)
+            # Show preview in notification
+            preview = transcribed_text[:self.notification_preview_length] + \
+                     ('...' if len(transcribed_text) > self.notification_preview_length else '')
+            self.show_notification('Voice Input', f'Ready: {preview}',
+                                 icon='dialog-ok-apply', timeout=3000)
 
-        except Exception as e:
-            print(f"✗ Error during transcription: {e}")
-            self.show_notification('Voice Input', f'Error: {str(e)[:40]}',
-                                 icon='dialog-error', timeout=NOTIFICATION_TIMEOUT)
+            self.type_text_via_clipboard(transcribed_text)
+            # Key release to text in the focused window, including queueing
+            self.tracer.record('release_to_text', time.perf_counter() - job[2])
+        else:
+            print("✗ No speech detected")
+            self.show_notification('Voice Input', 'No speech detected',
+                                 icon='dialog-warning', timeout=3000)
+
+    def _on_job_dropped(self, job):
+        """Backlog full under 'drop_oldest': an older recording was discarded"""
+        audio_data, segmenter, _ = job
+        if segmenter:
+            segmenter.cancel()
+        print(f"⚠ Backlog full, dropped a queued {len(audio_data) / SAMPLE_RATE:.1f}s recording")
+
+    def _control_status(self, request):
+        """Control command 'status': what the daemon is doing"""
+        return {
+            'running': True,
+            'pid': os.getpid(),
+            'recording': self.recorder.is_recording,
+            'trigger_key': self.trigger_key_name,
+            'backend': self.transcriber.client.kind,
+            'server': self.transcriber.client.name,
+            'server_healthy': self.supervisor.healthy if self.transcriber.client.needs_server else True,
+            'pending': self.pipeline.pending if self.pipeline else 0,
+            'dropped': self.pipeline.dropped_count if self.pipeline else 0,
+            'rejected': self.pipeline.rejected_count if self.pipeline else 0,
+            'audio_overflows': self.recorder.overflows,
+            'audio_underflows': self.recorder.underflows,
+            'keyboards': [device.path for device in list(self.keyboards.devices.values())] if self.keyboards else [],
+        }
+
+    def _control_record(self, request):
+        """Control command 'record': record for ``duration`` seconds, return the text
+
+        Uses the daemon's (possibly warm) microphone stream and server
+        connection. The text is returned to the caller, not pasted. The
+        recording itself runs on the event loop, like key presses, so the
+        two can't both start one.
+        """
+        duration = float(request.get('duration', 5))
+        if not 0 < duration <= MAX_REMOTE_DURATION:
+            return {'error': f"Duration must be between 0 and {MAX_REMOTE_DURATION} seconds"}
+        if self._loop is None:
+            return {'error': 'Daemon is not running'}
+        audio_data, error = asyncio.run_coroutine_threadsafe(
+            self._record_for_control(duration), self._loop).result()
+        if error:
+            return {'error': error}
+
+        if audio_data is not None and self.trimmer:
+            audio_data = self.trimmer.trim(audio_data).audio
+        if audio_data is None:
+            return {'error': 'No speech detected', 'text': ''}
+        text = self.transcriber.transcribe_audio(audio_data)
+        if not text:
+            return {'error': 'No speech detected or transcription failed', 'text': ''}
+        return {'text': text, 'duration': request.get('duration', 5)}
+
+    def _control_transcribe(self, request):
+        """Control command 'transcribe': transcribe base64 int16 mono PCM sent by the caller"""
+        sample_rate = int(request.get('sample_rate', SAMPLE_RATE))
+        if sample_rate != SAMPLE_RATE:
+            return {'error': f"Audio must be {SAMPLE_RATE} Hz mono int16 (got {sample_rate} Hz)"}
+        audio_data = np.frombuffer(base64.b64decode(request.get('audio', '')), dtype='<i2')
+        if not len(audio_data):
+            return {'error': 'No audio in request'}
+        return {'text': self.transcriber.transcribe_audio(audio_data)}
+
+    async def _record_for_control(self, duration):
+        """Record for a control request (on the loop); returns (audio, error)"""
+        if self._remote_recording:
+            return None, 'Busy: another control recording is in progress'
+        if self._press_time is not None or self.recorder.is_recording:
+            return None, f'Busy: {self.trigger_key_name} recording in progress'
+        self._remote_recording = True  # Key presses are ignored from here on
+        try:
+            print(f"\n🎤 Recording {duration:g}s for a control request...")
+            self.play_beep('start')
+            await self._run_audio(self.recorder.start, time.time())
+            await asyncio.sleep(duration)
+            audio_data = await self._run_audio(self.recorder.stop, time.time())
+            self.play_beep('stop')
+        finally:
+            self._remote_recording = False
+        return audio_data, None
+
+    async def start_control_socket(self):
+        """Listen for control requests on the loop (a failure only disables the socket)"""
+        self.control = ControlServer({
+            'status': self._control_status,
+            'record': self._control_record,
+            'transcribe': self._control_transcribe,
+        }, path=get_control_socket_path(self.config))
+        try:
+            await self.control.start()
+            print(f"✓ Control socket: {self.control.path}")
+        except OSError as e:
+            print(f"⚠ Control socket unavailable: {e}")
+            self.control = None
 
     def run(self):
         """Main daemon loop"""
+        # Create the uinput keyboard up front so the compositor has picked it
+        # up long before the first paste
+        if self.virtual_keyboard and not self.platform.enable_virtual_keyboard():
+            print("⚠ /dev/uinput not writable, using external keyboard tools")
+
         print("="*60)
         print("Hold-to-Speak Voice Input Daemon")
         print("="*60)
         print(f"Platform: {self.platform.display_server.upper()}/{self.platform.desktop_env}")
         print(f"Clipboard: {self.platform.get_clipboard_tool() or 'None'}")
         print(f"Keyboard: {self.platform.get_keyboard_tool() or 'None'}")
-        print(f"Trigger key: {TRIGGER_KEY_NAME}")
-        print(f"Whisper server: {WHISPER_URL}")
-        print(f"Minimum recording: {MIN_RECORDING_DURATION}s")
+        print(f"Notifications: {get_notification_backend()}")
+        print(f"Trigger key: {self.trigger_key_name}")
+        backend = get_backend(self.config)
+        print(f"Transcription: {backend.name} ({backend.kind})")
+        print(f"Minimum recording: {self.min_recording_duration}s")
+        print(f"Streaming segments: {'on' if self.streaming_enabled else 'off'}")
+        print(f"Silence trimming: {'on' if self.trimmer else 'off'}")
+        print(f"Transcription workers: {self.pipeline_workers} (backlog {self.pipeline_max_pending}, {self.pipeline_overflow})")
         print("="*60)
 
-        # Ensure whisper server is running before starting daemon
-        print("\nChecking whisper.cpp server...")
-        if not self.ensure_whisper_server():
-            print("\n✗ Error: whisper.cpp server is not available")
-            print("\nPlease start the server manually:")
-            print("  systemctl --user start whisper-server")
-            print("  OR: bash .whisper/scripts/start-server.sh")
-            print("  OR: bash install-whisper.sh")
-            sys.exit(1)
+        if backend.needs_server:
+            # Ensure whisper server is running before starting daemon
+            print("\nChecking whisper.cpp server...")
+            if not self.ensure_whisper_server():
+                print("\n✗ Error: whisper.cpp server is not available")
+                print("\nPlease start the server manually:")
+                print("  systemctl --user start whisper-server")
+                print("  OR: bash .whisper/scripts/start-server.sh")
+                print("  OR: bash install-whisper.sh")
+                sys.exit(1)
+
+            # Watch the server from now on and restart it if it crashes
+            self.supervisor.start_monitoring()
+        else:
+            print(f"\nLoading {backend.name}...")
+            if not backend.health():
+                print(f"\n✗ Error: {backend.name} is not available (see [backend] in {get_config_path()})")
+                sys.exit(1)
 
-        # Initialize transcriber now that server is running
+        # Initialize transcriber now that the backend is up (health already verified)
         try:
-            self.transcriber = VoiceTranscriber()
-            print("✓ Connected to whisper.cpp server")
+            self.transcriber = VoiceTranscriber(client=backend, check_server=False, config=self.config)
+            print(f"✓ Connected to {'whisper.cpp server' if backend.needs_server else backend.name}")
         except Exception as e:
             print(f"\n✗ Error connecting to whisper server: {e}")
             sys.exit(1)
 
+        self.warmer = ServerWarmer(self.transcriber.client, SAMPLE_RATE,
+                                   idle_threshold=self.warmup_idle_threshold)
+        if self.warmup_on_startup:
+            self.warmer.warm_up_at_startup()
+
+        # Enabled after warm-up so synthetic requests stay out of the histograms
+        if self.tracing_enabled:
+            self.tracer.enabled = True
+            self.tracer.load()
+            self.tracer.start_flushing(self.tracing_flush_interval)
+
+        self.pipeline = TranscriptionPipeline(
+            self._transcribe_job, self._deliver_transcription,
+            workers=self.pipeline_workers, max_pending=self.pipeline_max_pending,
+            overflow=self.pipeline_overflow, on_drop=self._on_job_dropped,
+        )
+
         # Find keyboard devices
         print("\nSearching for keyboard devices...")
         self.keyboard_devices = self.find_keyboard_devices()
 
         if not self.keyboard_devices:
-            print(f"✗ Error: Could not find any keyboard device with {TRIGGER_KEY_NAME} key")
+            self.keyboards.close()
+            print(f"✗ Error: Could not find any keyboard device with {self.trigger_key_name} key")
             print("\nTroubleshooting:")
             print("1. Make sure you're in the 'input' group:")
             print("   sudo usermod -a -G input $USER")
@@ -476,35 +975,54 @@ class HoldToSpeakDaemon:
             print("   python3 -c 'import evdev; print([d for d in evdev.list_devices()])'")
             sys.exit(1)
 
-        print(f"✓ Monitoring {len(self.keyboard_devices)} keyboard(s)")
-        print(f"\n🎯 Ready! Hold {TRIGGER_KEY_NAME} to record, release to transcribe and type.")
-        print(f"   Config: {get_config_path()}")
-        print("Press Ctrl+C to stop daemon.\n")
+        watching = "hotplug via inotify" if self.keyboards.watch_fd is not None else "rescanning for new ones"
+        print(f"✓ Monitoring {len(self.keyboard_devices)} keyboard(s) ({watching})")
 
-        try:
-            # Create a device map for select
-            import select
-            devices_map = {dev.fd: dev for dev in self.keyboard_devices}
-
-            # Monitor keyboard events from all devices
-            while True:
-                r, w, x = select.select(devices_map, [], [])
-                for fd in r:
-                    device = devices_map[fd]
-                    for event in device.read():
-                        if event.type == ecodes.EV_KEY:
-                            self.handle_key_event(event)
+        if self.beep_enabled:
+            self.feedback.open()
+        self.notifier.start()
 
+        if self.keep_stream_open:
+            try:
+                self.recorder.open_warm(self.preroll_seconds)
+                print(f"✓ Microphone stream kept open ({self.preroll_seconds}s pre-roll)")
+            except Exception as e:
+                print(f"⚠ Could not keep microphone open ({e}), opening per recording")
+
+        try:
+            asyncio.run(self._serve())
         except KeyboardInterrupt:
-            print("\n\n✓ Daemon stopped")
-            sys.exit(0)
+            pass  # Ctrl+C before the signal handlers were installed
         except Exception as e:
             print(f"\n✗ Error: {e}")
             sys.exit(1)
 
+        self.keyboards.close()
+        self._audio_executor.shutdown(wait=True)
+        self.recorder.close()
+        self.feedback.close()
+        self.platform.disable_virtual_keyboard()
+        self.pipeline.shutdown()
+        self.notifier.flush(timeout=1)  # Last status popup (delivery may still be queued)
+        self.notifier.stop()
+        self.supervisor.stop()
+        self.tracer.stop()
+        print("\n\n✓ Daemon stopped")
+        sys.exit(0)
+
 
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description='Hold-to-speak voice input daemon')
+    subcommands = parser.add_subparsers(dest='command')
+    stats = subcommands.add_parser('stats', help='Show per-stage latency percentiles')
+    stats.add_argument('--hours', type=float, help='Only include the last N hours')
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        print_stats(since_hours=args.hours)
+        return
+
     try:
         daemon = HoldToSpeakDaemon()
         daemon.run()
@@ -4,13 +4,15 @@ Voice-to-Text Input: Record audio, transcribe with whisper.cpp, and type into ac
 Cross-platform support for Wayland and X11, multiple desktop environments
 
 Prerequisites:
-- whisper.cpp server running on port 2022
+- whisper.cpp server running on port 2022 (or another [backend] type in config.toml)
 - Keyboard automation tool (ydotool, kdotool, or xdotool) - auto-detected
 """
 import sys
 import subprocess
 from .voice_type import VoiceTranscriber, DURATION
+from .backends import get_backend
 from .platform_detect import get_platform_info
+from .config import load_config
 
 
 def type_text_into_window(text, platform):
@@ -41,6 +43,10 @@ def main():
     # Detect platform and available tools
     platform = get_platform_info()
 
+    # Virtual keyboard is created now so it is ready by the time we type
+    if load_config()["output"]["virtual_keyboard"]:
+        platform.enable_virtual_keyboard()
+
     # Check if we have typing or clipboard tools
     if not platform.get_keyboard_tool() and not platform.get_clipboard_tool():
         print("✗ Error: No keyboard automation or clipboard tool available")
@@ -55,7 +61,7 @@ def main():
     print("="*60)
     print("\nThis will:")
     print(f"  1. Record audio for {DURATION} seconds")
-    print("  2. Transcribe using whisper.cpp")
+    print(f"  2. Transcribe using {get_backend().name}")
     print("  3. Type the text into the active window")
     print("\nMake sure Claude Code terminal is focused!")
     print("="*60)
@@ -68,7 +74,7 @@ def main():
         sys.exit(0)
 
     try:
-        # Initialize transcriber (checks whisper.cpp connection)
+        # Initialize transcriber (checks the configured backend, whisper.cpp by default)
         transcriber = VoiceTranscriber()
 
         # Record audio
@@ -2,34 +2,49 @@
 """
 VoiceType: Local voice transcription using whisper.cpp
 """
-import os
 import sys
-import tempfile
 from typing import Optional
 import numpy as np
 import numpy.typing as npt
-import requests
-import sounddevice as sd
-import scipy.io.wavfile as wav
+from .chunking import ChunkedTranscriber
+from .config import load_config
+from .backends import TranscriptionBackend, get_backend, transcription_errors
+from .whisper_client import WHISPER_BASE_URL, WHISPER_INFERENCE_PATH
 
 # Configuration
 SAMPLE_RATE = 16000  # Whisper expects 16kHz audio
 DURATION = 5  # Default recording duration in seconds
-WHISPER_URL = "http://127.0.0.1:2022/v1/audio/transcriptions"
+WHISPER_URL = WHISPER_BASE_URL + WHISPER_INFERENCE_PATH
 
 
 class VoiceTranscriber:
-    def __init__(self) -> None:
-        """Initialize VoiceTranscriber and verify whisper.cpp server connection."""
-        # Check if whisper.cpp server is running
-        try:
-            response = requests.get("http://127.0.0.1:2022/health", timeout=2)
-            if response.status_code == 200:
-                print("✓ Connected to whisper.cpp server")
-            else:
-                raise ConnectionError("Whisper server returned unexpected status")
-        except requests.exceptions.RequestException:
-            print("✗ Error: whisper.cpp server is not running on port 2022")
+    def __init__(self, client: Optional[TranscriptionBackend] = None, check_server: bool = True,
+                 config=None) -> None:
+        """Initialize VoiceTranscriber and verify the transcription backend.
+
+        Args:
+            client: Backend to use (defaults to the one selected by [backend] type)
+            check_server: Verify the backend is up (skip if a supervisor already did)
+            config: Configuration for [chunking] and [audio] (defaults to load_config())
+        """
+        self.client = client or get_backend()
+        config = config or load_config()
+        self.native_rate = config["audio"]["native_rate"]
+        self.chunker = None
+        if config["chunking"]["enabled"]:
+            self.chunker = ChunkedTranscriber.from_config(self.client, SAMPLE_RATE, config)
+
+        if not check_server:
+            return
+
+        # Check if whisper.cpp server (or the configured backend) is available
+        if self.client.health():
+            print(f"✓ Connected to {'whisper.cpp server' if self.client.needs_server else self.client.name}")
+        elif not self.client.needs_server:
+            print(f"✗ Error: {self.client.name} is not available")
+            sys.exit(1)
+        else:
+            print(f"✗ Error: whisper.cpp server is not running at {self.client.name}")
             print("\nPlease start the whisper server:")
             print("cd /tmp/whisper.cpp")
             print("./build/bin/whisper-server --model models/ggml-base.en.bin \\")
@@ -47,17 +62,37 @@ class VoiceTranscriber:
         Returns:
             Audio data as 16kHz mono int16 numpy array
         """
+        import sounddevice as sd
+        rate = SAMPLE_RATE
+        if self.native_rate:
+            # Record at the device's own rate and resample here, not in the sound server
+            rate = int(sd.query_devices(kind='input')['default_samplerate'])
         print(f"\nRecording for {duration} seconds... Speak now!")
-        audio_data = sd.rec(int(duration * SAMPLE_RATE),
-                           samplerate=SAMPLE_RATE,
+        audio_data = sd.rec(int(duration * rate),
+                           samplerate=rate,
                            channels=1,
                            dtype='int16')
         sd.wait()  # Wait until recording is finished
         print("Recording finished!")
+        if rate != SAMPLE_RATE:
+            from .resample import resample_poly, to_int16
+            audio_data = to_int16(resample_poly(audio_data, rate, SAMPLE_RATE)).reshape(-1, 1)
         return audio_data
 
+    def transcribe(self, audio_data: npt.NDArray[np.int16]) -> str:
+        """Convert audio to text, raising if the backend fails (see transcribe_audio)
+
+        Raises:
+            Any of transcription_errors()
+        """
+        if self.chunker is not None:
+            # Long recordings are split and sent in parallel
+            return self.chunker.transcribe(audio_data)
+        # Deadline follows the audio length and the server's measured speed
+        return self.client.transcribe(audio_data, sample_rate=SAMPLE_RATE)
+
     def transcribe_audio(self, audio_data: npt.NDArray[np.int16]) -> str:
-        """Convert audio to text using whisper.cpp HTTP API.
+        """Convert audio to text with the configured backend (whisper.cpp HTTP API by default).
 
         Args:
             audio_data: 16kHz mono int16 audio data
@@ -65,30 +100,13 @@ class VoiceTranscriber:
         Returns:
             Transcribed text, or empty string on failure
         """
-        # Save audio to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            wav.write(tmp_file.name, SAMPLE_RATE, audio_data)
-            tmp_filename = tmp_file.name
-
         try:
-            # Transcribe using whisper.cpp server
+            # Transcribe with the configured backend (whisper.cpp server by default)
             print("Transcribing...")
-            with open(tmp_filename, 'rb') as audio_file:
-                files = {'file': ('audio.wav', audio_file, 'audio/wav')}
-                data = {'model': 'whisper-1'}  # Required by OpenAI-compatible API
-
-                response = requests.post(WHISPER_URL, files=files, data=data, timeout=30)
-                response.raise_for_status()
-
-                result = response.json()
-                transcribed_text = result.get("text", "").strip()
-                return transcribed_text
-        except requests.exceptions.RequestException as e:
+            return self.transcribe(audio_data)
+        except transcription_errors() as e:
             print(f"Error transcribing audio: {e}")
             return ""
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_filename)
 
     def run_interactive(self) -> None:
         """Run interactive voice transcription session in terminal."""
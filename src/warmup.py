@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Server Warm-up
+The first request after whisper-server starts (or after a long idle) is much
+slower than the rest: model pages and thread pools are cold. ServerWarmer
+sends a short synthetic request at startup and, when the server has been
+idle for a while, a background pre-warm on key press so it overlaps with the
+user speaking.
+"""
+import threading
+import time
+import numpy as np
+from .backends import transcription_errors
+from .tracing import get_tracer
+
+WARMUP_SECONDS = 1.0  # Length of the synthetic warm-up clip
+
+
+def synthetic_clip(sample_rate: int, seconds: float = WARMUP_SECONDS):
+    """Deterministic low-level noise clip (cheap to decode, exercises the full path)"""
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 300, int(sample_rate * seconds)).astype(np.int16)
+
+
+class ServerWarmer:
+    """Keeps whisper-server warm and logs cold vs. warm latency"""
+
+    def __init__(self, client, sample_rate: int, idle_threshold: float = 300.0):
+        """
+        Args:
+            client: Backend to send warm-up requests through
+            sample_rate: Sample rate of the synthetic clip
+            idle_threshold: Seconds without requests after which a key press pre-warms
+        """
+        self.client = client
+        self.idle_threshold = idle_threshold
+        self._clip = synthetic_clip(sample_rate)
+        self._sample_rate = sample_rate
+        self._last_activity = None  # time.monotonic() of the last server request
+        self._prewarm_thread = None
+
+    def touch(self) -> None:
+        """Record that the server just handled a request"""
+        self._last_activity = time.monotonic()
+
+    @property
+    def idle_for(self) -> float:
+        """Seconds since the last request (infinite if none yet)"""
+        if self._last_activity is None:
+            return float('inf')
+        return time.monotonic() - self._last_activity
+
+    def warm_up(self) -> float:
+        """Send one synthetic request; returns its latency in seconds (raises on failure)
+
+        Its stages are kept out of the latency histograms: a cold request
+        would skew the percentiles of real dictations.
+        """
+        start = time.monotonic()
+        with get_tracer().untraced():
+            self.client.transcribe(self._clip, sample_rate=self._sample_rate, timeout=30)
+        self.touch()
+        return time.monotonic() - start
+
+    def warm_up_at_startup(self) -> None:
+        """Cold request followed by a warm one, both logged"""
+        try:
+            cold = self.warm_up()
+            warm = self.warm_up()
+            print(f"🔥 Warm-up: cold request {cold * 1000:.0f} ms, warm request {warm * 1000:.0f} ms")
+        except transcription_errors() as e:
+            print(f"⚠ Warm-up request failed: {e}")
+
+    def maybe_prewarm(self) -> bool:
+        """On key press: pre-warm in the background if the server has idled too long"""
+        idle = self.idle_for
+        if idle < self.idle_threshold:
+            return False
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return False
+
+        reason = "first use" if idle == float('inf') else f"{idle:.0f}s idle"
+
+        def prewarm():
+            try:
+                latency = self.warm_up()
+                print(f"\n🔥 Pre-warm ({reason}): {latency * 1000:.0f} ms")
+            except transcription_errors():
+                pass
+
+        self.touch()  # Don't trigger again while this one runs
+        self._prewarm_thread = threading.Thread(target=prewarm, daemon=True)
+        self._prewarm_thread.start()
+        return True
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Whisper.cpp HTTP Client
+Shared transcription client for the daemon, one-shot tools and Claude skill
+(the "http" backend, see backends.py).
+
+Audio is encoded to WAV in memory (no temp files) and requests go through a
+persistent keep-alive connection pool, so each utterance skips the file
+round trip and the TCP handshake.
+
+With several servers configured ([whisper] urls in config.toml) a
+BackendPool spreads utterances over them: least outstanding requests
+first, recent latency as tie-breaker, failing servers taken out until
+they pass a health check again.
+
+Uploads to servers on other machines are FLAC-compressed by default
+([whisper] upload_format = "auto"; see flac.py), roughly halving the bytes
+on the wire; loopback servers get plain WAV, which costs nothing to encode.
+
+Unless a caller passes an explicit timeout, each request's deadline scales
+with the audio length and the server's measured real-time factor (see
+timeouts.py); a request that passes it is retried once.
+
+requests (and urllib3 under it) is imported on the first HTTP call rather
+than at import time, keeping it off the daemon's startup path.
+"""
+import ipaddress
+import struct
+import threading
+import time
+from typing import Callable, List, Optional
+from urllib.parse import urlparse
+import numpy as np
+import numpy.typing as npt
+from .backends import Transcription, TranscriptionBackend, timed
+from .config import load_config
+from .flac import encode_flac
+from .timeouts import AdaptiveTimeout
+
+# whisper.cpp server defaults (see .whisper/scripts/start-server.sh)
+WHISPER_BASE_URL = "http://127.0.0.1:2022"
+WHISPER_INFERENCE_PATH = "/v1/audio/transcriptions"
+WHISPER_HEALTH_PATH = "/health"
+
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_POOL_SIZE = 4
+DEFAULT_HEALTH_CHECK_INTERVAL = 5.0  # Seconds between probes of failed backends
+LATENCY_SMOOTHING = 0.3  # EWMA weight of the newest latency sample
+UPLOAD_FORMATS = ('auto', 'wav', 'flac')
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, fmt chunk, data chunk header
+WAV_HEADER_FORMAT = '<4sI4s4sIHHIIHH4sI'
+WAV_HEADER_SIZE = struct.calcsize(WAV_HEADER_FORMAT)
+
+
+def encode_wav(audio_data: npt.NDArray[np.int16], sample_rate: int = DEFAULT_SAMPLE_RATE) -> bytearray:
+    """Encode mono int16 PCM samples as a WAV file in memory.
+
+    The payload buffer is allocated once and the samples are copied straight
+    into it from the numpy buffer; no intermediate bytes objects are created.
+
+    Args:
+        audio_data: Mono int16 audio samples (shape (n,) or (n, 1))
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Complete WAV file contents
+    """
+    # No-op for the usual C-contiguous little-endian int16 recorder output
+    samples = np.ascontiguousarray(audio_data, dtype='<i2').reshape(-1)
+    data_size = samples.nbytes
+
+    payload = bytearray(WAV_HEADER_SIZE + data_size)
+    struct.pack_into(
+        WAV_HEADER_FORMAT, payload, 0,
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16,
+        1,                  # PCM
+        1,                  # mono
+        sample_rate,
+        sample_rate * 2,    # byte rate
+        2,                  # block align
+        16,                 # bits per sample
+        b'data', data_size,
+    )
+    if data_size:
+        payload[WAV_HEADER_SIZE:] = memoryview(samples).cast('B')
+    return payload
+
+
+def is_loopback_url(url: str) -> bool:
+    """True if the URL's host is this machine (localhost or a loopback address)"""
+    host = urlparse(url).hostname or ''
+    if host == 'localhost' or host.endswith('.localhost'):
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # Other host names are assumed remote (no DNS lookup)
+
+
+def resolve_upload_format(url: str, upload_format: str = 'auto') -> str:
+    """'wav' or 'flac' for a server; 'auto' compresses only for remote servers"""
+    if upload_format not in UPLOAD_FORMATS:
+        raise ValueError(f"upload_format must be one of {', '.join(UPLOAD_FORMATS)}, not {upload_format!r}")
+    if upload_format == 'auto':
+        return 'wav' if is_loopback_url(url) else 'flac'
+    return upload_format
+
+
+class WhisperClient(TranscriptionBackend):
+    """Keep-alive HTTP client for a whisper.cpp server"""
+
+    kind = 'http'
+    needs_server = True
+
+    def __init__(self, base_url: str = WHISPER_BASE_URL,
+                 inference_path: str = WHISPER_INFERENCE_PATH,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 timeouts: Optional[AdaptiveTimeout] = None,
+                 upload_format: str = 'auto') -> None:
+        self.base_url = base_url.rstrip('/')
+        self.transcription_url = self.base_url + inference_path
+        self.health_url = self.base_url + WHISPER_HEALTH_PATH
+        self.pool_size = pool_size
+        self.timeouts = timeouts or AdaptiveTimeout(self.base_url)
+        self.upload_format = resolve_upload_format(self.base_url, upload_format)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.base_url
+
+    @property
+    def session(self):
+        """requests.Session, created on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    # One session = one urllib3 pool; connections are reused across requests
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def health(self, timeout: float = 2) -> bool:
+        """Return True if the server answers /health with 200"""
+        import requests
+        try:
+            response = self.session.get(self.health_url, timeout=timeout)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def transcribe_timed(self, audio_data: npt.NDArray[np.int16],
+                         sample_rate: int = DEFAULT_SAMPLE_RATE,
+                         timeout: Optional[float] = None) -> Transcription:
+        """Transcribe int16 audio; the stripped text and per-stage seconds.
+
+        Args:
+            timeout: Seconds to wait for the server; None derives the deadline
+                from the audio length and retries once if it passes
+
+        Raises:
+            requests.exceptions.RequestException: On connection or HTTP errors
+        """
+        timings = {}
+        began = time.perf_counter()
+        if timeout is not None:
+            text = self._transcribe(audio_data, sample_rate, timeout, timings)
+            timings['total'] = time.perf_counter() - began
+            return Transcription(text, timings)
+
+        import requests
+        audio_seconds = audio_data.size / sample_rate
+        deadline = self.timeouts.deadline(audio_seconds)
+        for attempt in range(2):
+            start = time.perf_counter()
+            try:
+                text = self._transcribe(audio_data, sample_rate, deadline, timings)
+            except requests.exceptions.Timeout:
+                self.timeouts.record_timeout(audio_seconds, deadline)
+                if attempt:
+                    raise
+                retry_deadline = self.timeouts.retry_deadline(deadline)
+                print(f"⚠ whisper server {self.base_url} gave no answer within {deadline:.1f}s, "
+                      f"retrying ({retry_deadline:.1f}s)")
+                deadline = retry_deadline
+            else:
+                self.timeouts.record(audio_seconds, time.perf_counter() - start)
+                timings['total'] = time.perf_counter() - began
+                return Transcription(text, timings)
+
+    def _transcribe(self, audio_data: npt.NDArray[np.int16], sample_rate: int, timeout: float,
+                    timings: dict) -> str:
+        upload_format = self.upload_format
+        with timed(timings, 'encode'):
+            if upload_format == 'flac':
+                files = {'file': ('audio.flac', encode_flac(audio_data, sample_rate), 'audio/flac')}
+            else:
+                files = {'file': ('audio.wav', encode_wav(audio_data, sample_rate), 'audio/wav')}
+        data = {'model': 'whisper-1'}  # Required by OpenAI-compatible API
+
+        with timed(timings, 'http'):
+            response = self.session.post(self.transcription_url, files=files, data=data, timeout=timeout)
+            if upload_format == 'flac' and 400 <= response.status_code < 500:
+                return self._fall_back_to_wav(audio_data, sample_rate, timeout, timings)
+            response.raise_for_status()
+
+        with timed(timings, 'json_parse'):
+            result = response.json()
+        if upload_format == 'flac' and 'error' in result and 'text' not in result:
+            # whisper-server reports undecodable audio as 200 + {"error": ...}
+            return self._fall_back_to_wav(audio_data, sample_rate, timeout, timings)
+        return result.get("text", "").strip()
+
+    def _fall_back_to_wav(self, audio_data: npt.NDArray[np.int16], sample_rate: int, timeout: float,
+                          timings: dict) -> str:
+        """Server can't read FLAC (built without it and no --convert): use WAV from now on"""
+        print(f"⚠ whisper server {self.base_url} rejected a FLAC upload, sending WAV from now on")
+        self.upload_format = 'wav'
+        return self._transcribe(audio_data, sample_rate, timeout, timings)
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        if self._session is not None:
+            self._session.close()
+
+
+class _Backend:
+    """Load and health bookkeeping for one server in a BackendPool"""
+
+    def __init__(self, client: WhisperClient):
+        self.client = client
+        self.in_flight = 0
+        self.latency = None  # EWMA of request latency in seconds
+        self.healthy = True
+        self.failures = 0
+
+    def score(self, default_latency: float) -> float:
+        """Expected wait if one more request is sent here (lower is better)"""
+        return (self.in_flight + 1) * (self.latency if self.latency is not None else default_latency)
+
+
+class BackendPool(TranscriptionBackend):
+    """Health-aware, least-outstanding dispatch over several whisper servers
+
+    Drop-in replacement for WhisperClient (same health/transcribe/close API).
+    """
+
+    kind = 'http'
+    needs_server = True
+
+    def __init__(self, urls: List[str], pool_size: int = DEFAULT_POOL_SIZE,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 timeouts: Optional[Callable[[str], AdaptiveTimeout]] = None,
+                 upload_format: str = 'auto') -> None:
+        """
+        Args:
+            urls: Server base URLs
+            pool_size: Keep-alive connections per server
+            health_check_interval: Seconds between probes of failed backends
+            timeouts: Builds each server's AdaptiveTimeout from its URL
+            upload_format: 'wav', 'flac', or 'auto' (decided per server)
+        """
+        if not urls:
+            raise ValueError("BackendPool needs at least one server URL")
+        timeouts = timeouts or AdaptiveTimeout
+        self.backends = [
+            _Backend(WhisperClient(url, pool_size=pool_size, timeouts=timeouts(url.rstrip('/')),
+                                   upload_format=upload_format))
+            for url in urls
+        ]
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._checker = None  # Health-check thread, runs while any backend is down
+
+    @property
+    def base_url(self) -> str:
+        return ', '.join(backend.client.base_url for backend in self.backends)
+
+    @property
+    def name(self) -> str:
+        return self.base_url
+
+    def health(self, timeout: float = 2) -> bool:
+        """Probe every backend; True if at least one is healthy"""
+        for backend in self.backends:
+            ok = backend.client.health(timeout=timeout)
+            with self._lock:
+                backend.healthy = ok
+        if not all(backend.healthy for backend in self.backends):
+            self._start_checker()
+        return any(backend.healthy for backend in self.backends)
+
+    def transcribe_timed(self, audio_data: npt.NDArray[np.int16],
+                         sample_rate: int = DEFAULT_SAMPLE_RATE,
+                         timeout: Optional[float] = None) -> Transcription:
+        """Transcribe on the least-loaded healthy backend, failing over once per backend
+
+        ``timeout`` as for WhisperClient.transcribe_timed (None = adaptive per backend).
+
+        Raises:
+            requests.exceptions.RequestException: If every backend failed
+        """
+        import requests
+        tried = set()
+        last_error = None
+        while True:
+            backend = self._acquire(exclude=tried)
+            if backend is None:
+                raise last_error or requests.exceptions.ConnectionError("No healthy whisper backend")
+            tried.add(id(backend))
+
+            start = time.monotonic()
+            try:
+                result = backend.client.transcribe_timed(audio_data, sample_rate=sample_rate, timeout=timeout)
+            except requests.exceptions.HTTPError as e:
+                self._release(backend, None)
+                if e.response is not None and e.response.status_code < 500:
+                    raise  # Request problem, not a server problem
+                self._mark_failed(backend)
+                last_error = e
+            except requests.exceptions.RequestException as e:
+                self._release(backend, None)
+                self._mark_failed(backend)
+                last_error = e
+            else:
+                self._release(backend, time.monotonic() - start)
+                return result
+
+    def close(self) -> None:
+        for backend in self.backends:
+            backend.client.close()
+
+    def _acquire(self, exclude) -> Optional[_Backend]:
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and id(b) not in exclude]
+            if not candidates:
+                return None
+            known = [b.latency for b in self.backends if b.latency is not None]
+            default_latency = sum(known) / len(known) if known else 1.0
+            backend = min(candidates, key=lambda b: b.score(default_latency))
+            backend.in_flight += 1
+            return backend
+
+    def _release(self, backend: _Backend, latency: Optional[float]) -> None:
+        with self._lock:
+            backend.in_flight -= 1
+            if latency is not None:
+                backend.failures = 0
+                if backend.latency is None:
+                    backend.latency = latency
+                else:
+                    backend.latency += LATENCY_SMOOTHING * (latency - backend.latency)
+
+    def _mark_failed(self, backend: _Backend) -> None:
+        with self._lock:
+            was_healthy = backend.healthy
+            backend.healthy = False
+            backend.failures += 1
+        if was_healthy:
+            print(f"⚠ whisper backend {backend.client.base_url} failed, taken out of rotation")
+        self._start_checker()
+
+    def _start_checker(self) -> None:
+        with self._lock:
+            if self._checker is not None and self._checker.is_alive():
+                return
+            self._checker = threading.Thread(target=self._check_unhealthy, daemon=True)
+            self._checker.start()
+
+    def _check_unhealthy(self) -> None:
+        """Re-admit failed backends once they answer /health again"""
+        while True:
+            time.sleep(self.health_check_interval)
+            with self._lock:
+                down = [b for b in self.backends if not b.healthy]
+            if not down:
+                return
+            for backend in down:
+                if backend.client.health(timeout=2):
+                    with self._lock:
+                        backend.healthy = True
+                    print(f"✓ whisper backend {backend.client.base_url} is back")
+
+
+def create_client(config=None):
+    """Build a WhisperClient, or a BackendPool if several servers are configured"""
+    config = config or load_config()
+    whisper_config = config["whisper"]
+    urls = whisper_config["urls"]
+    pool_size = whisper_config["pool_size"]
+
+    def timeouts(url):
+        return AdaptiveTimeout.from_config(url.rstrip('/'), config)
+
+    upload_format = whisper_config["upload_format"]
+    if len(urls) == 1:
+        return WhisperClient(urls[0], pool_size=pool_size, timeouts=timeouts(urls[0]),
+                             upload_format=upload_format)
+    return BackendPool(urls, pool_size=pool_size,
+                       health_check_interval=whisper_config["health_check_interval"],
+                       timeouts=timeouts, upload_format=upload_format)
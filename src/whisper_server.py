@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Whisper Server Supervisor
+Owns the local whisper-server process for the daemon and the Claude skill:
+- starts it via start-server.sh --foreground with output going to a log
+  file (never an unread pipe that can fill up and stall the server)
+- detects readiness quickly: watches the log for the "listening" line and
+  polls /health with adaptive backoff instead of a fixed 0.5 s interval
+- keeps the health state cached so startup needs a single /health GET
+- notices crashes mid-session and restarts the server with backoff
+
+start-server.sh only serves WHISPER_BASE_URL (127.0.0.1:2022), so nothing
+is started or watched unless that is one of the configured [whisper] urls;
+remote-only setups are just health-checked. A server that doesn't become
+ready in time is killed (its whole process group) rather than left behind.
+"""
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+from .config import get_state_dir
+from .backends import get_backend
+from .whisper_client import WHISPER_BASE_URL, is_loopback_url
+
+READY_LOG_MARKER = 'listening at'  # whisper-server: "whisper server listening at http://..."
+STARTUP_TIMEOUT = 20.0
+INITIAL_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+EXTERNAL_CHECK_INTERVAL = 10.0  # Health probe period for servers we did not start
+MAX_RESTART_DELAY = 30.0
+STOP_TIMEOUT = 3.0  # Seconds between SIGTERM and SIGKILL for a server that failed to start
+
+
+def start_script_candidates():
+    """Possible start-server.sh locations (dev checkout and AUR package)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, '..'))
+    return [
+        os.path.join(project_root, '.whisper/scripts/start-server.sh'),  # Dev
+        os.path.join(script_dir, 'whisper/scripts/start-server.sh'),     # AUR: /usr/lib/voicetype/whisper/
+    ]
+
+
+def is_local_server_url(url: str) -> bool:
+    """True if ``url`` is the endpoint start-server.sh serves"""
+    try:
+        port = urlparse(url).port
+    except ValueError:
+        return False
+    return is_loopback_url(url) and port == urlparse(WHISPER_BASE_URL).port
+
+
+def local_server_client(client):
+    """The WhisperClient of ``client`` that talks to start-server.sh's endpoint, if any"""
+    candidates = [backend.client for backend in getattr(client, 'backends', ())] or [client]
+    for candidate in candidates:
+        if is_local_server_url(getattr(candidate, 'base_url', '')):
+            return candidate
+    return None
+
+
+def find_start_script() -> Optional[str]:
+    """Locate start-server.sh"""
+    for candidate in start_script_candidates():
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+class WhisperServerSupervisor:
+    """Starts, watches and restarts the local whisper-server"""
+
+    def __init__(self, client=None, start_script: Optional[str] = None,
+                 log_path: Optional[str] = None, startup_timeout: float = STARTUP_TIMEOUT,
+                 log=print, config=None):
+        """
+        Args:
+            client: WhisperClient/BackendPool used for health checks
+            start_script: Path to start-server.sh (default: auto-detect)
+            log_path: Server output log (default: ~/.local/state/voicetype/whisper-server.log)
+            startup_timeout: Seconds to wait for readiness
+            log: Status message sink (the skill sends these to stderr)
+            config: Loaded config for the default client (default: config.toml)
+        """
+        self.client = client or get_backend(config)
+        # What start-server.sh can make healthy (None: no configured url is local)
+        self.local_client = local_server_client(self.client)
+        self.log = log
+        self.start_script = start_script or find_start_script()
+        self.log_path = log_path or os.path.join(get_state_dir(), 'whisper-server.log')
+        self.startup_timeout = startup_timeout
+
+        self.healthy = False  # Cached health state
+        self.process = None  # Popen of a server we started (None if external)
+        self.restart_count = 0
+        self._stopping = False
+        self._monitor = None
+
+    def ensure_running(self) -> bool:
+        """Make sure the server is up, starting it if needed.
+
+        Uses the cached state when we already know the server is healthy,
+        otherwise costs one /health GET (plus polling if we have to start it).
+        """
+        if self.healthy and (self.process is None or self.process.poll() is None):
+            return True
+
+        self.healthy = self.client.health(timeout=2)
+        if self.healthy:
+            return True
+
+        if self.local_client is None:
+            self.log(f"✗ No whisper server responding at {self.client.name} "
+                     f"(the local server only serves {WHISPER_BASE_URL})")
+            return False
+        self.log("⚠ whisper server not running. Attempting to start local server...")
+        return self.start()
+
+    @property
+    def supervises(self) -> bool:
+        """True if the local server is one of the configured ones (and can be started)"""
+        return self.local_client is not None
+
+    def start(self) -> bool:
+        """Launch the server and wait for it to become ready"""
+        if not self.start_script:
+            self.log("✗ Start script not found in any of these locations:")
+            for candidate in start_script_candidates():
+                self.log(f"   - {candidate}")
+            return False
+
+        try:
+            log_file = open(self.log_path, 'ab')
+            log_offset = log_file.tell()
+            # Own session: a daemon restart does not take the server down with it
+            self.process = subprocess.Popen(['bash', self.start_script, '--foreground'],
+                                            stdout=log_file, stderr=subprocess.STDOUT,
+                                            stdin=subprocess.DEVNULL, start_new_session=True)
+            log_file.close()
+        except OSError as e:
+            self.log(f"✗ Failed to start server: {e}")
+            return False
+
+        self.log("⏳ Waiting for whisper server to start...")
+        start = time.monotonic()
+        if self._wait_until_ready(log_offset):
+            if self.local_client is not self.client:
+                self.client.health(timeout=1)  # Let the pool route to it again
+            self.log(f"✓ whisper server started in {time.monotonic() - start:.1f}s")
+            return True
+
+        self._kill_started()
+        self.log(f"✗ Server not responding after {self.startup_timeout:.0f} seconds (log: {self.log_path})")
+        return False
+
+    def _kill_started(self) -> None:
+        """Terminate a server that failed to start (own session: signal its group)"""
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return
+            try:
+                process.wait(timeout=STOP_TIMEOUT)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+    def start_monitoring(self) -> None:
+        """Watch the server in the background and restart it if it dies"""
+        if self._monitor is not None or self.local_client is None:
+            return  # Remote servers aren't ours to restart; the pool health-checks them
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        """Stop monitoring (the server itself keeps running for other clients)"""
+        self._stopping = True
+
+    def _wait_until_ready(self, log_offset: int) -> bool:
+        deadline = time.monotonic() + self.startup_timeout
+        interval = INITIAL_POLL_INTERVAL
+        while time.monotonic() < deadline:
+            exited = self.process.poll() is not None
+            # A refused connection costs ~1 ms, so polling early and often is cheap
+            if self.local_client.health(timeout=1):
+                self.healthy = True
+                if exited:
+                    self.process = None  # Script found a server that was already running
+                return True
+            if exited:
+                self.process = None
+                return False  # Server (or script) died during startup
+
+            if self._log_shows_ready(log_offset):
+                interval = INITIAL_POLL_INTERVAL  # Listening: model is loaded, check right away
+            time.sleep(interval)
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
+        return False
+
+    def _log_shows_ready(self, log_offset: int) -> bool:
+        try:
+            with open(self.log_path, 'rb') as log_file:
+                log_file.seek(log_offset)
+                return READY_LOG_MARKER.encode() in log_file.read()
+        except OSError:
+            return False
+
+    def _monitor_loop(self) -> None:
+        delay = 1.0
+        while not self._stopping:
+            if self.process is not None:
+                code = self.process.wait()
+                if self._stopping:
+                    return
+                self.log(f"\n⚠ whisper server exited (code {code}), restarting...")
+            else:
+                time.sleep(EXTERNAL_CHECK_INTERVAL)
+                if self._stopping or self.local_client.health(timeout=2):
+                    continue
+                self.log("\n⚠ whisper server stopped responding, restarting...")
+
+            self.healthy = False
+            self.process = None
+            while not self._stopping and not self.start():
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RESTART_DELAY)
+            self.restart_count += 1
+            delay = 1.0
@@ -0,0 +1,63 @@
+"""BackendPool dispatch, health tracking and failover against mock whisper servers"""
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip('requests')
+
+from benchmarks.harness import MockWhisperServer  # noqa: E402
+from src.whisper_client import BackendPool  # noqa: E402
+
+AUDIO = np.zeros(1600, dtype=np.int16)
+
+
+def _free_url():
+    """URL of a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+
+@pytest.fixture
+def servers():
+    servers = [MockWhisperServer(latency=0.2, text=f'server {i}').start() for i in range(2)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def _pool(urls):
+    return BackendPool(urls, upload_format='wav', health_check_interval=60)
+
+
+def test_concurrent_requests_spread_across_servers(servers):
+    pool = _pool([server.url for server in servers])
+    texts = []
+    threads = [threading.Thread(target=lambda: texts.append(pool.transcribe(AUDIO, timeout=5)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+    assert sorted(texts) == ['server 0'] * 2 + ['server 1'] * 2
+    assert [server.requests for server in servers] == [2, 2]
+
+
+def test_dead_backend_is_marked_unhealthy(servers):
+    pool = _pool([servers[0].url, _free_url()])
+    assert pool.health(timeout=1)
+    assert [backend.healthy for backend in pool.backends] == [True, False]
+    assert all(pool.transcribe(AUDIO, timeout=5) == 'server 0' for _ in range(3))
+    pool.close()
+
+
+def test_fails_over_when_a_server_stops(servers):
+    pool = _pool([server.url for server in servers])
+    assert pool.health(timeout=1)
+    servers[0].stop()  # The idle pool would send the next request there
+    assert [pool.transcribe(AUDIO, timeout=5) for _ in range(4)] == ['server 1'] * 4
+    assert [backend.healthy for backend in pool.backends] == [False, True]
+    pool.close()
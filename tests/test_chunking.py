@@ -0,0 +1,97 @@
+"""Splitting long recordings at silences and stitching the chunk transcripts"""
+import numpy as np
+import pytest
+
+from src.chunking import ChunkedTranscriber, split_at_silence, stitch
+from src.config import load_config
+
+SAMPLE_RATE = 16000
+
+
+def _noise(seconds, level=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, level, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+def _assert_covers(chunks, n, max_chunk):
+    assert chunks[0].start == 0 and chunks[-1].end == n
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start > previous.start  # Always moves forward
+        assert chunk.start <= previous.end  # No gaps
+    assert all(chunk.end - chunk.start <= max_chunk * SAMPLE_RATE for chunk in chunks)
+
+
+def test_short_audio_is_one_chunk():
+    audio = _noise(10)
+    assert split_at_silence(audio, SAMPLE_RATE) == [(0, len(audio), False)]
+
+
+@pytest.mark.parametrize('max_chunk, min_chunk, overlap', [
+    (30, 0.2, 0.5),  # min_chunk shorter than the overlap: used to loop forever
+    (30, 0.5, 0.5),
+    (0.5, 15, 0.5),  # Overlap as long as a whole chunk
+    (0, 15, 0.5),
+    (30, 15, -1),
+])
+def test_degenerate_lengths_are_rejected(max_chunk, min_chunk, overlap):
+    with pytest.raises(ValueError):
+        split_at_silence(_noise(100), SAMPLE_RATE, max_chunk=max_chunk, min_chunk=min_chunk, overlap=overlap)
+    with pytest.raises(ValueError):
+        ChunkedTranscriber(None, SAMPLE_RATE, max_chunk=max_chunk, min_chunk=min_chunk, overlap=overlap)
+
+
+def test_smallest_valid_lengths_terminate():
+    audio = _noise(20)
+    chunks = split_at_silence(audio, SAMPLE_RATE, max_chunk=1.0, min_chunk=0.51, overlap=0.5)
+    _assert_covers(chunks, len(audio), 1.0)
+
+
+def test_cut_lands_in_silence():
+    audio = np.concatenate([_noise(24), np.zeros(SAMPLE_RATE, dtype=np.int16), _noise(20, seed=1)])
+    chunks = split_at_silence(audio, SAMPLE_RATE, max_chunk=30, min_chunk=15, overlap=0.5)
+    assert len(chunks) == 2
+    first, second = chunks
+    assert 24 * SAMPLE_RATE < first.end < 25 * SAMPLE_RATE
+    assert second.start == first.end and not second.overlapped
+
+
+def test_forced_cut_in_speech_overlaps():
+    audio = _noise(70)
+    chunks = split_at_silence(audio, SAMPLE_RATE, max_chunk=30, min_chunk=15, overlap=0.5)
+    _assert_covers(chunks, len(audio), 30)
+    assert len(chunks) >= 3
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.overlapped
+        assert chunk.start == previous.end - SAMPLE_RATE // 2
+
+
+def test_stitch_removes_words_repeated_in_the_overlap():
+    texts = ["so we met at the", "At the station, and then", "and then went home."]
+    assert stitch(texts, [False, True, True]) == "so we met at the station, and then went home."
+
+
+def test_stitch_keeps_repeats_without_overlap():
+    assert stitch(["it was very", "very good"], [False, False]) == "it was very very good"
+    assert stitch(["no match here", "other words"], [False, True]) == "no match here other words"
+    assert stitch(["", "after an empty chunk"], [False, True]) == "after an empty chunk"
+
+
+def test_chunked_transcriber_stitches_in_order():
+    class Client:
+        def transcribe(self, samples, sample_rate, timeout=None):
+            return f"{len(samples) // sample_rate}s"
+
+    audio = np.concatenate([_noise(24), np.zeros(SAMPLE_RATE, dtype=np.int16), _noise(20, seed=1)])
+    text = ChunkedTranscriber(Client(), SAMPLE_RATE, workers=2).transcribe(audio)
+    assert text == "24s 20s"
+
+
+def test_config_falls_back_to_default_lengths(tmp_path, monkeypatch, capsys):
+    config_dir = tmp_path / '.config' / 'voicetype'
+    config_dir.mkdir(parents=True)
+    (config_dir / 'config.toml').write_text('[chunking]\nmin_chunk = 0.2\noverlap = 0.5\n')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    chunking = load_config()["chunking"]
+    if 'Could not load config' in capsys.readouterr().out:
+        pytest.skip('no TOML parser available')
+    assert (chunking["max_chunk"], chunking["min_chunk"], chunking["overlap"]) == (30.0, 15.0, 0.5)
@@ -0,0 +1,105 @@
+"""Round trips of src/flac.py through independent FLAC decoders"""
+import hashlib
+import io
+import shutil
+import struct
+import subprocess
+
+import numpy as np
+import pytest
+
+from src.flac import _crc16_frames, encode_flac
+
+SAMPLE_RATE = 16000
+
+
+def _signals():
+    rng = np.random.default_rng(1)
+    t = np.arange(SAMPLE_RATE * 2) / SAMPLE_RATE
+    return {
+        'silence': np.zeros(SAMPLE_RATE, dtype=np.int16),
+        'noise': rng.integers(-32768, 32768, SAMPLE_RATE, dtype=np.int16),
+        'quiet_noise': rng.normal(0, 300, SAMPLE_RATE * 3).astype(np.int16),
+        'sine': (np.sin(2 * np.pi * 440 * t) * 12000).astype(np.int16),
+        'full_scale': np.where(np.arange(10000) % 2, 32767, -32768).astype(np.int16),
+        'full_scale_sine': np.clip(np.round(np.sin(2 * np.pi * 50 * t) * 40000), -32768, 32767).astype(np.int16),
+        'short': np.array([5, -3, 32767, -32768, 0, 1, 2], dtype=np.int16),
+        'one_sample': np.array([-7], dtype=np.int16),
+        'odd_tail': rng.normal(0, 5000, 4096 * 3 + 17).astype(np.int16),
+    }
+
+
+SIGNALS = _signals()
+
+
+def _crc16(data: bytes) -> int:
+    """Bitwise reference CRC-16 (polynomial 0x8005, initial value 0)"""
+    crc = 0
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return crc
+
+
+@pytest.mark.parametrize('name', SIGNALS)
+def test_streaminfo(name):
+    audio = SIGNALS[name]
+    data = bytes(encode_flac(audio, SAMPLE_RATE))
+    assert data[:4] == b'fLaC'
+    assert data[4] == 0x80 and int.from_bytes(data[5:8], 'big') == 34  # Last block, STREAMINFO
+    min_block, max_block = struct.unpack('>HH', data[8:12])
+    assert 16 <= min_block == max_block <= 65535
+    packed = int.from_bytes(data[18:26], 'big')
+    assert packed >> 44 == SAMPLE_RATE
+    assert (packed >> 36 & 0x1F) + 1 == 16
+    assert packed & (2 ** 36 - 1) == len(audio)
+    assert data[26:42] == hashlib.md5(audio.astype('<i2').tobytes()).digest()
+
+
+def test_empty_input():
+    data = bytes(encode_flac(np.zeros(0, dtype=np.int16), SAMPLE_RATE))
+    assert len(data) == 42
+    assert int.from_bytes(data[18:26], 'big') & (2 ** 36 - 1) == 0
+
+
+def test_crc16_matches_reference():
+    rng = np.random.default_rng(2)
+    payload = bytearray(rng.integers(0, 256, 20000, dtype=np.uint8).tobytes())
+    frames = [(0, 1), (1, 2), (3, 700), (700, 701), (1000, 9000), (9000, 20000)]
+    assert _crc16_frames(payload, frames) == [_crc16(bytes(payload[start:end])) for start, end in frames]
+
+
+def test_compresses_speech_like_audio():
+    audio = SIGNALS['sine']
+    assert len(encode_flac(audio, SAMPLE_RATE)) < audio.nbytes / 2
+    assert len(encode_flac(SIGNALS['silence'], SAMPLE_RATE)) < 200
+
+
+@pytest.mark.parametrize('name', SIGNALS)
+def test_soundfile_round_trip(name):
+    soundfile = pytest.importorskip('soundfile')
+    audio = SIGNALS[name]
+    decoded, rate = soundfile.read(io.BytesIO(bytes(encode_flac(audio, SAMPLE_RATE))), dtype='int16')
+    assert rate == SAMPLE_RATE
+    np.testing.assert_array_equal(decoded, audio)
+
+
+@pytest.mark.parametrize('name', SIGNALS)
+@pytest.mark.skipif(shutil.which('flac') is None, reason='flac command not installed')
+def test_flac_command_round_trip(name):
+    """The reference decoder also verifies frame CRCs and the STREAMINFO MD5"""
+    audio = SIGNALS[name]
+    result = subprocess.run(['flac', '--decode', '--force-raw-format', '--endian=little', '--sign=signed',
+                             '--stdout', '--silent', '-'],
+                            input=bytes(encode_flac(audio, SAMPLE_RATE)), capture_output=True, check=True)
+    np.testing.assert_array_equal(np.frombuffer(result.stdout, dtype='<i2'), audio)
+
+
+def test_other_sample_rates():
+    soundfile = pytest.importorskip('soundfile')
+    audio = SIGNALS['quiet_noise']
+    for rate in (8000, 44100, 48000, 11025):  # 11025 has no frame header code
+        decoded, decoded_rate = soundfile.read(io.BytesIO(bytes(encode_flac(audio, rate))), dtype='int16')
+        assert decoded_rate == rate
+        np.testing.assert_array_equal(decoded, audio)
@@ -0,0 +1,71 @@
+"""NotificationWorker coalescing and ordering with a fake notification bus"""
+import threading
+
+from src.notifications import NotificationWorker
+
+
+class FakeBus:
+    """Stands in for Notify over D-Bus; holds the first call until released"""
+
+    def __init__(self, worker):
+        self.worker = worker
+        self.calls = []  # (title, replace id sent)
+        self.sending = threading.Event()
+        self.release = threading.Event()
+
+    def send(self, title, message, icon, timeout):
+        self.calls.append((title, self.worker.replace_id))
+        self.sending.set()
+        self.release.wait(timeout=2)
+        self.worker.replace_id = 7  # The server's id for the popup
+        return True
+
+
+def _worker():
+    worker = NotificationWorker()
+    bus = FakeBus(worker)
+    worker._send_dbus = bus.send
+    worker.start()
+    return worker, bus
+
+
+def test_updates_queued_while_sending_are_coalesced():
+    worker, bus = _worker()
+    worker.notify('recording', '')
+    assert bus.sending.wait(timeout=2)
+    for title in ('transcribing', 'pasting', 'done'):
+        worker.notify(title, '')
+    bus.release.set()
+    assert worker.flush()
+    worker.stop()
+    assert [title for title, _ in bus.calls] == ['recording', 'done']
+    assert worker.sent_count == 2
+
+
+def test_notifications_update_one_popup_in_order():
+    worker, bus = _worker()
+    bus.release.set()
+    for title in ('first', 'second', 'third'):
+        worker.notify(title, '')
+        assert worker.flush()
+    worker.stop()
+    assert bus.calls == [('first', 0), ('second', 7), ('third', 7)]
+
+
+def test_notify_send_fallback(monkeypatch):
+    worker = NotificationWorker()
+    worker._send_dbus = lambda *args: False
+    commands = []
+
+    class Result:
+        stdout = '42\n'
+
+    monkeypatch.setattr('subprocess.run', lambda cmd, **kwargs: commands.append(cmd) or Result())
+    worker.start()
+    worker.notify('first', 'body')
+    assert worker.flush()
+    worker.notify('second', 'body')
+    assert worker.flush()
+    worker.stop()
+    assert commands[0][:2] == ['notify-send', '--print-id']
+    assert commands[1][:3] == ['notify-send', '--replace-id', '42']
@@ -0,0 +1,127 @@
+"""TranscriptionPipeline ordering and overflow policies"""
+import threading
+
+import pytest
+
+from src.pipeline import TranscriptionPipeline
+
+
+class Jobs:
+    """transcribe/deliver pair whose jobs finish only when released"""
+
+    def __init__(self):
+        self.release = {}
+        self.started = []
+        self.delivered = []
+        self.done = threading.Condition()
+
+    def transcribe(self, payload):
+        with self.done:
+            self.started.append(payload)
+            self.done.notify_all()
+        event = self.release.setdefault(payload, threading.Event())
+        assert event.wait(timeout=2)
+        return payload.upper()
+
+    def deliver(self, payload, result, error):
+        with self.done:
+            self.delivered.append((payload, result, error))
+            self.done.notify_all()
+
+    def finish(self, payload):
+        self.release.setdefault(payload, threading.Event()).set()
+
+    def wait_started(self, count):
+        with self.done:
+            assert self.done.wait_for(lambda: len(self.started) >= count, timeout=2)
+
+    def wait_delivered(self, count):
+        with self.done:
+            assert self.done.wait_for(lambda: len(self.delivered) >= count, timeout=2)
+
+
+def test_results_delivered_in_submission_order():
+    jobs = Jobs()
+    pipeline = TranscriptionPipeline(jobs.transcribe, jobs.deliver, workers=3, max_pending=3)
+    for payload in ('a', 'b', 'c'):
+        assert pipeline.submit(payload)
+    jobs.finish('c')
+    jobs.finish('b')
+    jobs.finish('a')
+    jobs.wait_delivered(3)
+    pipeline.shutdown()
+    assert jobs.delivered == [('a', 'A', None), ('b', 'B', None), ('c', 'C', None)]
+    assert pipeline.pending == 0
+
+
+def test_errors_keep_their_place():
+    def transcribe(payload):
+        if payload == 'bad':
+            raise RuntimeError('server down')
+        return payload
+
+    jobs = Jobs()
+    pipeline = TranscriptionPipeline(transcribe, jobs.deliver, workers=2)
+    for payload in ('bad', 'good'):
+        pipeline.submit(payload)
+    jobs.wait_delivered(2)
+    pipeline.shutdown()
+    assert [payload for payload, _, _ in jobs.delivered] == ['bad', 'good']
+    assert isinstance(jobs.delivered[0][2], RuntimeError)
+
+
+def _fill(overflow, on_drop=None):
+    """One running job ('a') and one queued ('b'), at max_pending=2"""
+    jobs = Jobs()
+    pipeline = TranscriptionPipeline(jobs.transcribe, jobs.deliver, workers=1, max_pending=2,
+                                     overflow=overflow, on_drop=on_drop)
+    assert pipeline.submit('a')
+    jobs.wait_started(1)
+    assert pipeline.submit('b')
+    return jobs, pipeline
+
+
+def test_reject_refuses_new_jobs_when_full():
+    jobs, pipeline = _fill('reject')
+    assert not pipeline.submit('c')
+    assert pipeline.rejected_count == 1 and pipeline.dropped_count == 0
+    for payload in 'ab':
+        jobs.finish(payload)
+    jobs.wait_delivered(2)
+    assert pipeline.submit('d')  # Room again once delivered
+    jobs.finish('d')
+    jobs.wait_delivered(3)
+    pipeline.shutdown()
+    assert [payload for payload, _, _ in jobs.delivered] == ['a', 'b', 'd']
+
+
+def test_drop_oldest_discards_the_oldest_queued_job():
+    dropped = []
+    jobs, pipeline = _fill('drop_oldest', on_drop=dropped.append)
+    assert pipeline.submit('c')
+    assert dropped == ['b']
+    assert pipeline.dropped_count == 1 and pipeline.rejected_count == 0
+    for payload in 'ac':
+        jobs.finish(payload)
+    jobs.wait_delivered(2)
+    pipeline.shutdown()
+    assert [payload for payload, _, _ in jobs.delivered] == ['a', 'c']
+    assert 'b' not in jobs.started
+
+
+def test_drop_oldest_rejects_when_nothing_is_queued():
+    jobs = Jobs()
+    pipeline = TranscriptionPipeline(jobs.transcribe, jobs.deliver, workers=2, max_pending=2,
+                                     overflow='drop_oldest')
+    assert pipeline.submit('a') and pipeline.submit('b')
+    jobs.wait_started(2)  # Both running, none left to drop
+    assert not pipeline.submit('c')
+    assert pipeline.rejected_count == 1
+    jobs.finish('a')
+    jobs.finish('b')
+    pipeline.shutdown()
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        TranscriptionPipeline(lambda payload: payload, lambda *args: None, overflow='block')
@@ -0,0 +1,63 @@
+"""Key injection falls back from the uinput keyboard to external tools"""
+import subprocess
+
+import pytest
+
+from src.platform_detect import PlatformInfo
+
+
+class FakeKeyboard:
+    def __init__(self, typed=True, error=None):
+        self.typed = typed
+        self.error = error
+        self.calls = []
+
+    def type_text(self, text):
+        self.calls.append(('type', text))
+        if self.error:
+            raise self.error
+        return self.typed
+
+    def paste(self, use_shift=False):
+        self.calls.append(('paste', use_shift))
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def platform(monkeypatch):
+    monkeypatch.setenv('XDG_SESSION_TYPE', 'wayland')
+    platform = PlatformInfo()
+    platform.available_tools['keyboard'] = ['uinput', 'ydotool', 'wtype']
+    commands = []
+    monkeypatch.setattr(subprocess, 'run', lambda args, **kwargs: commands.append(args))
+    platform.commands = commands
+    return platform
+
+
+def test_uinput_types_what_it_can(platform):
+    platform.virtual_keyboard = FakeKeyboard()
+    assert platform.get_keyboard_tool() == 'uinput'
+    assert platform.type_text('hello')
+    assert platform.commands == []
+
+
+@pytest.mark.parametrize('keyboard', [FakeKeyboard(typed=False), FakeKeyboard(error=OSError())])
+def test_unmapped_text_falls_through_to_external_tool(platform, keyboard):
+    platform.virtual_keyboard = keyboard
+    assert platform.type_text('café')
+    assert keyboard.calls == [('type', 'café')]
+    assert platform.commands == [['ydotool', 'type', 'café']]
+
+
+def test_paste_falls_through_to_ydotool(platform):
+    platform.virtual_keyboard = FakeKeyboard(error=OSError())
+    assert platform.simulate_paste_shortcut()
+    assert platform.commands[0][:2] == ['ydotool', 'key']
+
+
+def test_no_fallback_tool(platform):
+    platform.virtual_keyboard = FakeKeyboard(typed=False)
+    platform.available_tools['keyboard'] = ['uinput']
+    assert not platform.type_text('café')
+    assert platform.commands == []
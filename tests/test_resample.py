@@ -0,0 +1,79 @@
+"""src/resample.py against scipy, and streaming against one-shot conversion"""
+import numpy as np
+import pytest
+
+from src.resample import PolyphaseResampler, resample_poly, to_int16
+
+TARGET_RATE = 16000
+RATES = [44100, 48000, 8000]
+
+
+def _speechlike(rate, seconds=1.5, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(rate * seconds)) / rate
+    tones = sum(np.sin(2 * np.pi * f * t) * a for f, a in ((220, 6000), (1250, 3000), (3700, 1500)))
+    return (tones + rng.normal(0, 500, len(t))).astype(np.float32)
+
+
+def _streamed(resampler, audio, sizes):
+    """Feed ``audio`` in chunks cycling through ``sizes``, then flush"""
+    out, offset, index = [], 0, 0
+    while offset < len(audio):
+        size = sizes[index % len(sizes)]
+        out.append(resampler.process(audio[offset:offset + size]))
+        offset += size
+        index += 1
+    out.append(resampler.flush())
+    return np.concatenate(out)
+
+
+@pytest.mark.parametrize('rate', RATES)
+def test_matches_scipy(rate):
+    signal = pytest.importorskip('scipy.signal')
+    from math import gcd
+    audio = _speechlike(rate)
+    divisor = gcd(rate, TARGET_RATE)
+    expected = signal.resample_poly(audio.astype(np.float64), TARGET_RATE // divisor, rate // divisor,
+                                    window=('kaiser', 5.0))
+    result = resample_poly(audio, rate, TARGET_RATE)
+    assert len(result) == len(expected)
+    # float32 arithmetic on a ~10000-peak signal
+    np.testing.assert_allclose(result, expected, atol=0.05)
+
+
+@pytest.mark.parametrize('rate', RATES)
+@pytest.mark.parametrize('sizes', [[480], [1], [441, 17, 4096], [100000]])
+def test_streaming_equals_one_shot(rate, sizes):
+    audio = _speechlike(rate, seed=1)
+    one_shot = resample_poly(audio, rate, TARGET_RATE)
+    streamed = _streamed(PolyphaseResampler(rate, TARGET_RATE), audio, sizes)
+    assert len(streamed) == len(one_shot)
+    # Same filter taps; chunking only changes float32 summation order (a few ulps)
+    np.testing.assert_allclose(streamed, one_shot, atol=0.01)
+
+
+@pytest.mark.parametrize('rate', RATES)
+def test_output_length_and_alignment(rate):
+    """ceil(n * target / rate) samples, a tone keeps its phase (delay compensated)"""
+    n = rate * 2 + 7
+    t = np.arange(n) / rate
+    audio = (np.sin(2 * np.pi * 300 * t) * 10000).astype(np.float32)
+    result = resample_poly(audio, rate, TARGET_RATE)
+    assert len(result) == -(-n * TARGET_RATE // rate)
+    expected = np.sin(2 * np.pi * 300 * np.arange(len(result)) / TARGET_RATE) * 10000
+    middle = slice(TARGET_RATE // 10, -TARGET_RATE // 10)  # Away from the edges
+    np.testing.assert_allclose(result[middle], expected[middle], atol=20)
+
+
+def test_same_rate_and_empty_input():
+    audio = _speechlike(TARGET_RATE, seconds=0.1)
+    np.testing.assert_array_equal(resample_poly(audio, TARGET_RATE, TARGET_RATE), audio)
+    assert len(resample_poly(np.zeros(0, dtype=np.float32), 48000, TARGET_RATE)) == 0
+    resampler = PolyphaseResampler(48000, TARGET_RATE)
+    assert len(resampler.process(np.zeros(0, dtype=np.float32))) == 0
+    assert len(resampler.flush()) == 0
+
+
+def test_to_int16_rounds_and_clips():
+    audio = np.array([0.4, 0.6, -0.6, 40000.0, -40000.0, 32766.5], dtype=np.float32)
+    np.testing.assert_array_equal(to_int16(audio), [0, 1, -1, 32767, -32768, 32766])